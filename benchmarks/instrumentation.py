@@ -0,0 +1,142 @@
+import functools
+import inspect
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from playwright._impl._connection import Connection
+from playwright.async_api import ElementHandle, Locator, Page
+
+from src.standin.state import StandinState
+
+IDLE_PHASE = "other"
+
+
+class PhaseMetrics:
+    def __init__(self):
+        self.wall_time = 0.0
+        self.calls = 0
+        self.actions = 0
+        self.reloads = 0
+        self.round_trips = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "wall_time": round(self.wall_time, 4),
+            "calls": self.calls,
+            "actions": self.actions,
+            "reloads": self.reloads,
+            "round_trips": self.round_trips,
+        }
+
+
+class Instrumentation:
+    """
+    Attributes Playwright actions, protocol round trips and stand-in page loads to the
+    phase that is running. Phases don't nest: a phase started inside another one
+    takes over until it ends.
+
+    Round trips are counted on Playwright's connection to its driver, every message
+    there is one request/response pair with the browser.
+    """
+
+    def __init__(self, state: StandinState):
+        self.state = state
+        self.phases: dict[str, PhaseMetrics] = defaultdict(PhaseMetrics)
+        self.current_phase = IDLE_PHASE
+        self._patches: list[tuple[object, str, object]] = []
+
+    def _patch(self, owner: object, name: str, wrapper: Callable) -> None:
+        original = getattr(owner, name)
+        self._patches.append((owner, name, original))
+        setattr(owner, name, wrapper(original))
+
+    def restore(self) -> None:
+        while self._patches:
+            owner, name, original = self._patches.pop()
+            setattr(owner, name, original)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        previous_phase = self.current_phase
+        self.current_phase = name
+        metrics = self.phases[name]
+        metrics.calls += 1
+        page_loads = self.state.stats["page_loads"]
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            metrics.wall_time += time.perf_counter() - start_time
+            metrics.reloads += self.state.stats["page_loads"] - page_loads
+            self.current_phase = previous_phase
+
+    def track_phase(
+        self, owner: object, name: str, phase_name: Callable[..., str]
+    ) -> None:
+        """
+        Wraps the function `owner.name` so that every call runs as a phase.
+        """
+        instrumentation = self
+
+        def wrapper(original):
+            if inspect.iscoroutinefunction(original):
+
+                @functools.wraps(original)
+                async def async_tracked(*args, **kwargs):
+                    with instrumentation.phase(phase_name(*args, **kwargs)):
+                        return await original(*args, **kwargs)
+
+                return async_tracked
+
+            @functools.wraps(original)
+            def tracked(*args, **kwargs):
+                with instrumentation.phase(phase_name(*args, **kwargs)):
+                    return original(*args, **kwargs)
+
+            return tracked
+
+        self._patch(owner, name, wrapper)
+
+    def track_playwright(self) -> None:
+        instrumentation = self
+
+        def count_action(original):
+            @functools.wraps(original)
+            async def counted(*args, **kwargs):
+                instrumentation.phases[instrumentation.current_phase].actions += 1
+                return await original(*args, **kwargs)
+
+            return counted
+
+        for api_class in [Page, Locator, ElementHandle]:
+            for name, member in list(vars(api_class).items()):
+                if not name.startswith("_") and inspect.iscoroutinefunction(member):
+                    self._patch(api_class, name, count_action)
+
+        def count_round_trip(original):
+            @functools.wraps(original)
+            def counted(*args, **kwargs):
+                instrumentation.phases[instrumentation.current_phase].round_trips += 1
+                return original(*args, **kwargs)
+
+            return counted
+
+        self._patch(Connection, "_send_message_to_server", count_round_trip)
+
+    def to_dict(self, wall_time: float, page_loads: int) -> dict:
+        """
+        Page loads outside of a phase only show up in the totals.
+        """
+        return {
+            "phases": {
+                name: metrics.to_dict() for name, metrics in self.phases.items()
+            },
+            "totals": {
+                "wall_time": round(wall_time, 4),
+                "actions": sum(m.actions for m in self.phases.values()),
+                "reloads": page_loads,
+                "round_trips": sum(m.round_trips for m in self.phases.values()),
+            },
+        }
@@ -0,0 +1,197 @@
+"""
+End-to-end benchmark: drives synthetic weeks through `main.main` against the local stand-in.
+
+    python -m benchmarks.run_benchmark --case 5x20 --case 50x200 --output results.json
+
+Every case is `<projects>x<work items>`. The JSON holds wall time, Playwright actions,
+page reloads and protocol round trips per phase, compare two files to spot regressions.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import tempfile
+import time
+from datetime import date, datetime
+
+import main
+import src.browser.workflow as workflow
+import src.input.input_workflow as input_workflow
+from benchmarks.instrumentation import Instrumentation
+from benchmarks.synthetic import SyntheticWeek
+from src.config.read_config import CONFIG_OPTIONS
+from src.exceptions.custom_exceptions import KiaraAutomationError
+from src.lib.helpers import init_logging
+from src.standin.server import create_server, start_server_in_thread
+from src.standin.state import StandinState
+
+log = logging.getLogger(__name__)
+
+DEFAULT_CASES = ["1x1", "5x20", "20x80", "50x200"]
+DEFAULT_WEEK = "2024-09-30"
+
+
+def parse_case(case: str) -> tuple[int, int]:
+    try:
+        project_count, item_count = (int(part) for part in case.lower().split("x"))
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(
+            f"Invalid case '{case}'. Expected <projects>x<work items>, e.g. 5x20."
+        ) from e
+    return project_count, item_count
+
+
+def get_benchmark_config(base_url: str) -> dict[str, str]:
+    config_values = {option.option: option.default for option in CONFIG_OPTIONS}
+    config_values.update(
+        {
+            "launch_type": "internal",
+            "base_url": base_url,
+            "headless": "true",
+            "keep_open": "0",
+            "session_cache": "",
+            "journal_dir": "",
+            "report_dir": "",
+            "auto_submit": "true",
+            "phone_number": "0470000000",
+        }
+    )
+    return config_values
+
+
+def track_phases(instrumentation: Instrumentation) -> None:
+    instrumentation.track_playwright()
+    instrumentation.track_phase(
+        input_workflow, "process_input_data", lambda *a, **k: "input"
+    )
+    instrumentation.track_phase(
+        workflow, "ensure_authenticated", lambda *a, **k: "authentication"
+    )
+    instrumentation.track_phase(
+        workflow,
+        "process_project",
+        lambda *a, **k: f"project:{k['project'].name}",
+    )
+    instrumentation.track_phase(
+        workflow, "save_timesheet_provisionally", lambda *a, **k: "save"
+    )
+    instrumentation.track_phase(workflow, "verify_week", lambda *a, **k: "verify")
+
+
+def run_case(
+    week: SyntheticWeek, work_dir: str, config_overrides: dict[str, str]
+) -> dict:
+    state = StandinState(week.fixture(), week.week_start, require_auth=True)
+    server = create_server(state, port=0)
+    start_server_in_thread(server)
+    host, port = server.server_address[:2]
+
+    input_file = os.path.join(
+        work_dir, f"bench_{week.project_count}x{week.item_count}.xlsx"
+    )
+    week.write_workbook(input_file)
+    config_values = get_benchmark_config(f"http://{host}:{port}")
+    config_values.update(config_overrides)
+
+    instrumentation = Instrumentation(state)
+    track_phases(instrumentation)
+    exit_code, error = 0, None
+    start_time = time.perf_counter()
+    try:
+        main.main(
+            input_file_name=input_file,
+            input_sheet_name=week.sheet_name,
+            input_config_values=config_values,
+        )
+    except SystemExit as e:
+        exit_code = e.code if isinstance(e.code, int) else 1
+    except KiaraAutomationError as e:
+        log.error(f"Case failed: '{type(e).__name__}'.")
+        exit_code, error = 1, type(e).__name__
+    finally:
+        wall_time = time.perf_counter() - start_time
+        instrumentation.restore()
+        server.shutdown()
+        server.server_close()
+
+    return {
+        "case": f"{week.project_count}x{week.item_count}",
+        "projects": week.project_count,
+        "work_items": week.item_count,
+        "exit_code": exit_code,
+        "error": error,
+        "copied_rows": state.stats["copied_rows"],
+        **instrumentation.to_dict(wall_time, state.stats["page_loads"]),
+    }
+
+
+def get_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the timesheet automation against the local Kiara stand-in."
+    )
+    parser.add_argument(
+        "--case",
+        "-c",
+        type=parse_case,
+        action="append",
+        help=f"<projects>x<work items>, 1-50 projects and 1-200 work items. "
+        f"Can be repeated. Defaults to {', '.join(DEFAULT_CASES)}.",
+    )
+    parser.add_argument("--output", "-o", type=str, default="benchmark_results.json")
+    parser.add_argument("--week", "-w", type=str, default=DEFAULT_WEEK)
+    parser.add_argument(
+        "--label",
+        "-l",
+        type=str,
+        default="",
+        help="Free text stored with the results, e.g. the version under test.",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--set",
+        type=str,
+        action="append",
+        default=[],
+        metavar="OPTION=VALUE",
+        help="Override a config option, e.g. --set fill_mode=cell. Can be repeated.",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = get_args()
+    init_logging(log_level="warning")
+    cases = args.case or [parse_case(case) for case in DEFAULT_CASES]
+    week_start = datetime.strptime(args.week, "%Y-%m-%d").date()
+    overrides = dict(option.split("=", 1) for option in args.set)
+
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for project_count, item_count in cases:
+            synthetic_week = SyntheticWeek(
+                week_start, project_count, item_count, seed=args.seed
+            )
+            result = run_case(synthetic_week, temp_dir, overrides)
+            print(
+                f"{result['case']:>8}: {result['totals']['wall_time']:.2f}s, "
+                f"{result['totals']['actions']} actions, "
+                f"{result['totals']['reloads']} reloads, "
+                f"{result['totals']['round_trips']} round trips"
+            )
+            results.append(result)
+
+    with open(args.output, "w", encoding="utf-8") as output:
+        json.dump(
+            {
+                "label": args.label,
+                "created": date.today().isoformat(),
+                "python": platform.python_version(),
+                "config_overrides": overrides,
+                "cases": results,
+            },
+            output,
+            indent=2,
+        )
+    print(f"Wrote results to '{args.output}'.")
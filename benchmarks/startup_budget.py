@@ -0,0 +1,83 @@
+"""
+Checks the import cost of the fast CLI paths against a budget.
+
+    python -m benchmarks.startup_budget --help-budget 150 --validate-budget 600
+
+Runs `main.py --help` and `main.py --validate-only` with `python -X importtime` and
+exits with 1 if an import-time budget is exceeded or the browser stack got imported.
+tests/test_startup.py asserts the same default budgets.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from datetime import date
+
+from benchmarks.synthetic import SyntheticWeek
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FORBIDDEN_MODULES = ["playwright", "pandas"]
+HELP_BUDGET_MS = 150
+VALIDATE_BUDGET_MS = 600
+
+
+def measure_imports(cli_args: list[str]) -> tuple[float, set[str]]:
+    """
+    Returns the total import time in ms and the names of all imported modules.
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "main.py", *cli_args],
+        cwd=REPO_DIR,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    total_us = 0
+    modules = set()
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        modules.add(name.strip())
+        # top level imports only, nested ones are part of their cumulative time
+        if not name.startswith("  "):
+            total_us += int(cumulative)
+    return total_us / 1000, modules
+
+
+def check_budget(name: str, cli_args: list[str], budget_ms: float) -> bool:
+    import_ms, modules = measure_imports(cli_args)
+    forbidden = sorted(modules.intersection(FORBIDDEN_MODULES))
+    within_budget = import_ms <= budget_ms and not forbidden
+    print(
+        f"{name:<16} {import_ms:>8.1f} ms (budget {budget_ms:.0f} ms)"
+        f"{' - imported ' + ', '.join(forbidden) if forbidden else ''}"
+        f" {'ok' if within_budget else 'FAILED'}"
+    )
+    return within_budget
+
+
+def get_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Import-time budget for main.py.")
+    parser.add_argument("--help-budget", type=float, default=HELP_BUDGET_MS)
+    parser.add_argument("--validate-budget", type=float, default=VALIDATE_BUDGET_MS)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = get_args()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        week = SyntheticWeek(date(2024, 9, 30), project_count=10, item_count=100)
+        input_file = os.path.join(temp_dir, "startup.xlsx")
+        week.write_workbook(input_file)
+        results = [
+            check_budget("--help", ["--help"], args.help_budget),
+            check_budget(
+                "--validate-only",
+                ["-f", input_file, "-s", week.sheet_name, "--validate-only"],
+                args.validate_budget,
+            ),
+        ]
+    sys.exit(0 if all(results) else 1)
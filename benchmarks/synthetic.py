@@ -0,0 +1,105 @@
+import random
+from datetime import date, timedelta
+
+from openpyxl import Workbook
+
+from src.objects.general_tasks import general_tasks
+
+COLUMNS = ["Day", "Project", "Description", "JiraRef", "AppRef", "Date", "TimeSpent"]
+DAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+
+
+class SyntheticWeek:
+    """
+    Input workbook rows plus the matching stand-in fixture for one benchmark case.
+    Half of every project's descriptions already exist in the timesheet, the rest are new.
+    """
+
+    def __init__(
+        self,
+        week_start: date,
+        project_count: int,
+        item_count: int,
+        general_ratio: float = 0.2,
+        seed: int = 0,
+    ):
+        if not 1 <= project_count <= 50:
+            raise ValueError("project_count must be between 1 and 50.")
+        if not 1 <= item_count <= 200:
+            raise ValueError("item_count must be between 1 and 200.")
+        self.week_start = week_start
+        self.project_count = project_count
+        self.item_count = item_count
+        self.general_ratio = general_ratio
+        self.random = random.Random(seed)
+        self.projects = self._make_projects()
+        self.rows = self._make_rows()
+
+    @property
+    def sheet_name(self) -> str:
+        return self.week_start.isoformat()
+
+    def _make_projects(self) -> list[tuple[str, bool]]:
+        general_count = min(
+            round(self.project_count * self.general_ratio), len(general_tasks)
+        )
+        general_count = min(general_count, self.project_count - 1)
+        projects = [
+            (f"BENCH{index:03d} - Synthetic project {index}", False)
+            for index in range(self.project_count - general_count)
+        ]
+        projects += [(name, True) for name in general_tasks[1 : general_count + 1]]
+        return projects
+
+    def _make_rows(self) -> list[list]:
+        rows = []
+        for index in range(self.item_count):
+            project_index = index % len(self.projects)
+            project_name, is_general = self.projects[project_index]
+            day_index = self.random.randrange(len(DAY_NAMES))
+            description_index = self.random.randrange(4)
+            state = "existing" if description_index % 2 == 0 else "new"
+            # refs belong to a description, duplicate rows of a day must not conflict
+            ref = f"{project_index}-{description_index}"
+            rows.append(
+                [
+                    DAY_NAMES[day_index],
+                    project_name,
+                    f"{state} activity {description_index}",
+                    None if is_general else f"BENCH-{ref}",
+                    (
+                        None
+                        if description_index < 2
+                        else 1000 + project_index * 10 + description_index
+                    ),
+                    (self.week_start + timedelta(days=day_index)).isoformat(),
+                    self.random.choice([0.25, 0.5, 1, 1.5, 2, 4, 7.75, 8]),
+                ]
+            )
+        return rows
+
+    def write_workbook(self, file_name: str) -> None:
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.title = self.sheet_name
+        sheet.append(COLUMNS)
+        for row in self.rows:
+            sheet.append(row)
+        workbook.save(file_name)
+
+    def fixture(self) -> dict:
+        fixture: dict = {"projects": [], "general_tasks": []}
+        for project_name, is_general in self.projects:
+            task = {
+                "name": project_name,
+                "rows": [
+                    {
+                        "description": f"existing activity {index}",
+                        "jira_ref": "",
+                        "app_ref": "",
+                    }
+                    for index in (0, 2)
+                ],
+            }
+            fixture["general_tasks" if is_general else "projects"].append(task)
+        return fixture
@@ -1,9 +1,8 @@
-import asyncio
+import json
 import logging
-from typing import Dict
+import os
+from typing import Dict, Optional
 
-from src.input.input_workflow import process_input_data
-from src.browser.workflow import run_browser_automation
 from src.config.input import get_args
 from src.config.read_config import read_config
 from src.exceptions.custom_exceptions import (
@@ -11,51 +10,321 @@ from src.exceptions.custom_exceptions import (
     BrowserNavigationError,
     ConfigFileProcessingError,
     InputDataProcessingError,
+    InputValidationError,
 )
-from src.lib.helpers import init_logging, terminate_script
+from src.lib.helpers import add_user_log_file, init_logging, terminate_script
+from src.lib.run_journal import RunJournal, get_journal_path
+from src.lib.retry import configure_retry_policy
+from src.lib.tracing import configure_tracing
+from src.objects.batch_user import BatchUserResult
 from src.objects.kiara_project import KiaraProject
+from src.objects.logging import batch_user
+from src.objects.week_result import WeekResult
 
 log: logging.Logger = logging.getLogger(__name__)
 
+# Playwright, openpyxl and pandas are imported by the phase that needs them,
+# so --help, config errors and --validate-only don't pay for the browser stack.
+
+
+def get_run_journal(
+    input_file_name: str,
+    week_start: str,
+    input_config_values: Dict[str, str],
+    plan_only: bool,
+    resume: bool,
+    user: str = "",
+) -> Optional[RunJournal]:
+    # a plan-only run may read the journal to show what's left, but never resets it
+    if plan_only and not resume:
+        return None
+    if resume and not input_config_values["journal_dir"]:
+        log.warning("No journal_dir set. There's no journal to resume from.")
+    path = get_journal_path(
+        input_config_values["journal_dir"], input_file_name, week_start, user
+    )
+    return RunJournal(path, resume=resume)
+
 
 def main(
-    input_file_name: str, input_sheet_name: str, input_config_values: Dict[str, str]
+    input_file_name: str,
+    input_sheet_name: str,
+    input_config_values: Dict[str, str],
+    plan_only: bool = False,
+    resume: bool = False,
 ) -> None:
+    # pylint: disable=import-outside-toplevel
+    import asyncio
+
+    from src.input.input_workflow import process_input_data
+    from src.browser.workflow import run_browser_automation
+
     projects: list[KiaraProject] = []
     try:
-        projects = process_input_data(input_file_name, input_sheet_name)
+        projects = process_input_data(
+            input_file_name, input_sheet_name, input_config_values["reader"]
+        )
     except InputDataProcessingError as e:
         log.error(f"Terminating error: '{type(e).__name__}'.")
         terminate_script(1)
     try:
-        asyncio.run(
+        report = asyncio.run(
             run_browser_automation(
-                input_config_values=input_config_values, projects=projects
+                input_config_values=input_config_values,
+                projects=projects,
+                plan_only=plan_only,
+                journal=get_run_journal(
+                    input_file_name,
+                    input_sheet_name,
+                    input_config_values,
+                    plan_only,
+                    resume,
+                ),
             )
         )
     except BrowserNavigationError as e:
         log.error(f"Terminating error: '{type(e).__name__}'.")
         terminate_script(1)
+    if report is not None and not report.verified:
+        terminate_script(1)
+
+
+def main_multi_week(
+    input_file_name: str,
+    input_sheet_names: list[str],
+    input_config_values: Dict[str, str],
+    plan_only: bool = False,
+    resume: bool = False,
+) -> None:
+    # pylint: disable=import-outside-toplevel
+    import asyncio
+
+    from src.input.input_workflow import process_input_data
+    from src.browser.workflow import log_week_results, run_multi_week_automation
+
+    weeks: dict[str, list[KiaraProject]] = {}
+    input_failures: list[WeekResult] = []
+    for sheet_name in input_sheet_names:
+        try:
+            weeks[sheet_name] = process_input_data(
+                input_file_name, sheet_name, input_config_values["reader"]
+            )
+        except InputDataProcessingError as e:
+            log.error(f"Skipping week '{sheet_name}': '{type(e).__name__}'.")
+            input_failures.append(
+                WeekResult(sheet_name, "failed", error=type(e).__name__)
+            )
+
+    results: list[WeekResult] = []
+    if weeks:
+        try:
+            results = asyncio.run(
+                run_multi_week_automation(
+                    input_config_values=input_config_values,
+                    weeks=weeks,
+                    plan_only=plan_only,
+                    journals={
+                        sheet_name: get_run_journal(
+                            input_file_name,
+                            sheet_name,
+                            input_config_values,
+                            plan_only,
+                            resume,
+                        )
+                        for sheet_name in weeks
+                    },
+                )
+            )
+        except BrowserNavigationError as e:
+            log.error(f"Terminating error: '{type(e).__name__}'.")
+            terminate_script(1)
+
+    results = sorted(input_failures + results, key=lambda result: result.week_start)
+    log_week_results(results)
+    if not all(result.succeeded for result in results):
+        terminate_script(1)
+
+
+def write_batch_result(result_file: str, result: BatchUserResult) -> None:
+    try:
+        with open(result_file, "w", encoding="utf-8") as output:
+            json.dump(result.to_dict(), output, indent=2)
+    except OSError as e:
+        log.warning(f"Failed to write result of user '{result.user}': {e}")
+
+
+def main_batch(
+    manifest_file: str,
+    input_file_name: str,
+    input_sheet_names: list[str],
+    input_config_values: Dict[str, str],
+    plan_only: bool = False,
+    resume: bool = False,
+) -> None:
+    # pylint: disable=import-outside-toplevel
+    import asyncio
+
+    from src.config.read_manifest import get_user_file_name, read_manifest
+    from src.input.input_workflow import process_input_data
+    from src.lib.verification import get_week_start
+    from src.browser.batch import log_batch_results, run_batch_automation
+
+    users = read_manifest(
+        manifest_file, input_config_values, input_file_name, input_sheet_names
+    )
+    log_dir = os.path.abspath(os.path.expanduser(input_config_values["log_dir"]))
+    log_handlers = [
+        add_user_log_file(
+            user.name, os.path.join(log_dir, f"{get_user_file_name(user.name)}.log")
+        )
+        for user in users
+    ]
+
+    weeks: dict[str, dict[str, list[KiaraProject]]] = {}
+    journals: dict[str, dict[str, Optional[RunJournal]]] = {}
+    input_failures: dict[str, list[WeekResult]] = {}
+    for user in users:
+        token = batch_user.set(user.name)
+        weeks[user.name], journals[user.name], input_failures[user.name] = {}, {}, []
+        for sheet_name in user.sheet_names:
+            try:
+                projects = process_input_data(
+                    user.input_file, sheet_name, user.config_values["reader"]
+                )
+            except InputDataProcessingError as e:
+                log.error(f"Skipping sheet '{sheet_name}': '{type(e).__name__}'.")
+                input_failures[user.name].append(
+                    WeekResult(sheet_name, "failed", error=type(e).__name__)
+                )
+                continue
+            # sheets of a shared workbook are named after their user, not their week
+            week_start = get_week_start(projects)
+            if not week_start or week_start in weeks[user.name]:
+                error = "no work items" if not week_start else "duplicate week"
+                log.error(f"Skipping sheet '{sheet_name}': {error}.")
+                input_failures[user.name].append(
+                    WeekResult(week_start or sheet_name, "failed", error=error)
+                )
+                continue
+            weeks[user.name][week_start] = projects
+            journals[user.name][week_start] = get_run_journal(
+                user.input_file,
+                week_start,
+                user.config_values,
+                plan_only,
+                resume,
+                user=user.name,
+            )
+        batch_user.reset(token)
+
+    # users without a valid week don't need to log in
+    runnable_users = [user for user in users if weeks[user.name]]
+    results: dict[str, BatchUserResult] = {}
+    try:
+        if runnable_users:
+            for result in asyncio.run(
+                run_batch_automation(
+                    input_config_values=input_config_values,
+                    users=runnable_users,
+                    weeks=weeks,
+                    plan_only=plan_only,
+                    journals=journals,
+                )
+            ):
+                results[result.user] = result
+    finally:
+        for log_handler in log_handlers:
+            logging.getLogger().removeHandler(log_handler)
+            log_handler.close()
+
+    user_results = []
+    for user in users:
+        result = results.get(user.name, BatchUserResult(user.name))
+        result.weeks = sorted(
+            input_failures[user.name] + result.weeks,
+            key=lambda week_result: week_result.week_start,
+        )
+        write_batch_result(
+            os.path.join(log_dir, f"{get_user_file_name(user.name)}.json"), result
+        )
+        user_results.append(result)
+    log_batch_results(user_results)
+    log.info(f"Wrote the logs and results of every user to '{log_dir}'.")
+    if not all(result.succeeded for result in user_results):
+        terminate_script(1)
+
+
+def validate_only(
+    input_file_name: str,
+    input_sheet_names: list[str],
+    input_config_values: Dict[str, str],
+) -> None:
+    # pylint: disable=import-outside-toplevel
+    from src.input.input_workflow import format_projects, process_input_data
+
+    failed = False
+    for sheet_name in input_sheet_names:
+        try:
+            projects = process_input_data(
+                input_file_name, sheet_name, input_config_values["reader"]
+            )
+        except InputValidationError as e:
+            # the issues are logged by the validation itself
+            log.error(f"Sheet '{sheet_name}' has {len(e.issues)} invalid values.")
+            failed = True
+            continue
+        except InputDataProcessingError as e:
+            log.error(f"Sheet '{sheet_name}' is invalid: '{type(e).__name__}'.")
+            failed = True
+            continue
+        print(f"Sheet '{sheet_name}':")
+        print(format_projects(projects))
+    if failed:
+        terminate_script(1)
 
 
 if __name__ == "__main__":
     config_values: Dict[str, str] = {}
 
+    args = get_args()
     try:
         config_values = read_config()
     except ConfigFileProcessingError as e:
         print(f"Failed to read config file: '{e}'.")
         terminate_script(1)
-    file_name, sheet_name = get_args()
 
     try:
         init_logging(log_level=config_values.get("log_level", "info"))
     except (OSError, ValueError, FileNotFoundError) as e:
         print(f"Failed to initiate logger: '{e}'.")
         terminate_script(1)
+    configure_tracing(
+        enabled=config_values.get("trace", "false").lower() in ["true"],
+        trace_file=config_values.get("trace_file", None),
+    )
+    try:
+        configure_retry_policy(config_values)
+    except ConfigFileProcessingError as e:
+        log.error(e)
+        terminate_script(1)
 
-    file_name = file_name if file_name else config_values.get("input_file", None)
-    if not file_name:
+    file_name = (
+        args.file_name if args.file_name else config_values.get("input_file", None)
+    )
+    if args.batch:
+        try:
+            main_batch(
+                manifest_file=args.batch,
+                input_file_name=file_name,
+                input_sheet_names=args.sheet_names,
+                input_config_values=config_values,
+                plan_only=args.plan_only,
+                resume=args.resume,
+            )
+        except KiaraAutomationError as e:
+            log.error(f"Terminating error: '{type(e).__name__}'.")
+            terminate_script(1)
+    elif not file_name:
         log.error(
             "No input file name provided. "
             "Either update the config file or pass it as a command line argument."
@@ -63,11 +332,28 @@ if __name__ == "__main__":
         terminate_script(1)
     else:
         try:
-            main(
-                input_file_name=file_name,
-                input_sheet_name=sheet_name,
-                input_config_values=config_values,
-            )
+            if args.validate_only:
+                validate_only(
+                    input_file_name=file_name,
+                    input_sheet_names=args.sheet_names,
+                    input_config_values=config_values,
+                )
+            elif len(args.sheet_names) > 1:
+                main_multi_week(
+                    input_file_name=file_name,
+                    input_sheet_names=args.sheet_names,
+                    input_config_values=config_values,
+                    plan_only=args.plan_only,
+                    resume=args.resume,
+                )
+            else:
+                main(
+                    input_file_name=file_name,
+                    input_sheet_name=args.sheet_names[0],
+                    input_config_values=config_values,
+                    plan_only=args.plan_only,
+                    resume=args.resume,
+                )
         except KiaraAutomationError as e:
             log.error(f"Terminating error: '{type(e).__name__}'.")
             terminate_script(1)
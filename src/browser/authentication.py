@@ -1,13 +1,21 @@
 import re
 import logging
 from playwright.async_api import Page
-from src.browser.navigate import navigate_to_page, click_navigation_button
+from src.browser.navigate import (
+    KIARA_BASE_URL,
+    navigate_to_page,
+    click_navigation_button,
+)
 from src.browser.locate import (
     get_authentication_method_button,
     get_phone_number_input_box,
     get_target_element,
+    is_target_element_present,
 )
+from src.browser.selectors import OPEN_TIMESHEET_BUTTON_CELL
 from src.browser.update import enter_cell_text_generic
+from src.lib.session_cache import remove_session_state, write_session_state
+from src.lib.tracing import traced
 from src.exceptions.custom_exceptions import (
     BrowserNavigationError,
     TargetElementNotFoundError,
@@ -17,15 +25,54 @@ from src.exceptions.custom_exceptions import (
 log = logging.getLogger(__name__)
 
 
-async def run_authentication_flow(page: Page, phone_number: str) -> None:
+async def is_session_authenticated(page: Page, base_url: str = KIARA_BASE_URL) -> bool:
+    await navigate_to_page(page, base_url)
+    return await is_target_element_present(
+        locator=page.get_by_role("cell", name=OPEN_TIMESHEET_BUTTON_CELL).locator("a"),
+        locator_string="Open timesheet page button",
+    )
+
+
+@traced()
+async def ensure_authenticated(
+    page: Page,
+    phone_number: str,
+    session_cache: str,
+    session_loaded: bool,
+    base_url: str = KIARA_BASE_URL,
+) -> None:
+    """
+    Reuses the cached session if Kiara still accepts it, runs the MFA flow otherwise.
+    """
+    if session_loaded:
+        if await is_session_authenticated(page, base_url):
+            log.info("Cached session is still valid. Skipping authentication.")
+            return
+        log.info("Cached session expired.")
+        remove_session_state(session_cache)
+
+    await run_authentication_flow(
+        page=page, phone_number=phone_number, base_url=base_url
+    )
+
+    if session_cache:
+        try:
+            write_session_state(session_cache, await page.context.storage_state())
+        except OSError as e:
+            log.warning(f"Failed to save session: {e}")
+
+
+async def run_authentication_flow(
+    page: Page, phone_number: str, base_url: str = KIARA_BASE_URL
+) -> None:
     """
     Only supports itsme.
     """
     log.info("Running authentication flow.")
 
-    await navigate_to_page(page, "https://kiara.vlaanderen.be")
+    await navigate_to_page(page, base_url)
     await select_authentication_method(page, "itsme")
-    await auth_with_mfa(page, phone_number)
+    await auth_with_mfa(page, phone_number, base_url)
 
 
 async def select_authentication_method(page: Page, method: str):
@@ -35,13 +82,14 @@ async def select_authentication_method(page: Page, method: str):
         await click_navigation_button(
             nav_button_locator=auth_method_locator,
             nav_button_name=method,
-            timeout=15000,
         )
     except Exception as e:
         raise BrowserNavigationError from e
 
 
-async def auth_with_mfa(page: Page, phone_number: str) -> None:
+async def auth_with_mfa(
+    page: Page, phone_number: str, base_url: str = KIARA_BASE_URL
+) -> None:
     try:
         phone_number_input_locator = await get_phone_number_input_box(page)
         log.info(f"Authenticating with MFA using phone number: '{phone_number}'")
@@ -64,9 +112,8 @@ async def auth_with_mfa(page: Page, phone_number: str) -> None:
         await click_navigation_button(
             nav_button_locator=trigger_mfa_button_locator,
             nav_button_name="Trigger MFA",
-            timeout=15000,
         )
     except Exception as e:
         raise BrowserNavigationError from e
 
-    await page.wait_for_url(re.compile(r"^https://kiara\.vlaanderen\.be"))
+    await page.wait_for_url(re.compile(f"^{re.escape(base_url)}"))
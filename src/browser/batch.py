@@ -0,0 +1,141 @@
+import logging
+import time
+from typing import Optional
+
+import asyncio
+from playwright.async_api import Browser, async_playwright
+
+from src.browser.workflow import (
+    get_timesheet_context,
+    open_authenticated_page,
+    run_week,
+)
+from src.lib.run_journal import RunJournal
+from src.lib.tracing import traced
+from src.objects.batch_user import BatchUser, BatchUserResult
+from src.objects.kiara_project import KiaraProject
+from src.objects.logging import batch_user
+from src.exceptions.custom_exceptions import (
+    ConfigFileProcessingError,
+    DebugBrowserConnectionError,
+)
+
+log = logging.getLogger(__name__)
+
+
+@traced(labels=["user"])
+async def run_user(
+    browser: Browser,
+    user: BatchUser,
+    weeks: dict[str, list[KiaraProject]],
+    plan_only: bool,
+    journals: dict[str, Optional[RunJournal]],
+    semaphore: asyncio.Semaphore,
+) -> BatchUserResult:
+    # runs in its own task, so the records logged from here on belong to this user
+    batch_user.set(user.name)
+    async with semaphore:
+        log.info(f"Processing {len(weeks)} weeks for user '{user.name}'.")
+        start_time = time.perf_counter()
+        page = None
+        try:
+            page = await open_authenticated_page(browser, user.config_values)
+            week_results = []
+            for week_start, projects in weeks.items():
+                week_results.append(
+                    await run_week(
+                        page=page,
+                        week_start=week_start,
+                        projects=projects,
+                        input_config_values=user.config_values,
+                        plan_only=plan_only,
+                        journal=journals.get(week_start),
+                    )
+                )
+        except Exception as e:
+            log.error(f"Failed to process user '{user.name}': {e}")
+            return BatchUserResult(
+                user.name,
+                duration=time.perf_counter() - start_time,
+                error=type(e).__name__,
+            )
+        finally:
+            # frees the slot for the next user's login
+            if page is not None:
+                await page.context.close()
+        return BatchUserResult(
+            user.name, weeks=week_results, duration=time.perf_counter() - start_time
+        )
+
+
+async def run_batch_automation(
+    input_config_values: dict,
+    users: list[BatchUser],
+    weeks: dict[str, dict[str, list[KiaraProject]]],
+    plan_only: bool = False,
+    journals: Optional[dict[str, dict[str, Optional[RunJournal]]]] = None,
+) -> list[BatchUserResult]:
+    """
+    Launches one browser and gives every user an isolated context of it. At most
+    `concurrency` users log in and fill their weeks at the same time.
+    """
+    if input_config_values["launch_type"] != "internal":
+        raise ConfigFileProcessingError(
+            "Batch mode needs launch_type = internal, every user gets their own context."
+        )
+    try:
+        concurrency = max(1, int(input_config_values["concurrency"]))
+    except ValueError as e:
+        raise ConfigFileProcessingError(
+            f"Invalid concurrency '{input_config_values['concurrency']}'."
+        ) from e
+    # fail on invalid options before anyone logs in
+    for user in users:
+        get_timesheet_context(user.config_values, plan_only)
+
+    async with async_playwright() as p:
+        try:
+            browser = await p.chromium.launch(
+                headless=input_config_values["headless"].lower() in ["true"]
+            )
+        except Exception as e:
+            raise DebugBrowserConnectionError("Failed to launch browser.") from e
+        log.info(f"Processing {len(users)} users, {concurrency} at a time.")
+
+        semaphore = asyncio.Semaphore(concurrency)
+        results = await asyncio.gather(
+            *(
+                run_user(
+                    browser=browser,
+                    user=user,
+                    weeks=weeks[user.name],
+                    plan_only=plan_only,
+                    journals=journals.get(user.name, {}) if journals else {},
+                    semaphore=semaphore,
+                )
+                for user in users
+            )
+        )
+
+        # every user's context is closed already, there's nothing left to review
+        await browser.close()
+
+    return list(results)
+
+
+def log_batch_results(results: list[BatchUserResult]) -> None:
+    for result in results:
+        if result.succeeded:
+            log.info(
+                f"User '{result.user}': done - {len(result.weeks)} weeks "
+                f"in {result.duration:.1f}s."
+            )
+        elif result.error:
+            log.error(f"User '{result.user}': failed - '{result.error}'.")
+        else:
+            failed_weeks = [
+                week.week_start for week in result.weeks if not week.succeeded
+            ]
+            log.error(f"User '{result.user}': failed weeks {failed_weeks}.")
+    failed = sum(1 for result in results if not result.succeeded)
+    log.info(f"Processed {len(results) - failed}/{len(results)} users successfully.")
@@ -1,14 +1,19 @@
 import logging
+from typing import Optional
 
 from playwright.async_api import Browser, Page, Playwright
 
 from src.exceptions.custom_exceptions import DebugBrowserConnectionError
+from src.lib.retry import get_timeout
 
 log = logging.getLogger(__name__)
 
 
 async def init_playwright(
-    playwright: Playwright, launch_type: str
+    playwright: Playwright,
+    launch_type: str,
+    storage_state: Optional[str] = None,
+    headless: bool = False,
 ) -> tuple[Browser, Page]:
     if launch_type == "external":
         log.debug("Launch type is external. Connecting to existing browser.")
@@ -20,17 +25,26 @@ async def init_playwright(
         except Exception as e:
             raise DebugBrowserConnectionError("Failed to connect to browser.") from e
         ctx = browser.contexts[0]
-        ctx.set_default_timeout(3000)
+        ctx.set_default_timeout(get_timeout("lookup"))
         page = ctx.pages[0]
     else:
         log.debug("Launch type is internal. Launching new browser.")
         try:
-            browser = await playwright.chromium.launch(headless=False)
+            browser = await playwright.chromium.launch(headless=headless)
             log.debug("Launched browser.")
         except Exception as e:
             raise DebugBrowserConnectionError("Failed to launch browser.") from e
-        ctx = await browser.new_context()
-        ctx.set_default_timeout(3000)
-        page = await ctx.new_page()
+        page = await new_context_page(browser, storage_state)
 
     return browser, page
+
+
+async def new_context_page(browser: Browser, storage_state: Optional[str]) -> Page:
+    """
+    A new context doesn't share cookies or storage with the other contexts of the browser.
+    """
+    if storage_state:
+        log.debug(f"Loading cached session '{storage_state}'.")
+    ctx = await browser.new_context(storage_state=storage_state)
+    ctx.set_default_timeout(get_timeout("lookup"))
+    return await ctx.new_page()
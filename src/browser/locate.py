@@ -1,24 +1,35 @@
 import logging
-import re
-import time
-from typing import cast
+from typing import Optional
 
 from playwright.async_api import Locator, Page, TimeoutError as PlaywrightTimeoutError
 
+from src.browser.selectors import (
+    GENERAL_TASKS_CELL,
+    TASK_INDEX_PATTERN,
+    TASK_INPUT_PREFIX,
+    get_row_prefix,
+    parse_input_name,
+    parse_task_index,
+)
+from src.objects.kiara_project import KiaraProject
 from src.objects.kiara_work_item import KiaraWorkItem, TestWorkItemResult
+from src.objects.timesheet_context import TimesheetContext
+from src.objects.timesheet_snapshot import TimesheetSnapshot
 from src.exceptions.custom_exceptions import (
     GeneralTasksNavigationError,
     TargetElementNotFoundError,
 )
+from src.lib.retry import get_timeout, run_with_retry
+from src.lib.tracing import traced
 
 log = logging.getLogger(__name__)
 
 
 async def is_target_element_present(
-    locator: Locator, locator_string: str, timeout: int = 3000
+    locator: Locator, locator_string: str, timeout: Optional[int] = None
 ) -> bool:
     try:
-        await locator.element_handle(timeout=timeout)
+        await locator.element_handle(timeout=timeout or get_timeout("lookup"))
         log.debug(f"Element found for '{locator_string}'")
         return True
     except PlaywrightTimeoutError:
@@ -32,14 +43,20 @@ async def is_target_element_present(
 
 
 async def get_target_element(
-    locator: Locator, element_identifier: str, timeout: int = 3000
+    locator: Locator, element_identifier: str, timeout: Optional[int] = None
 ) -> Locator:
     try:
-        if await is_target_element_present(
-            locator=locator, locator_string=element_identifier, timeout=timeout
-        ):
-            return locator
-        raise TargetElementNotFoundError(f"{element_identifier} not found.")
+        await run_with_retry(
+            "lookup",
+            f"find {element_identifier}",
+            lambda policy_timeout: locator.element_handle(
+                timeout=timeout or policy_timeout
+            ),
+        )
+        log.debug(f"Element found for '{element_identifier}'")
+        return locator
+    except PlaywrightTimeoutError as e:
+        raise TargetElementNotFoundError(f"{element_identifier} not found.") from e
     except TargetElementNotFoundError as e:
         raise TargetElementNotFoundError(f"{element_identifier} not found.") from e
 
@@ -62,13 +79,71 @@ async def get_task_locator(
     return cell_locator
 
 
-async def get_task_index(locator: Locator) -> int:
+@traced()
+async def get_task_index(locator: Locator) -> Optional[str]:
     inner_html = await locator.nth(0).inner_html()
-
-    pattern = re.compile(r"taak\[(\d+)\]")
-    task_index = pattern.search(inner_html)
-
-    return task_index.group(1)
+    return parse_task_index(inner_html)
+
+
+TASK_INDEX_MAP_SCRIPT = r"""
+(patternSource) => {
+    // the pattern of `parse_task_index`, Python and JavaScript share its syntax
+    const pattern = new RegExp(patternSource);
+    const taskIndices = {};
+    for (const cell of document.querySelectorAll("td")) {
+        const name = cell.textContent.replace(/\s+/g, " ").trim();
+        if (!name || name in taskIndices) {
+            continue;
+        }
+        // project tasks hold the task input in their cell, general tasks in their row
+        const row = cell.closest("tr");
+        const match = cell.innerHTML.match(pattern) || (row && row.innerHTML.match(pattern));
+        if (match) {
+            taskIndices[name] = match[1];
+        }
+    }
+    return taskIndices;
+}
+"""
+
+
+@traced()
+async def get_task_index_map(page: Page, timesheet: TimesheetContext) -> dict[str, str]:
+    """
+    Task name -> task index for every task in the expanded sections, in one evaluate.
+    """
+    timesheet.task_indices = await page.evaluate(
+        TASK_INDEX_MAP_SCRIPT, TASK_INDEX_PATTERN.pattern
+    )
+    log.debug(f"Resolved {len(timesheet.task_indices)} task indices.")
+    return timesheet.task_indices
+
+
+async def resolve_task_index(
+    page: Page, project: KiaraProject, timesheet: TimesheetContext
+) -> str:
+    """
+    Looks the task index up in the task index map. Names the map holds differently,
+    e.g. whitespace in the cell's text, fall back to the cell's accessible name and
+    are added to the map.
+    """
+    if timesheet.task_indices and project.name in timesheet.task_indices:
+        return timesheet.task_indices[project.name]
+    task_locator = await get_task_locator(
+        page=page, search_string=project.name, is_general_task=project.is_general_task
+    )
+    if not await is_target_element_present(task_locator, project.name):
+        raise TargetElementNotFoundError(
+            f"Project '{project.name}' not found in the timesheet."
+        )
+    task_index = await get_task_index(locator=task_locator)
+    if task_index is None:
+        raise TargetElementNotFoundError(
+            f"No task index found for project '{project.name}'."
+        )
+    if timesheet.task_indices is not None:
+        timesheet.task_indices[project.name] = task_index
+    return task_index
 
 
 async def get_date_column(page: Page, date: str) -> Locator:
@@ -76,45 +151,96 @@ async def get_date_column(page: Page, date: str) -> Locator:
     return date_column
 
 
-async def get_date_column_indices(page: Page) -> dict[str, int]:
+DATE_HEADERS_SCRIPT = """
+() => Array.from(
+    document.querySelectorAll("table:nth-of-type(4) tr:nth-of-type(3) th")
+).map((header) => header.innerText)
+"""
+
+
+def parse_date_headers(headers: list[str]) -> dict[str, int]:
     date_indices: dict[str, int] = {}
     days = ["Ma", "Di", "Wo", "Do", "Vr", "Za", "Zo"]
     for i in range(0, 7):
-        headers_locator = page.locator(
-            "table:nth-of-type(4) tr:nth-of-type(3) th"
-        ).filter(has_text=re.compile(f"^{days[i]}"))
-        inner_text = await headers_locator.inner_text()
-        date_elems = inner_text.split("\n")[1].split("/")
+        inner_text = next(
+            (header for header in headers if header.strip().startswith(days[i])),
+            None,
+        )
+        if inner_text is None:
+            raise TargetElementNotFoundError(f"Date header for '{days[i]}' not found.")
+        lines = inner_text.strip().split("\n")
+        date_elems = lines[1].split("/") if len(lines) > 1 else []
+        if len(date_elems) != 2:
+            raise TargetElementNotFoundError(
+                f"Date header '{inner_text.strip()}' has no 'D/M' date."
+            )
         date = f"{date_elems[1]}-{date_elems[0]}"
         date_indices[date] = i
     return date_indices
 
 
-async def _get_highest_work_item_index(page: Page, task_index: int) -> int:
-    work_item_selector = (
-        f'input[name^="taak[{task_index}].prestatie["][name$="].omschrijving"]'
-    )
-    time.sleep(1)
-    await page.wait_for_load_state("networkidle")
-    work_items = await page.query_selector_all(work_item_selector)
+@traced()
+async def get_date_column_indices(page: Page) -> dict[str, int]:
+    headers = await page.evaluate(DATE_HEADERS_SCRIPT)
+    return parse_date_headers(headers)
+
 
-    last_item_name = await work_items[-1].get_attribute("name")
-    log.debug(f"Last item name: {last_item_name}")
+async def get_week_date_indices(page: Page, timesheet: TimesheetContext) -> dict:
+    if timesheet.date_indices is None:
+        timesheet.date_indices = await get_date_column_indices(page)
+        log.debug(f"Cached date column indices: {timesheet.date_indices}")
+    return timesheet.date_indices
 
-    match = re.search(r"prestatie\[(\d+)\]", last_item_name)
-    last_item_index = match.group(1)
-    log.debug(f"Matches: {match.groups()}")
-    log.debug(f"Last item index: {last_item_index}")
 
-    return last_item_index
+TIMESHEET_SNAPSHOT_SCRIPT = """
+(rowPrefix) => Array.from(
+    document.querySelectorAll(`input[name^="${rowPrefix}"]`)
+).map((input) => [input.name, input.type === "checkbox" ? input.checked : input.value])
+"""
 
 
-async def test_work_item_exists(
-    page: Page, work_item: KiaraWorkItem, date_indices: dict, task_index: int
+async def read_timesheet_snapshot(page: Page, task_index: int) -> TimesheetSnapshot:
+    snapshot = TimesheetSnapshot(task_index)
+    await refresh_timesheet_snapshot(page, snapshot)
+    return snapshot
+
+
+@traced()
+async def refresh_timesheet_snapshot(page: Page, snapshot: TimesheetSnapshot) -> None:
+    inputs = await page.evaluate(
+        TIMESHEET_SNAPSHOT_SCRIPT, get_row_prefix(snapshot.task_index)
+    )
+    snapshot.load(inputs)
+    log.debug(f"Read timesheet snapshot for task '{snapshot.task_index}'.")
+
+
+@traced()
+async def read_timesheet_snapshots(page: Page) -> dict[int, TimesheetSnapshot]:
+    """
+    Snapshots of every rendered task in one round trip. Collapsed tasks aren't rendered
+    and have no snapshot.
+    """
+    inputs: dict[int, list[tuple[str, str | bool]]] = {}
+    for name, value in await page.evaluate(
+        TIMESHEET_SNAPSHOT_SCRIPT, TASK_INPUT_PREFIX
+    ):
+        input_name = parse_input_name(name)
+        if input_name is not None:
+            inputs.setdefault(input_name.task, []).append((name, value))
+    log.debug(f"Read timesheet snapshots for tasks {sorted(inputs)}.")
+    return {
+        task_index: TimesheetSnapshot.from_inputs(task_index, task_inputs)
+        for task_index, task_inputs in inputs.items()
+    }
+
+
+@traced(labels=["work_item"])
+def test_work_item_exists(
+    snapshot: TimesheetSnapshot, work_item: KiaraWorkItem
 ) -> TestWorkItemResult:
 
     try:
-        work_item_index = await find_work_item(page, work_item, task_index)
+        work_item_index = find_work_item(snapshot, work_item)
         log.debug(f"Work item index: {work_item_index}")
     except Exception as e:
         log.error(f"Error finding work item: {e}")
@@ -123,39 +249,28 @@ async def test_work_item_exists(
     return TestWorkItemResult(work_item_index is not None, work_item_index)
 
 
-async def find_work_item(
-    page: Page,
+@traced(labels=["work_item"])
+def find_work_item(
+    snapshot: TimesheetSnapshot,
     work_item: KiaraWorkItem,
-    task_index: int,
     is_copy: bool = False,
     target_description: str = "",
 ) -> int | None:
-    # lower because uppercase first char breaks kiara sorting :)
-    description = (
-        work_item.description.lower()
-        if work_item.description[0:4] != "Copy"
-        else work_item.description
-    )
+    description = work_item.description
 
-    last_item_index = await _get_highest_work_item_index(page, task_index)
-    log.debug(f"Last item index in current project table '{last_item_index}'")
+    log.debug(f"Last item index in current project table '{snapshot.highest_index}'")
 
-    item_index = None
-    for i in range(0, int(last_item_index) + 1):
-        work_item_locator = page.locator(
-            f'input[name="taak[{task_index}].prestatie[{i}].omschrijving"]'
+    item_indices = snapshot.find_all_descriptions(description)
+    item_index = item_indices[0] if item_indices else None
+    if len(item_indices) > 1:
+        log.warning(
+            f"Work item '{description}' appears on rows {item_indices}. "
+            f"Using index '{item_index}'."
+        )
+    if item_index is not None and is_copy:
+        log.info(
+            f"Found existing dummy work item '{description}' for target '{target_description}' at index '{item_index}'"
         )
-
-        val = cast(str, await work_item_locator.get_attribute("value"))
-        if val.lower() == description.lower():
-            if is_copy:
-                log.info(
-                    f"Found existing dummy work item '{description}' for target '{target_description}' at index '{i}'"
-                )
-            item_index = i
-            break
-        else:
-            continue
 
     if item_index is None:
         log.info(f"No existing work item found for description '{description}'")
@@ -167,7 +282,7 @@ async def find_work_item(
 
 async def get_expand_general_tasks_locator(page: Page) -> Locator:
     general_tasks_expand_locator = page.get_by_role(
-        "cell", name="Algemene Taken", exact=True
+        "cell", name=GENERAL_TASKS_CELL, exact=True
     ).locator("..")
     target_present = await is_target_element_present(
         general_tasks_expand_locator, "General tasks expand button"
@@ -178,6 +293,7 @@ async def get_expand_general_tasks_locator(page: Page) -> Locator:
     raise GeneralTasksNavigationError("General tasks expand button not found")
 
 
+@traced(labels=["search_string"])
 async def get_section_expand_collapse_button(
     page: Page, search_string: str, collapse: bool
 ) -> Locator:
@@ -220,7 +336,7 @@ async def get_phone_number_input_box(page: Page) -> Locator:
         if await is_target_element_present(
             locator=page.locator("input[type='tel'][autocomplete='tel']"),
             locator_string="phone number input box",
-            timeout=15000,
+            timeout=get_timeout("navigation"),
         ):
             return page.locator("input[type='tel'][autocomplete='tel']")
         raise TargetElementNotFoundError("Phone number input box not found.")
@@ -1,4 +1,6 @@
 import logging
+from datetime import date, datetime
+from typing import Optional
 
 from playwright.async_api import (
     Page,
@@ -7,22 +9,41 @@ from playwright.async_api import (
     Error as PlaywrightError,
 )
 
-from src.browser.locate import get_section_expand_collapse_button, get_target_element
+from src.browser.locate import (
+    get_section_expand_collapse_button,
+    get_target_element,
+    get_week_date_indices,
+)
+from src.browser.readiness import wait_for_navigation_commit, wait_for_section_state
+from src.browser.selectors import (
+    NEXT_WEEK_BUTTON,
+    OPEN_TIMESHEET_BUTTON_CELL,
+    PREVIOUS_WEEK_BUTTON,
+    SAVE_BUTTON_CELL,
+)
 from src.exceptions.custom_exceptions import (
     BrowserNavigationError,
     TargetElementNotFoundError,
     KiaraAutomationError,
 )
+from src.objects.timesheet_context import TimesheetContext
+from src.lib.retry import get_timeout, run_with_retry
+from src.lib.tracing import traced
 
 log = logging.getLogger(__name__)
 
+KIARA_BASE_URL = "https://kiara.vlaanderen.be"
+
 
+@traced()
 async def open_timesheet_page(page: Page) -> None:
     identifier = "Open timesheet page button"
     try:
         log.debug("Opening timesheet page.")
         open_timesheet_locator = await get_target_element(
-            locator=page.get_by_role("cell", name="knop ga verder").locator("a"),
+            locator=page.get_by_role("cell", name=OPEN_TIMESHEET_BUTTON_CELL).locator(
+                "a"
+            ),
             element_identifier=identifier,
         )
         if open_timesheet_locator:
@@ -40,24 +61,99 @@ async def open_timesheet_page(page: Page) -> None:
         raise BrowserNavigationError from e
 
 
+@traced(labels=["search_string", "collapse"])
 async def expand_collapse_section(
     page: Page, search_string: str, collapse: bool
-) -> None:
+) -> bool:
+    """
+    Every toggle submits the form. Returns True once Kiara has re-rendered the section
+    in the requested state, i.e. the submit went through. A failed click is only
+    retried while the section isn't in that state yet - a second click would flip it
+    back.
+    """
     button_locator = await get_section_expand_collapse_button(
         page=page, search_string=search_string, collapse=collapse
     )
     try:
-        await button_locator.click()
-        log.info(
-            f"{'Collapsed' if collapse else 'Expanded'} section '{search_string}'."
+        await run_with_retry(
+            "navigation",
+            f"toggle section '{search_string}'",
+            lambda timeout: button_locator.click(timeout=timeout),
+            is_done=lambda: wait_for_section_state(
+                page=page,
+                search_string=search_string,
+                collapsed=collapse,
+                timeout=get_timeout("lookup"),
+            ),
         )
-    except PlaywrightTimeoutError as e:
+    except PlaywrightError as e:
         log.error(f"Failed to collapse or expand section. {e}")
+        return False
+    if not await wait_for_section_state(
+        page=page, search_string=search_string, collapsed=collapse
+    ):
+        return False
+    log.info(f"{'Collapsed' if collapse else 'Expanded'} section '{search_string}'.")
+    return True
+
+
+def _resolve_header_date(header_date: str, near: date) -> date:
+    # week headers have no year - pick the one closest to the target week
+    month, day = (int(part) for part in header_date.split("-"))
+    candidates = [date(near.year + offset, month, day) for offset in (-1, 0, 1)]
+    return min(candidates, key=lambda candidate: abs((candidate - near).days))
+
+
+async def get_displayed_week_start(
+    page: Page, timesheet: TimesheetContext, near: date
+) -> date:
+    date_indices = await get_week_date_indices(page, timesheet)
+    monday_header = next(
+        header_date for header_date, index in date_indices.items() if index == 0
+    )
+    return _resolve_header_date(monday_header, near)
 
 
+@traced(labels=["week_start"])
+async def navigate_to_week(
+    page: Page, timesheet: TimesheetContext, week_start: str
+) -> None:
+    try:
+        target = datetime.strptime(week_start, "%Y-%m-%d").date()
+    except ValueError as e:
+        raise BrowserNavigationError(
+            f"Sheet name '{week_start}' is not a yyyy-MM-dd week start."
+        ) from e
+
+    displayed = await get_displayed_week_start(page, timesheet, target)
+    weeks_to_move = (target - displayed).days // 7
+    button = NEXT_WEEK_BUTTON if weeks_to_move > 0 else PREVIOUS_WEEK_BUTTON
+    for _ in range(abs(weeks_to_move)):
+        try:
+            # not retried - a click that did go through would skip a week
+            async with wait_for_navigation_commit(page):
+                await page.locator(button).click(timeout=get_timeout("navigation"))
+        except PlaywrightTimeoutError as e:
+            log.error(f"Failed to click navigation button: '{button}'")
+            raise BrowserNavigationError from e
+        timesheet.invalidate_week_cache()
+
+    displayed = await get_displayed_week_start(page, timesheet, target)
+    if displayed != target:
+        raise BrowserNavigationError(
+            f"Timesheet shows week '{displayed}' instead of '{target}'."
+        )
+    log.info(f"Navigated to week '{week_start}'.")
+
+
+@traced(labels=["url"])
 async def navigate_to_page(page: Page, url: str):
     try:
-        await page.goto(url)
+        await run_with_retry(
+            "navigation",
+            f"open '{url}'",
+            lambda timeout: page.goto(url, timeout=timeout),
+        )
         log.info(f"Opened page: {url}")
     except (PlaywrightTimeoutError, PlaywrightError) as e:
         log.error(f"Failed to open page: {url}. {e}")
@@ -65,22 +161,25 @@ async def navigate_to_page(page: Page, url: str):
 
 
 async def click_navigation_button(
-    nav_button_locator: Locator, nav_button_name: str, timeout: int = 3000
+    nav_button_locator: Locator, nav_button_name: str, timeout: Optional[int] = None
 ):
+    # not retried - these buttons submit, and a click that raised may still have gone
+    # through, e.g. when the navigation destroys the page before the click returns
     try:
-        await nav_button_locator.click(timeout=timeout)
+        await nav_button_locator.click(timeout=timeout or get_timeout("navigation"))
         log.info(f"Clicked navigation button: '{nav_button_name}'")
-    except PlaywrightTimeoutError as e:
+    except PlaywrightError as e:
         log.error(f"Failed to click navigation button: '{nav_button_name}'")
         raise BrowserNavigationError from e
 
 
+@traced()
 async def save_timesheet_provisionally(page: Page) -> None:
     log.info("Saving timesheet provisionally.")
     try:
-        save_button_locator = page.get_by_role(
-            "cell", name="knop bewaar voorlopig"
-        ).locator("a")
+        save_button_locator = page.get_by_role("cell", name=SAVE_BUTTON_CELL).locator(
+            "a"
+        )
         await save_button_locator.element_handle()
     except TargetElementNotFoundError as e:
         raise BrowserNavigationError from e
@@ -88,7 +187,6 @@ async def save_timesheet_provisionally(page: Page) -> None:
         await click_navigation_button(
             nav_button_locator=save_button_locator,
             nav_button_name="Save timesheet provisionally",
-            timeout=15000,
         )
     except Exception as e:
         raise BrowserNavigationError from e
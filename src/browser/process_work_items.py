@@ -4,75 +4,125 @@ from typing import cast
 from playwright.async_api import Page
 
 from src.objects.kiara_work_item import KiaraWorkItem
+from src.objects.form_write_batch import FormWriteBatch
 from src.objects.kiara_project import KiaraProject
+from src.objects.timesheet_context import TimesheetContext
+from src.objects.timesheet_snapshot import TimesheetSnapshot
+from src.objects.work_item_row import WorkItemRow
 from src.browser.locate import (
-    get_task_locator,
-    get_task_index,
-    get_date_column_indices,
+    resolve_task_index,
+    get_week_date_indices,
+    read_timesheet_snapshot,
     test_work_item_exists,
 )
-from src.browser.update import add_new_work_item, add_work_item_entry
+from src.browser.update import (
+    add_new_work_items,
+    add_work_item_entry,
+    flush_form_batch,
+)
 from src.browser.navigate import expand_collapse_section
+from src.lib.project_helpers import pivot_work_items
+from src.lib.reconcile import build_change_plan
+from src.lib.tracing import traced
+from src.exceptions.custom_exceptions import TargetElementNotFoundError
 
 log = logging.getLogger(__name__)
 
 
-async def process_work_item(
-    page: Page,
-    work_item: KiaraWorkItem,
+@traced(labels=["row"])
+def process_work_row(
+    snapshot: TimesheetSnapshot,
+    batch: FormWriteBatch,
+    row: WorkItemRow,
     date_indices: dict,
-    task_index: int,
-    safe_mode: bool,
-):
-    log.info(
-        f"Processing work item '{work_item.description}' for date '{work_item.date}'"
-    )
+) -> list[tuple[KiaraWorkItem, int]]:
+    """
+    Looks up the description once and queues the hours of all its days.
+    Returns the queued work items with the index of their row.
+    """
+    log.info(f"Processing work item '{row.description}' for {len(row)} days")
 
-    test_work_item_result = await test_work_item_exists(
-        page, work_item, date_indices, task_index
-    )
+    test_work_item_result = test_work_item_exists(snapshot, row.work_items[0])
 
-    if test_work_item_result.exists:
-        log.debug(f"Work item '{work_item.description}' already exists.")
-        await add_work_item_entry(
-            page=page,
-            work_item=work_item,
-            date_indices=date_indices,
-            task_index=task_index,
-            work_item_index=cast(int, test_work_item_result.index),
-        )
-    else:
-        log.debug(f"Work item '{work_item.description}' does not exist yet. Creating.")
-        await add_new_work_item(
-            page=page,
+    if not test_work_item_result.exists:
+        for work_item in row.work_items:
+            log.error(
+                f"Work item '{work_item.description}' could not be created. "
+                f"Skipping '{work_item.date}' - {work_item.time_spent}h."
+            )
+        return []
+    row_index = cast(int, test_work_item_result.index)
+    return [
+        (work_item, row_index)
+        for work_item in row.work_items
+        if add_work_item_entry(
+            snapshot=snapshot,
+            batch=batch,
             work_item=work_item,
-            task_index=task_index,
             date_indices=date_indices,
-            safe_mode=safe_mode,
+            work_item_index=row_index,
         )
+    ]
 
 
-async def process_project(page: Page, project: KiaraProject, safe_mode: bool):
+@traced(labels=["project"])
+async def process_project(
+    page: Page, project: KiaraProject, timesheet: TimesheetContext
+):
     project_name = project.name
     work_items = project.items
     log.info(f"Processing project '{project_name}'.")
 
-    task_locator = await get_task_locator(
-        page=page, search_string=project_name, is_general_task=project.is_general_task
-    )
-    task_index = await get_task_index(locator=task_locator)
-
+    try:
+        task_index = await resolve_task_index(page, project, timesheet)
+    except TargetElementNotFoundError as e:
+        log.error(f"{e} Skipping its {len(work_items)} work items.")
+        return
     await expand_collapse_section(page=page, search_string=project_name, collapse=False)
+    snapshot = await read_timesheet_snapshot(page, task_index)
 
-    date_indices = await get_date_column_indices(page)
+    date_indices = await get_week_date_indices(page, timesheet)
+    batch = FormWriteBatch(timesheet.fill_mode)
+    written: list[tuple[KiaraWorkItem, int]] = []
+    flushed = True
 
-    for work_item in work_items:
-        await process_work_item(
+    plan = build_change_plan(project, snapshot, date_indices)
+    if timesheet.plan_only:
+        print(plan.format())
+    else:
+        await add_new_work_items(
             page=page,
-            work_item=work_item,
-            date_indices=date_indices,
-            task_index=task_index,
-            safe_mode=safe_mode,
+            snapshot=snapshot,
+            batch=batch,
+            work_items=[row.work_item for row in plan.rows_to_create],
+            timesheet=timesheet,
+            input_descriptions=[work_item.description for work_item in work_items],
         )
+        # only touch cells that differ from the timesheet in reconcile mode
+        if timesheet.reconcile:
+            work_items = [cell.work_item for cell in plan.cells_to_change]
+        for row in pivot_work_items(work_items):
+            written.extend(
+                process_work_row(
+                    snapshot=snapshot,
+                    batch=batch,
+                    row=row,
+                    date_indices=date_indices,
+                )
+            )
+        flushed = await flush_form_batch(page, batch)
+
+    submitted = await expand_collapse_section(
+        page=page, search_string=project_name, collapse=True
+    )
 
-    await expand_collapse_section(page=page, search_string=project_name, collapse=True)
+    # collapsing submits the form - only then do the written cells survive a crash
+    if timesheet.journal is not None and written:
+        if flushed and submitted:
+            for work_item, row_index in written:
+                timesheet.journal.record(work_item, row_index)
+        else:
+            log.warning(
+                f"Writes of project '{project_name}' not confirmed. Not journaling "
+                f"its {len(written)} cells, a resumed run writes them again."
+            )
@@ -0,0 +1,103 @@
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
+
+from src.browser.selectors import (
+    DESCRIPTION_FIELD,
+    get_input_selector,
+    get_row_input_name,
+    get_row_prefix,
+)
+from src.lib.retry import get_timeout
+from src.lib.tracing import traced
+
+log = logging.getLogger(__name__)
+
+ROW_COUNT_SCRIPT = f"""
+([rowPrefix, previousCount]) => document.querySelectorAll(
+    `input[name^="${{rowPrefix}}"][name$="].{DESCRIPTION_FIELD}"]`
+).length !== previousCount
+"""
+
+
+@traced()
+async def wait_for_row_count_change(
+    page: Page, task_index: int, previous_count: int, timeout: Optional[int] = None
+) -> bool:
+    timeout = timeout or get_timeout("navigation")
+    try:
+        await page.wait_for_function(
+            ROW_COUNT_SCRIPT,
+            arg=[get_row_prefix(int(task_index)), previous_count],
+            timeout=timeout,
+        )
+        log.debug(f"Row count of task '{task_index}' changed from '{previous_count}'.")
+        return True
+    except PlaywrightTimeoutError:
+        log.warning(
+            f"Row count of task '{task_index}' still '{previous_count}' after {timeout}ms."
+        )
+        return False
+
+
+@traced()
+async def wait_for_row_attached(
+    page: Page, task_index: int, row_index: int, timeout: Optional[int] = None
+) -> bool:
+    timeout = timeout or get_timeout("lookup")
+    input_name = get_row_input_name(int(task_index), row_index, DESCRIPTION_FIELD)
+    try:
+        await page.locator(get_input_selector(input_name)).wait_for(
+            state="attached", timeout=timeout
+        )
+        log.debug(f"Input '{input_name}' is attached.")
+        return True
+    except PlaywrightTimeoutError:
+        log.warning(f"Input '{input_name}' not attached after {timeout}ms.")
+        return False
+
+
+@traced(labels=["search_string"])
+async def wait_for_section_state(
+    page: Page, search_string: str, collapsed: bool, timeout: Optional[int] = None
+) -> bool:
+    """
+    A toggled section shows the opposite button once Kiara has re-rendered it.
+    """
+    timeout = timeout or get_timeout("navigation")
+    button_name = "Expand" if collapsed else "Collapse"
+    button_locator = (
+        page.get_by_role("cell", name=search_string, exact=True)
+        .locator("..")
+        .get_by_role("cell", name=button_name)
+        .get_by_role("img")
+    )
+    try:
+        await button_locator.first.wait_for(state="visible", timeout=timeout)
+        log.debug(
+            f"Section '{search_string}' is {'collapsed' if collapsed else 'expanded'}."
+        )
+        return True
+    except PlaywrightTimeoutError:
+        log.warning(
+            f"Section '{search_string}' not {'collapsed' if collapsed else 'expanded'} "
+            f"after {timeout}ms."
+        )
+        return False
+
+
+@asynccontextmanager
+async def wait_for_navigation_commit(
+    page: Page, timeout: Optional[int] = None
+) -> AsyncIterator[None]:
+    """
+    Wraps an action that submits the form. Returns once the new document is parsed,
+    without waiting for all of Kiara's assets like networkidle would.
+    """
+    timeout = timeout or get_timeout("navigation")
+    async with page.expect_navigation(wait_until="commit", timeout=timeout):
+        yield
+    await page.wait_for_load_state("domcontentloaded", timeout=timeout)
+    log.debug(f"Navigation committed: '{page.url}'")
@@ -0,0 +1,100 @@
+"""
+Input names, selectors and patterns of Kiara's timesheet form, built in one place.
+
+Every input of a task row is named `taak[t].prestatie[r].<field>`, hours per day are
+`taak[t].prestatie[r].dagPrestatie[d].gepresteerdeTijd`. Names are built from the field
+schema below and parsed back into `InputName(task, row, day, field)` tuples.
+Doesn't import Playwright - the snapshot parses input names with it too.
+"""
+
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+DESCRIPTION_FIELD = "omschrijving"
+HOURS_FIELD = "gepresteerdeTijd"
+JIRA_REF_FIELD = "incident.lineItem"
+APP_REF_FIELD = "toepassing.nummer"
+COPY_FIELD = "toBeCopied"
+
+# Kiara row field -> SnapshotRow attribute
+ROW_FIELDS = {
+    DESCRIPTION_FIELD: "description",
+    JIRA_REF_FIELD: "jira_ref",
+    APP_REF_FIELD: "app_ref",
+    COPY_FIELD: "to_be_copied",
+}
+# KiaraWorkItem attribute -> Kiara row field, for the optional text cells
+WORK_ITEM_FIELDS = {
+    "jira_ref": JIRA_REF_FIELD,
+    "app_ref": APP_REF_FIELD,
+}
+
+TASK_INDEX_PATTERN = re.compile(r"taak\[(\d+)\]")
+INPUT_NAME_PATTERN = re.compile(
+    r"^taak\[(\d+)\]\.prestatie\[(\d+)\]\.(?:dagPrestatie\[(\d+)\]\.)?(.+)$"
+)
+
+COPY_BUTTON = 'img[alt="knop voeg nieuwe activiteit toe"]'
+NEXT_WEEK_BUTTON = 'img[alt="knop volgende week"]'
+PREVIOUS_WEEK_BUTTON = 'img[alt="knop vorige week"]'
+# cells are located by their accessible name
+SAVE_BUTTON_CELL = "knop bewaar voorlopig"
+OPEN_TIMESHEET_BUTTON_CELL = "knop ga verder"
+# section headers, toggled like a task
+GENERAL_TASKS_CELL = "Algemene Taken"
+PROJECT_TASKS_CELL = "Project-gerelateerde Taken"
+
+
+class InputName(NamedTuple):
+    task: int
+    row: int
+    # only set for the inputs per day
+    day: Optional[int]
+    field: str
+
+
+# prefix of the row inputs of every task
+TASK_INPUT_PREFIX = "taak["
+
+
+def get_row_prefix(task_index: int) -> str:
+    return f"taak[{task_index}].prestatie["
+
+
+@lru_cache(maxsize=16384)
+def get_row_input_name(task_index: int, row_index: int, field: str) -> str:
+    return f"taak[{task_index}].prestatie[{row_index}].{field}"
+
+
+@lru_cache(maxsize=16384)
+def get_day_input_name(
+    task_index: int, row_index: int, day_index: int, field: str = HOURS_FIELD
+) -> str:
+    return (
+        f"taak[{task_index}].prestatie[{row_index}].dagPrestatie[{day_index}].{field}"
+    )
+
+
+def get_input_selector(input_name: str) -> str:
+    return f'input[name="{input_name}"]'
+
+
+@lru_cache(maxsize=16384)
+def parse_input_name(input_name: str) -> Optional[InputName]:
+    # a snapshot parses the same names on every refresh
+    match = INPUT_NAME_PATTERN.match(input_name)
+    if not match:
+        return None
+    task_index, row_index, day_index, field = match.groups()
+    return InputName(
+        int(task_index),
+        int(row_index),
+        int(day_index) if day_index is not None else None,
+        field,
+    )
+
+
+def parse_task_index(html: str) -> Optional[str]:
+    match = TASK_INDEX_PATTERN.search(html)
+    return match.group(1) if match else None
@@ -1,229 +1,404 @@
 import logging
+from collections import Counter
+from typing import Iterable, Sequence
 
 from playwright.async_api import Page, Locator, TimeoutError as PlaywrightTimeoutError
 
-from src.browser.locate import (
-    _get_highest_work_item_index,
-    find_work_item,
-    is_target_element_present,
-)
+from src.browser.locate import refresh_timesheet_snapshot
 from src.browser.navigate import expand_collapse_section
+from src.browser.readiness import (
+    wait_for_navigation_commit,
+    wait_for_row_attached,
+    wait_for_row_count_change,
+)
+from src.browser.selectors import (
+    COPY_BUTTON,
+    COPY_FIELD,
+    DESCRIPTION_FIELD,
+    WORK_ITEM_FIELDS,
+    get_day_input_name,
+    get_input_selector,
+    get_row_input_name,
+)
 from src.lib.project_helpers import is_empty_value
+from src.objects.form_write_batch import FormWriteBatch
 from src.objects.kiara_work_item import KiaraWorkItem
+from src.objects.timesheet_context import TimesheetContext
+from src.objects.timesheet_snapshot import COPY_PREFIX, TimesheetSnapshot
+from src.lib.retry import run_with_retry
+from src.lib.tracing import record_count, record_retry, trace_span, traced
 
 log = logging.getLogger(__name__)
 
 
-async def add_work_item_entry(
-    page: Page,
-    work_item: KiaraWorkItem,
-    date_indices: dict,
-    task_index: int,
-    work_item_index: int,
+BATCH_FILL_SCRIPT = """
+(writes) => {
+    const missing = [];
+    for (const [name, value] of writes) {
+        const input = document.getElementsByName(name)[0];
+        if (!input) {
+            missing.push(name);
+            continue;
+        }
+        // Kiara recalculates totals on change/blur - fire what fill() + blur() would
+        input.focus();
+        if (input.type === "checkbox") {
+            input.checked = value;
+        } else {
+            input.value = value;
+        }
+        input.dispatchEvent(new Event("input", { bubbles: true }));
+        input.dispatchEvent(new Event("change", { bubbles: true }));
+        input.blur();
+    }
+    return missing;
+}
+"""
+
+
+def queue_input(
+    snapshot: TimesheetSnapshot,
+    batch: FormWriteBatch,
+    input_name: str,
+    value: str | bool,
 ) -> None:
-    # item_date = await _format_date_silly(work_item.date)
-    # time_spent = await _format_timespan_silly(work_item.time_spent)
+    batch.add(input_name, value)
+    snapshot.apply_input(input_name, value)
 
+
+@traced()
+async def flush_form_batch(page: Page, batch: FormWriteBatch) -> bool:
+    """
+    Must be called before anything that reloads the page (copy, section toggle, save).
+    Kiara re-sorts rows on reload, so queued row indices are only valid until then.
+    Returns False if any queued input wasn't written.
+    """
+    if not batch:
+        return True
+    if batch.fill_mode == "cell":
+        written = await _flush_form_batch_per_cell(page, batch)
+    else:
+        written = await _flush_form_batch_evaluate(page, batch)
+    batch.clear()
+    return written
+
+
+async def _flush_form_batch_evaluate(page: Page, batch: FormWriteBatch) -> bool:
     try:
-        column_index = date_indices[work_item.formatted_date]
-    except KeyError:
-        print(f"Date {work_item.formatted_date} not found in selected week")
-        return  # fix proper exc handling etc.
-    work_item_locator = page.locator(
-        f'input[name="taak[{task_index}].prestatie[{work_item_index}].dagPrestatie[{column_index}].gepresteerdeTijd"]'
-    )
-    try:
-        await work_item_locator.fill(work_item.time_spent)
-        await work_item_locator.blur()
-        log.info(
-            f"Added time to existing work item '{work_item.description}' on '{work_item.date}' - {work_item.time_spent}h"
-        )
+        missing = await page.evaluate(BATCH_FILL_SCRIPT, batch.items())
     except Exception as e:
-        log.error(
-            f"Failed to add time to existing work item '{work_item.description}' on '{work_item.date}' - {work_item.time_spent}h"
-        )
+        log.error(f"Failed to write {len(batch)} inputs in batch.")
         log.error(e)
+        return False
+    for input_name in missing:
+        log.error(f"Input '{input_name}' not found. Value was not written.")
+    log.debug(f"Wrote {len(batch) - len(missing)} inputs in batch.")
+    return not missing
 
 
-async def check_work_item_box(
-    page: Page,
+async def _flush_form_batch_per_cell(page: Page, batch: FormWriteBatch) -> bool:
+    written = True
+    for input_name, value in batch.items():
+        locator = page.locator(get_input_selector(input_name))
+        try:
+            if isinstance(value, bool):
+                await run_with_retry(
+                    "fill",
+                    f"check '{input_name}'",
+                    lambda timeout: locator.set_checked(value, timeout=timeout),
+                )
+            else:
+                await run_with_retry(
+                    "fill",
+                    f"fill '{input_name}'",
+                    lambda timeout: locator.fill(value, timeout=timeout),
+                )
+            await locator.blur()
+            log.debug(f"Updated '{input_name}' with value '{value}'")
+        except Exception as e:
+            log.error(f"Failed to update '{input_name}' with value '{value}'")
+            log.error(e)
+            written = False
+    return written
+
+
+def add_work_item_entry(
+    snapshot: TimesheetSnapshot,
+    batch: FormWriteBatch,
     work_item: KiaraWorkItem,
-    task_index: int,
     date_indices: dict,
-    last_work_item_index: int,
+    work_item_index: int,
+) -> bool:
+    try:
+        column_index = date_indices[work_item.formatted_date]
+    except KeyError:
+        log.error(f"Date {work_item.formatted_date} not found in selected week")
+        return False
+    input_name = get_day_input_name(snapshot.task_index, work_item_index, column_index)
+    queue_input(snapshot, batch, input_name, work_item.time_spent)
+    log.info(
+        f"Added time to work item '{work_item.description}' on '{work_item.date}' - {work_item.time_spent}h"
+    )
+    return True
+
+
+def check_work_item_boxes(
+    snapshot: TimesheetSnapshot, batch: FormWriteBatch, count: int
 ) -> None:
-    # need to take last element to avoid broken state due to odd behaviour:
+    # need to take the last elements to avoid broken state due to odd behaviour:
     # A new item bumping the selected copy dummy down an index
     # only changes the index AFTER the second copy action
     # forces a page reload
     # in other words - if it gets bumped down everything breaks
-    work_item_locator = page.locator(
-        f'input[name="taak[{task_index}].prestatie[{last_work_item_index}].omschrijving"]'
-    )
-    checkbox_locator = page.locator(
-        f'input[name="taak[{task_index}].prestatie[{last_work_item_index}].toBeCopied"]'
-    )
-    try:
-        dupe_description = await work_item_locator.get_attribute("value")
-        log.debug(f"Will copy existing work item '{dupe_description}'")
-        await checkbox_locator.check()
-        log.debug(f"Checked checkbox for work item '{work_item.description}'")
-    except Exception as e:
-        log.error(f"Failed to check checkbox for work item '{work_item.description}'")
-        log.error(e)
+    source_indices = sorted(snapshot.rows)[-count:]
+    for row_index, row in snapshot.rows.items():
+        checkbox_name = get_row_input_name(snapshot.task_index, row_index, COPY_FIELD)
+        if row_index in source_indices:
+            queue_input(snapshot, batch, checkbox_name, True)
+            log.debug(f"Will copy existing work item '{row.description}'")
+        elif row.to_be_copied:
+            queue_input(snapshot, batch, checkbox_name, False)
 
 
-async def remember_copied_name(
-    page: Page,
-    work_item: KiaraWorkItem,
-    task_index: int,
-    date_indices: dict,
-    last_work_item_index: int,
-) -> str:
-    description_locator = page.locator(
-        f'input[name="taak[{task_index}].prestatie[{last_work_item_index}].omschrijving"]'
-    )
-    copied_work_item_orig_name = await description_locator.get_attribute("value")
-    copied_work_item_name = f"Copy {copied_work_item_orig_name}"
-
-    log.debug(f"Target work item name: '{work_item.description}'")
-    return copied_work_item_name
+def _get_new_row_indices(
+    snapshot: TimesheetSnapshot, existing_descriptions: Counter
+) -> list[int]:
+    remaining = existing_descriptions.copy()
+    new_row_indices = []
+    for row_index in sorted(snapshot.rows):
+        description = snapshot.rows[row_index].description
+        if remaining[description] > 0:
+            remaining[description] -= 1
+        elif description.startswith(COPY_PREFIX):
+            new_row_indices.append(row_index)
+        else:
+            log.warning(
+                f"Unexpected new work item '{description}' at index '{row_index}'"
+            )
+    return new_row_indices
 
 
-async def enter_cell_text(
-    page: Page,
+def enter_cell_text(
+    snapshot: TimesheetSnapshot,
+    batch: FormWriteBatch,
     work_item: KiaraWorkItem,
-    task_index: int,
     work_item_index: int,
     work_item_column_key: str,
     cell_type_key: str,
 ) -> None:
-    locator_strings = {
-        "jira_ref": f"input[name='taak[{task_index}].prestatie[{work_item_index}].incident.lineItem']",
-        "app_ref": f"input[name='taak[{task_index}].prestatie[{work_item_index}].toepassing.nummer']",
-    }
     has_input = is_empty_value(work_item, work_item_column_key)
     if not has_input:
         return
-    locator_str = locator_strings[work_item_column_key]
-    locator = page.locator(locator_str)
-    item_exists = await is_target_element_present(locator, locator_str)
-    if item_exists:
+    value = getattr(work_item, work_item_column_key)
+    input_name = get_row_input_name(
+        snapshot.task_index, work_item_index, WORK_ITEM_FIELDS[work_item_column_key]
+    )
+    queue_input(snapshot, batch, input_name, value)
+    log.debug(
+        f"Updated {cell_type_key} of work item '{work_item.description}' with value '{value}'"
+    )
+
+
+@traced(labels=["project_name", "count"])
+async def copy_work_items(
+    page: Page,
+    snapshot: TimesheetSnapshot,
+    batch: FormWriteBatch,
+    count: int,
+    project_name: str,
+    timesheet: TimesheetContext,
+    reused_rows: Sequence[int] = (),
+) -> list[int]:
+    """
+    Creates `count` dummy 'Copy ...' rows with as few submits as possible.
+    A single submit copies at most as many rows as the task already has.
+    Returns the indices of the new rows and of the `reused_rows` dummies as of the
+    last reload, copying re-sorts them.
+    """
+    if snapshot.highest_index is None:
+        log.error(f"Task '{project_name}' has no work items to copy.")
+        return []
+    existing_descriptions = Counter(
+        row.description
+        for row_index, row in snapshot.rows.items()
+        if row_index not in reused_rows
+    )
+
+    created = 0
+    while created < count:
+        if created:
+            # a planned submit, not a failure - kept out of the retry count
+            record_count("extra_copy_submits")
+        copies = min(count - created, len(snapshot))
+        check_work_item_boxes(snapshot, batch, copies)
+        await flush_form_batch(page, batch)
+
+        previous_row_count = len(snapshot)
         try:
-            await locator.fill(getattr(work_item, work_item_column_key))
-            log.debug(
-                f"Updated {cell_type_key} of work item '{work_item.description}' - '{getattr(work_item,work_item_column_key)}' with value '{getattr(work_item, work_item_column_key)}'"
-            )
+            with trace_span("update.copy_submit", copies=str(copies)):
+                async with wait_for_navigation_commit(page):
+                    await page.locator(COPY_BUTTON).click()
+                await wait_for_row_count_change(
+                    page, snapshot.task_index, previous_row_count
+                )
         except Exception as e:
-            log.error(
-                f"Failed to update {cell_type_key} of work item '{work_item.description}' - '{getattr(work_item, work_item_column_key)}'"
-            )
+            log.error(f"Failed to add {copies} new dummy work items.")
             log.error(e)
-    else:
-        pass
+            await refresh_timesheet_snapshot(page, snapshot)
+            break
+        # copying submits the form - rows are re-sorted by the server
+        await refresh_timesheet_snapshot(page, snapshot)
+        if len(snapshot) == previous_row_count:
+            log.error("Copying work items did not add any rows.")
+            break
+        created += len(snapshot) - previous_row_count
+        log.debug(f"Added {copies} new dummy work items. {created}/{count} done.")
 
+    if timesheet.safe_mode == "true":
+        log.debug("Safe mode enabled - forcing page reload.")
+        await toggle_project_section(page, snapshot, project_name)
+    elif timesheet.safe_mode == "adaptive":
+        return await verify_copied_rows(
+            page,
+            snapshot,
+            project_name,
+            timesheet,
+            existing_descriptions,
+            count + len(reused_rows),
+        )
 
-async def copy_work_item(
-    page: Page, work_item: KiaraWorkItem, task_index: int, date_indices: dict
-) -> str:
-    # grab last index
-    last_work_item_index = await _get_highest_work_item_index(page, task_index)
+    return _get_new_row_indices(snapshot, existing_descriptions)
 
-    await check_work_item_box(
-        page, work_item, task_index, date_indices, last_work_item_index
-    )
-    copied_work_item_name = await remember_copied_name(
-        page, work_item, task_index, date_indices, last_work_item_index
-    )
 
-    try:
-        await page.locator('img[alt="knop voeg nieuwe activiteit toe"]').click()
-        await page.wait_for_url(
-            "https://kiara.vlaanderen.be/Kiara/secure/tijdsregistratie/detailtijdsregistratie.do"
+@traced(labels=["project_name"])
+async def verify_copied_rows(
+    page: Page,
+    snapshot: TimesheetSnapshot,
+    project_name: str,
+    timesheet: TimesheetContext,
+    existing_descriptions: Counter,
+    count: int,
+) -> list[int]:
+    """
+    Checks that every copied 'Copy ...' row made it into the snapshot. Only when rows
+    are missing does it escalate: first a section toggle, then a full reload.
+    """
+    timesheet.escalations["verified"] += 1
+    new_row_indices = _get_new_row_indices(snapshot, existing_descriptions)
+    for escalation in ["toggle", "reload"]:
+        if len(new_row_indices) >= count:
+            return new_row_indices
+        log.warning(
+            f"Found {len(new_row_indices)} of {count} copied rows for "
+            f"'{project_name}'. Escalating to a {escalation}."
         )
-        log.debug(f"Added new dummy work item '{copied_work_item_name}'")
-    except Exception as e:
-        log.error(f"Failed to add new dummy work item '{copied_work_item_name}'")
-        log.error(e)
-    return copied_work_item_name
+        timesheet.escalations[escalation] += 1
+        record_retry()
+        if escalation == "toggle":
+            await toggle_project_section(page, snapshot, project_name)
+        else:
+            await reload_timesheet(page, snapshot)
+        new_row_indices = _get_new_row_indices(snapshot, existing_descriptions)
+    if len(new_row_indices) < count:
+        log.error(
+            f"Found {len(new_row_indices)} of {count} copied rows for "
+            f"'{project_name}' after a reload."
+        )
+    return new_row_indices
 
 
-async def add_new_work_item(
-    page: Page,
-    work_item: KiaraWorkItem,
-    task_index: int,
-    date_indices: dict,
-    safe_mode: bool,
-):
-    copied_work_item_name = await copy_work_item(
-        page, work_item, task_index, date_indices
+async def reload_timesheet(page: Page, snapshot: TimesheetSnapshot) -> None:
+    # GET the current address - reloading would resubmit the last copy
+    await run_with_retry(
+        "navigation",
+        "reload the timesheet",
+        lambda timeout: page.goto(
+            page.url, wait_until="domcontentloaded", timeout=timeout
+        ),
     )
-    # toggling section to flush new item to task array
-    if safe_mode:
-        log.debug("Safe mode enabled - forcing page reload.")
-        await expand_collapse_section(
-            page=page, search_string=work_item.project, collapse=True
+    if snapshot.highest_index is not None:
+        await wait_for_row_attached(page, snapshot.task_index, snapshot.highest_index)
+    await refresh_timesheet_snapshot(page, snapshot)
+
+
+@traced(labels=["project_name"])
+async def toggle_project_section(
+    page: Page, snapshot: TimesheetSnapshot, project_name: str
+) -> None:
+    # toggling section to flush new items to the task array
+    await expand_collapse_section(page=page, search_string=project_name, collapse=True)
+    await expand_collapse_section(page=page, search_string=project_name, collapse=False)
+    if snapshot.highest_index is not None:
+        await wait_for_row_attached(page, snapshot.task_index, snapshot.highest_index)
+    await refresh_timesheet_snapshot(page, snapshot)
+
+
+@traced()
+async def add_new_work_items(
+    page: Page,
+    snapshot: TimesheetSnapshot,
+    batch: FormWriteBatch,
+    work_items: list[KiaraWorkItem],
+    timesheet: TimesheetContext,
+    input_descriptions: Iterable[str] = (),
+) -> None:
+    """
+    Creates all dummy rows first, then gives each one its work item's description and refs.
+    Hours are entered afterwards like for any existing work item.
+    A resumed run first reuses the dummy rows left by the interrupted run.
+    """
+    if not work_items:
+        return
+    new_row_indices: list[int] = []
+    if timesheet.journal is not None and timesheet.journal.resume:
+        new_row_indices = snapshot.find_dummy_rows(exclude=input_descriptions)
+        new_row_indices = new_row_indices[: len(work_items)]
+    if new_row_indices:
+        log.info(
+            f"Reusing {len(new_row_indices)} dummy work items left by an earlier run."
         )
-        await page.wait_for_load_state("networkidle")
-        await expand_collapse_section(
-            page=page, search_string=work_item.project, collapse=False
+    if len(new_row_indices) < len(work_items):
+        new_row_indices = await copy_work_items(
+            page,
+            snapshot,
+            batch,
+            len(work_items) - len(new_row_indices),
+            work_items[0].project,
+            timesheet,
+            reused_rows=new_row_indices,
         )
-        await page.wait_for_load_state("networkidle")
-    work_item_index = await find_work_item(
-        page,
-        KiaraWorkItem(description=copied_work_item_name),
-        task_index,
-        is_copy=True,
-        target_description=work_item.description,
-    )
-
-    # update description
-    description_locator = page.locator(
-        f'input[name="taak[{task_index}].prestatie[{work_item_index}].omschrijving"]'
-    )
-    try:
-        await description_locator.fill(work_item.description)
-        log.debug(f"Updated description of new work item '{work_item.description}'")
-    except Exception as e:
+    if len(new_row_indices) < len(work_items):
         log.error(
-            f"Failed to update description of new work item '{work_item.description}'"
+            f"Created {len(new_row_indices)} of {len(work_items)} new work items."
         )
-        log.error(e)
-
-    await enter_cell_text(
-        page, work_item, task_index, work_item_index, "jira_ref", "jira_ref"
-    )
-    await enter_cell_text(
-        page, work_item, task_index, work_item_index, "app_ref", "app_ref"
-    )
 
-    if work_item.app_ref:
-        line_item_locator = page.locator(
-            f'input[name="taak[{task_index}].prestatie[{work_item_index}].toepassing.nummer"]'
+    for work_item, work_item_index in zip(work_items, new_row_indices):
+        log.info(
+            f"Assigning dummy work item '{snapshot.get_row(work_item_index).description}' "
+            f"at index '{work_item_index}' to '{work_item.description}'"
+        )
+        description_name = get_row_input_name(
+            snapshot.task_index, work_item_index, DESCRIPTION_FIELD
         )
-        await line_item_locator.fill(work_item.app_ref)
+        queue_input(snapshot, batch, description_name, work_item.description)
 
-    # add time
-    await add_work_item_entry(
-        page, work_item, date_indices, task_index, work_item_index
-    )
-    if safe_mode:
-        log.debug("Safe mode enabled - forcing page reload.")
-        await expand_collapse_section(
-            page=page, search_string=work_item.project, collapse=True
+        enter_cell_text(
+            snapshot, batch, work_item, work_item_index, "jira_ref", "jira_ref"
         )
-        await page.wait_for_load_state("networkidle")
-        await expand_collapse_section(
-            page=page, search_string=work_item.project, collapse=False
+        enter_cell_text(
+            snapshot, batch, work_item, work_item_index, "app_ref", "app_ref"
         )
-        await page.wait_for_load_state("networkidle")
 
 
 async def enter_cell_text_generic(
     locator: Locator, input_value: str, input_identifier: str
 ):
     try:
-        await locator.fill(input_value)
+        await run_with_retry(
+            "fill",
+            f"fill {input_identifier}",
+            lambda timeout: locator.fill(input_value, timeout=timeout),
+        )
         log.debug(f"Updated {input_identifier} with value '{input_value}'")
     except PlaywrightTimeoutError as e:
         log.error(f"Failed to update {input_identifier} with value '{input_value}'")
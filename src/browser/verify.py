@@ -0,0 +1,99 @@
+import logging
+
+from playwright.async_api import Page
+
+from src.browser.locate import (
+    get_task_index_map,
+    get_week_date_indices,
+    read_timesheet_snapshots,
+)
+from src.browser.navigate import expand_collapse_section
+from src.browser.selectors import GENERAL_TASKS_CELL, PROJECT_TASKS_CELL
+from src.exceptions.custom_exceptions import KiaraAutomationError
+from src.lib.tracing import traced
+from src.lib.verification import build_verification_report
+from src.objects.kiara_project import KiaraProject
+from src.objects.timesheet_context import TimesheetContext
+from src.objects.verification_report import VerificationReport
+
+log = logging.getLogger(__name__)
+
+
+async def toggle_tasks(
+    page: Page, projects: list[KiaraProject], collapse: bool
+) -> list[KiaraProject]:
+    """
+    Returns the projects that were toggled. General tasks are toggled with the
+    project section collapsed, like `process_week` does.
+    """
+    toggled = []
+
+    async def toggle(project: KiaraProject) -> None:
+        try:
+            if await expand_collapse_section(
+                page=page, search_string=project.name, collapse=collapse
+            ):
+                toggled.append(project)
+        except KiaraAutomationError as e:
+            log.warning(f"Failed to toggle task '{project.name}': {e}")
+
+    general_tasks = [project for project in projects if project.is_general_task]
+    if general_tasks:
+        await expand_collapse_section(
+            page=page, search_string=PROJECT_TASKS_CELL, collapse=True
+        )
+        for project in general_tasks:
+            await toggle(project)
+        await expand_collapse_section(
+            page=page, search_string=PROJECT_TASKS_CELL, collapse=False
+        )
+    for project in projects:
+        if not project.is_general_task:
+            await toggle(project)
+    return toggled
+
+
+@traced(labels=["week_start"])
+async def verify_week(
+    page: Page,
+    projects: list[KiaraProject],
+    timesheet: TimesheetContext,
+    week_start: str,
+) -> VerificationReport:
+    """
+    Reads every task of the input back in one snapshot and diffs it with the input.
+    Collapsed tasks are expanded for the read and collapsed again afterwards. Every
+    toggle submits the form, so call it once all changes are made.
+    """
+    has_general_tasks = any(project.is_general_task for project in projects)
+    if has_general_tasks:
+        await expand_collapse_section(
+            page=page, search_string=GENERAL_TASKS_CELL, collapse=False
+        )
+    task_indices = await get_task_index_map(page, timesheet)
+    snapshots = await read_timesheet_snapshots(page)
+
+    collapsed = [
+        project
+        for project in projects
+        if project.name in task_indices
+        and int(task_indices[project.name]) not in snapshots
+    ]
+    expanded = await toggle_tasks(page, collapsed, collapse=False)
+    if expanded:
+        snapshots = await read_timesheet_snapshots(page)
+
+    report = build_verification_report(
+        week_start=week_start,
+        projects=projects,
+        task_indices=task_indices,
+        snapshots=snapshots,
+        date_indices=await get_week_date_indices(page, timesheet),
+    )
+
+    await toggle_tasks(page, expanded, collapse=True)
+    if has_general_tasks:
+        await expand_collapse_section(
+            page=page, search_string=GENERAL_TASKS_CELL, collapse=True
+        )
+    return report
@@ -1,87 +1,372 @@
 import logging
+import time
+from typing import Optional
 
 import asyncio
-from playwright.async_api import async_playwright
+from playwright.async_api import Browser, Page, Playwright, async_playwright
 
-from src.browser.core import init_playwright
+from src.browser.core import init_playwright, new_context_page
+from src.browser.locate import get_task_index_map, resolve_task_index
 from src.browser.navigate import (
     open_timesheet_page,
     expand_collapse_section,
+    navigate_to_page,
+    navigate_to_week,
     save_timesheet_provisionally,
 )
 from src.browser.process_work_items import process_project
-from src.browser.authentication import run_authentication_flow
+from src.browser.selectors import GENERAL_TASKS_CELL, PROJECT_TASKS_CELL
+from src.browser.authentication import ensure_authenticated
+from src.browser.verify import verify_week
+from src.lib.run_journal import RunJournal
+from src.lib.session_cache import get_cached_session_state
+from src.lib.tracing import traced
+from src.lib.verification import (
+    get_week_start,
+    log_verification_report,
+    write_verification_report,
+)
 
+from src.objects.form_write_batch import FILL_MODES
 from src.objects.kiara_project import KiaraProject
+from src.objects.timesheet_context import SAFE_MODES, TimesheetContext
+from src.objects.verification_report import VerificationReport
+from src.objects.week_result import WeekResult
 from src.exceptions.custom_exceptions import (
+    ConfigFileProcessingError,
     DebugBrowserConnectionError,
     BrowserNavigationError,
+    TargetElementNotFoundError,
 )
 
 log = logging.getLogger(__name__)
 
 
-async def run_browser_automation(
-    input_config_values: dict, projects: list[KiaraProject]
-):
+def get_timesheet_context(
+    input_config_values: dict, plan_only: bool, journal: Optional[RunJournal] = None
+) -> TimesheetContext:
+    safe_mode = input_config_values["safe_mode"].lower()
+    if safe_mode not in SAFE_MODES:
+        raise ConfigFileProcessingError(
+            f"Invalid safe_mode '{safe_mode}'. Expected one of {SAFE_MODES}."
+        )
+    log.debug(f"Safe mode is set to: {safe_mode}")
+    fill_mode = input_config_values["fill_mode"].lower()
+    if fill_mode not in FILL_MODES:
+        raise ConfigFileProcessingError(
+            f"Invalid fill_mode '{fill_mode}'. Expected one of {FILL_MODES}."
+        )
+    log.debug(f"Fill mode is set to: {fill_mode}")
+    reconcile = input_config_values["reconcile"].lower() in ["true"] or plan_only
+    log.debug(f"Reconcile mode is set to: {reconcile}, plan only: {plan_only}")
+    # a plan-only run changes nothing, there's nothing to verify
+    verify = input_config_values["verify"].lower() in ["true"] and not plan_only
+    return TimesheetContext(
+        safe_mode=safe_mode,
+        fill_mode=fill_mode,
+        reconcile=reconcile,
+        plan_only=plan_only,
+        journal=journal,
+        verify=verify,
+    )
+
+
+def get_session_state(input_config_values: dict) -> Optional[str]:
+    try:
+        max_age = float(input_config_values["session_max_age"])
+    except ValueError as e:
+        raise ConfigFileProcessingError(
+            f"Invalid session_max_age '{input_config_values['session_max_age']}'."
+        ) from e
+    return get_cached_session_state(input_config_values["session_cache"], max_age)
+
+
+async def start_browser(
+    playwright: Playwright, input_config_values: dict
+) -> tuple[Browser, Page]:
     launch_type = input_config_values["launch_type"]
-    phone_number = input_config_values["phone_number"]
-    preferred_project = input_config_values["preferred_project"]
-    auto_submit = input_config_values["auto_submit"]
-    safe_mode = True if input_config_values["safe_mode"].lower() in ["true"] else False
-    log.debug(f"Safe mode is set to: {safe_mode}, object type: {type(safe_mode)}")
+    storage_state = None
+    if launch_type == "internal":
+        storage_state = get_session_state(input_config_values)
 
-    async with async_playwright() as p:
-        try:
-            browser, page = await init_playwright(playwright=p, launch_type=launch_type)
-        except DebugBrowserConnectionError as e:
-            raise e
+    try:
+        browser, page = await init_playwright(
+            playwright=playwright,
+            launch_type=launch_type,
+            storage_state=storage_state,
+            headless=input_config_values["headless"].lower() in ["true"],
+        )
+    except DebugBrowserConnectionError as e:
+        raise e
+
+    if launch_type == "internal":
+        await ensure_authenticated(
+            page=page,
+            phone_number=input_config_values["phone_number"],
+            session_cache=input_config_values["session_cache"],
+            session_loaded=storage_state is not None,
+            base_url=input_config_values["base_url"],
+        )
+    return browser, page
+
+
+async def open_authenticated_page(browser: Browser, input_config_values: dict) -> Page:
+    """
+    Logs in on a new context of an internally launched browser.
+    """
+    storage_state = get_session_state(input_config_values)
+    page = await new_context_page(browser, storage_state)
+    await ensure_authenticated(
+        page=page,
+        phone_number=input_config_values["phone_number"],
+        session_cache=input_config_values["session_cache"],
+        session_loaded=storage_state is not None,
+        base_url=input_config_values["base_url"],
+    )
+    return page
 
-        try:
-            if launch_type == "internal":
-                await run_authentication_flow(page=page, phone_number=phone_number)
-        except Exception as e:
-            raise e
 
+async def release_browser(input_config_values: dict) -> None:
+    if input_config_values["launch_type"] == "internal":
+        keep_open = int(input_config_values["keep_open"])
+        log.info(f"Keeping browser open for {keep_open}s.")
+        await asyncio.sleep(keep_open)
+    else:
+        log.info("Browser was launched externally. Disconnecting.")
+
+
+async def get_found_projects(
+    page: Page, projects: list[KiaraProject], timesheet: TimesheetContext
+) -> list[KiaraProject]:
+    found = []
+    for project in projects:
         try:
-            await open_timesheet_page(page=page)
-        except BrowserNavigationError as e:
-            log.warning("Attempting to continue.")
+            await resolve_task_index(page, project, timesheet)
+        except TargetElementNotFoundError as e:
+            log.error(f"{e} Skipping its {len(project.items)} work items.")
+            continue
+        found.append(project)
+    return found
 
-        for project in projects:
-            if not project.is_general_task:
-                await process_project(page=page, project=project, safe_mode=safe_mode)
 
+async def process_week(
+    page: Page,
+    projects: list[KiaraProject],
+    timesheet: TimesheetContext,
+    input_config_values: dict,
+) -> None:
+    general_tasks = [project for project in projects if project.is_general_task]
+
+    # with both sections expanded, every task index is resolved in one pass
+    # and missing projects are reported before anything changes
+    if general_tasks:
         await expand_collapse_section(
-            page=page, search_string="Project-gerelateerde Taken", collapse=True
+            page=page, search_string=GENERAL_TASKS_CELL, collapse=False
         )
+    await get_task_index_map(page, timesheet)
+    projects = await get_found_projects(page, projects, timesheet)
+
+    if general_tasks:
         await expand_collapse_section(
-            page=page, search_string="Algemene Taken", collapse=False
+            page=page, search_string=PROJECT_TASKS_CELL, collapse=True
         )
-
         for project in projects:
             if project.is_general_task:
-                await process_project(page=page, project=project, safe_mode=safe_mode)
-
+                await process_project(page=page, project=project, timesheet=timesheet)
         await expand_collapse_section(
-            page=page, search_string="Algemene Taken", collapse=True
+            page=page, search_string=GENERAL_TASKS_CELL, collapse=True
         )
         await expand_collapse_section(
-            page=page, search_string="Project-gerelateerde Taken", collapse=False
+            page=page, search_string=PROJECT_TASKS_CELL, collapse=False
         )
 
-        await expand_collapse_section(
+    for project in projects:
+        if not project.is_general_task:
+            await process_project(page=page, project=project, timesheet=timesheet)
+
+    await expand_collapse_section(
+        page=page,
+        search_string=input_config_values["preferred_project"],
+        collapse=False,
+    )
+
+    if input_config_values["auto_submit"] == "true" and not timesheet.plan_only:
+        await save_timesheet_provisionally(page=page)
+
+    if timesheet.safe_mode == "adaptive":
+        log.info(
+            f"Adaptive safe mode: verified {timesheet.escalations['verified']} copies, "
+            f"escalated to {timesheet.escalations['toggle']} section toggles "
+            f"and {timesheet.escalations['reload']} reloads."
+        )
+
+
+async def report_week(
+    page: Page,
+    projects: list[KiaraProject],
+    timesheet: TimesheetContext,
+    input_config_values: dict,
+    week_start: str,
+) -> Optional[VerificationReport]:
+    if not timesheet.verify:
+        return None
+    report = await verify_week(
+        page=page, projects=projects, timesheet=timesheet, week_start=week_start
+    )
+    log_verification_report(report)
+    write_verification_report(report, input_config_values["report_dir"])
+    return report
+
+
+async def run_browser_automation(
+    input_config_values: dict,
+    projects: list[KiaraProject],
+    plan_only: bool = False,
+    journal: Optional[RunJournal] = None,
+) -> Optional[VerificationReport]:
+    timesheet = get_timesheet_context(input_config_values, plan_only, journal)
+    # journaled work items are verified too, they were written by an earlier run
+    week_projects = projects
+    if journal is not None:
+        projects = journal.get_remaining_projects(projects)
+
+    async with async_playwright() as p:
+        browser, page = await start_browser(p, input_config_values)
+
+        try:
+            await open_timesheet_page(page=page)
+        except BrowserNavigationError as e:
+            log.warning("Attempting to continue.")
+
+        await process_week(
+            page=page,
+            projects=projects,
+            timesheet=timesheet,
+            input_config_values=input_config_values,
+        )
+        report = await report_week(
             page=page,
-            search_string=preferred_project,
-            collapse=False,
+            projects=week_projects,
+            timesheet=timesheet,
+            input_config_values=input_config_values,
+            week_start=get_week_start(week_projects),
         )
 
-        if auto_submit == "true":
-            await save_timesheet_provisionally(page=page)
+        await release_browser(input_config_values)
+
+        await browser.close()
+
+    return report
 
-        if launch_type == "internal":
-            await asyncio.sleep(3600)
-        else:
-            log.info("Browser was launched externally. Disconnecting.")
+
+@traced(labels=["week_start"])
+async def run_week(
+    page: Page,
+    week_start: str,
+    projects: list[KiaraProject],
+    input_config_values: dict,
+    plan_only: bool,
+    journal: Optional[RunJournal] = None,
+) -> WeekResult:
+    log.info(f"Processing week '{week_start}'.")
+    start_time = time.perf_counter()
+    # every week gets its own context - the cached date columns belong to one week
+    timesheet = get_timesheet_context(input_config_values, plan_only, journal)
+    week_projects = projects
+    if journal is not None:
+        projects = journal.get_remaining_projects(projects)
+    try:
+        await navigate_to_page(page, input_config_values["base_url"])
+        await open_timesheet_page(page=page)
+        await navigate_to_week(page, timesheet, week_start)
+        await process_week(
+            page=page,
+            projects=projects,
+            timesheet=timesheet,
+            input_config_values=input_config_values,
+        )
+        report = await report_week(
+            page=page,
+            projects=week_projects,
+            timesheet=timesheet,
+            input_config_values=input_config_values,
+            week_start=week_start,
+        )
+    except Exception as e:
+        log.error(f"Failed to process week '{week_start}': {e}")
+        return WeekResult(
+            week_start,
+            "failed",
+            projects=len(projects),
+            duration=time.perf_counter() - start_time,
+            error=type(e).__name__,
+        )
+    if report is not None and not report.verified:
+        counts = report.counts
+        return WeekResult(
+            week_start,
+            "mismatched",
+            projects=len(projects),
+            duration=time.perf_counter() - start_time,
+            error=f"{counts['mismatched']} mismatched, {counts['failed']} failed cells",
+        )
+    log.info(f"Processed week '{week_start}'.")
+    return WeekResult(
+        week_start,
+        "done",
+        projects=len(projects),
+        duration=time.perf_counter() - start_time,
+    )
+
+
+async def run_multi_week_automation(
+    input_config_values: dict,
+    weeks: dict[str, list[KiaraProject]],
+    plan_only: bool = False,
+    journals: Optional[dict[str, RunJournal]] = None,
+) -> list[WeekResult]:
+    """
+    Authenticates once and processes the weeks one after the other on the same page.
+    Kiara keeps the open week in the session, and every change submits the form, so
+    weeks can't be written side by side.
+    """
+    # fail on invalid options before logging in
+    get_timesheet_context(input_config_values, plan_only)
+
+    async with async_playwright() as p:
+        browser, page = await start_browser(p, input_config_values)
+        log.info(f"Processing {len(weeks)} weeks.")
+
+        results = []
+        for week_start, projects in weeks.items():
+            results.append(
+                await run_week(
+                    page=page,
+                    week_start=week_start,
+                    projects=projects,
+                    input_config_values=input_config_values,
+                    plan_only=plan_only,
+                    journal=journals.get(week_start) if journals else None,
+                )
+            )
+
+        await release_browser(input_config_values)
 
         await browser.close()
+
+    return results
+
+
+def log_week_results(results: list[WeekResult]) -> None:
+    for result in results:
+        if result.succeeded:
+            log.info(
+                f"Week '{result.week_start}': {result.status} - "
+                f"{result.projects} projects in {result.duration:.1f}s."
+            )
+        else:
+            log.error(
+                f"Week '{result.week_start}': {result.status} - '{result.error}'."
+            )
+    failed = sum(1 for result in results if not result.succeeded)
+    log.info(f"Processed {len(results) - failed}/{len(results)} weeks successfully.")
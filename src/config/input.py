@@ -13,7 +13,18 @@ def get_datetime_week_start() -> str:
     return monday.strftime("%Y-%m-%d")
 
 
-def get_args():
+def get_week_starts(first_date: str, last_date: str) -> list[str]:
+    first = datetime.strptime(first_date, "%Y-%m-%d")
+    last = datetime.strptime(last_date, "%Y-%m-%d")
+    monday = first - timedelta(days=first.weekday())
+    week_starts = []
+    while monday <= last:
+        week_starts.append(monday.strftime("%Y-%m-%d"))
+        monday += timedelta(days=7)
+    return week_starts
+
+
+def get_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser()
     parser.add_argument(
         "--file_name",
@@ -25,20 +36,68 @@ def get_args():
         # (version 1)(AutoRecovered) OK-2024(AutoRecovered).xlsx", # lol
         default=None,
     )
-    parser.add_argument(
+    week_group = parser.add_mutually_exclusive_group()
+    week_group.add_argument(
         "--sheet_name",
         "-s",
         type=str,
-        help="The name of the excel sheet to read from.",
+        nargs="+",
+        help="The name of the excel sheet(s) to read from. One sheet per week.",
+        required=False,
+        default=None,
+    )
+    week_group.add_argument(
+        "--date_range",
+        "-d",
+        type=str,
+        nargs=2,
+        metavar=("FIRST_DATE", "LAST_DATE"),
+        help="Process every week between two yyyy-MM-dd dates. Sheets are named after the week's Monday.",
+        required=False,
+        default=None,
+    )
+    parser.add_argument(
+        "--plan-only",
+        action="store_true",
+        help="Print the changes that would be made to the timesheet without making them.",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip the work items an interrupted run already wrote, as recorded in its journal.",
+    )
+    parser.add_argument(
+        "--validate-only",
+        action="store_true",
+        help="Validate the input sheet(s) and print the work items per project. Doesn't open a browser.",
+    )
+    parser.add_argument(
+        "--batch",
+        type=str,
+        metavar="MANIFEST",
+        help="Process the timesheets of every user in the manifest, each in their own browser context.",
         required=False,
         default=None,
     )
     args = parser.parse_args()
-    file_name = args.file_name
-    sheet_name = args.sheet_name if args.sheet_name else get_datetime_week_start()
+    if args.batch and args.validate_only:
+        parser.error("--validate-only can't be combined with --batch")
+    if args.date_range:
+        try:
+            args.sheet_names = get_week_starts(*args.date_range)
+        except ValueError:
+            parser.error(f"Invalid date range: '{args.date_range}'")
+    elif args.sheet_name:
+        args.sheet_names = args.sheet_name
+    else:
+        args.sheet_names = [get_datetime_week_start()]
 
-    log.debug(f"Provided file name: '{file_name}'")
-    log.debug(f"Provided sheet name: '{sheet_name}'")
+    log.debug(f"Provided file name: '{args.file_name}'")
+    log.debug(f"Provided sheet names: '{args.sheet_names}'")
+    log.debug(f"Plan only: '{args.plan_only}'")
+    log.debug(f"Validate only: '{args.validate_only}'")
+    log.debug(f"Resume: '{args.resume}'")
+    log.debug(f"Batch manifest: '{args.batch}'")
     log.info("Parsed provided arguments.")
 
-    return file_name, sheet_name
+    return args
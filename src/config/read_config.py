@@ -3,6 +3,40 @@ import configparser
 
 from src.objects.config import ConfigOption
 
+CONFIG_OPTIONS = [
+    ConfigOption("Logging", "log_level", "info"),
+    ConfigOption("Logging", "trace", "false"),
+    ConfigOption("Logging", "trace_file", ""),
+    ConfigOption("General", "preferred_project", ""),
+    ConfigOption("Input", "input_file", ""),
+    ConfigOption("Input", "reader", "openpyxl"),
+    ConfigOption("Input", "journal_dir", ""),
+    ConfigOption("Browser", "launch_type", "internal"),
+    ConfigOption("Browser", "base_url", "https://kiara.vlaanderen.be"),
+    ConfigOption("General", "phone_number", ""),
+    ConfigOption("General", "auto_submit", "false"),
+    ConfigOption("Browser", "safe_mode", "false"),
+    ConfigOption("Browser", "fill_mode", "batch"),
+    ConfigOption("Browser", "reconcile", "false"),
+    ConfigOption("Browser", "session_cache", "~/.kiara/session.json"),
+    ConfigOption("Browser", "session_max_age", "8"),
+    ConfigOption("Browser", "headless", "false"),
+    ConfigOption("Browser", "keep_open", "3600"),
+    ConfigOption("Batch", "concurrency", "2"),
+    ConfigOption("Batch", "log_dir", "~/.kiara/batch"),
+    ConfigOption("Verify", "verify", "false"),
+    ConfigOption("Verify", "report_dir", ""),
+    ConfigOption("Retry", "navigation_timeout", "15000"),
+    ConfigOption("Retry", "navigation_attempts", "3"),
+    ConfigOption("Retry", "lookup_timeout", "3000"),
+    ConfigOption("Retry", "lookup_attempts", "2"),
+    ConfigOption("Retry", "fill_timeout", "3000"),
+    ConfigOption("Retry", "fill_attempts", "2"),
+    ConfigOption("Retry", "backoff_base", "0.5"),
+    ConfigOption("Retry", "backoff_max", "8"),
+    ConfigOption("Retry", "retry_budget", "20"),
+]
+
 
 def make_config_dict(
     config: configparser.ConfigParser, options: list[ConfigOption], check_option: bool
@@ -26,15 +60,7 @@ def read_config():
 
     config_values = make_config_dict(
         config=config,
-        options=[
-            ConfigOption("Logging", "log_level", "info"),
-            ConfigOption("General", "preferred_project", ""),
-            ConfigOption("Input", "input_file", ""),
-            ConfigOption("Browser", "launch_type", "internal"),
-            ConfigOption("General", "phone_number", ""),
-            ConfigOption("General", "auto_submit", "false"),
-            ConfigOption("Browser", "safe_mode", "false"),
-        ],
+        options=CONFIG_OPTIONS,
         check_option=config_file_read_success,
     )
 
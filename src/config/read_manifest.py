@@ -0,0 +1,111 @@
+import configparser
+import logging
+import os
+import re
+
+from src.exceptions.custom_exceptions import ConfigFileProcessingError
+from src.objects.batch_user import BatchUser
+
+log = logging.getLogger(__name__)
+
+# options a manifest entry may set for its user, everything else is shared by the batch
+USER_OPTIONS = [
+    "input_file",
+    "sheet_name",
+    "phone_number",
+    "preferred_project",
+    "session_cache",
+    "journal_dir",
+    "reader",
+    "safe_mode",
+    "fill_mode",
+    "reconcile",
+    "report_dir",
+]
+
+
+def get_user_file_name(user_name: str) -> str:
+    return re.sub(r"[^\w.-]", "_", user_name)
+
+
+def get_user_session_cache(session_cache: str, user_name: str) -> str:
+    """
+    Every user logs in with their own phone, so every user needs their own session.
+    """
+    if not session_cache:
+        return ""
+    root, extension = os.path.splitext(session_cache)
+    return f"{root}-{get_user_file_name(user_name)}{extension}"
+
+
+def read_manifest(
+    manifest_file: str,
+    input_config_values: dict[str, str],
+    default_input_file: str,
+    default_sheet_names: list[str],
+) -> list[BatchUser]:
+    """
+    The manifest is an ini file with one section per user:
+
+        [alice]
+        input_file = ~/team/timesheets.xlsx
+        sheet_name = 2024-09-30
+        phone_number = 473666666
+        preferred_project = CS0126444 - Wonen Cloudzone - dedicated operationeel projectteam
+
+    `input_file` and `sheet_name` default to the ones passed on the command line.
+    Each sheet holds one week of the user, the week is taken from its dates, so one
+    workbook can hold a sheet per user for the same week.
+    """
+    manifest = configparser.ConfigParser(inline_comment_prefixes="#")
+    try:
+        if not manifest.read(os.path.expanduser(manifest_file)):
+            raise ConfigFileProcessingError(
+                f"Failed to read batch manifest '{manifest_file}'."
+            )
+    except configparser.Error as e:
+        raise ConfigFileProcessingError(
+            f"Invalid batch manifest '{manifest_file}': {e}"
+        ) from e
+
+    users = []
+    for user_name in manifest.sections():
+        options = dict(manifest.items(user_name))
+        unknown = sorted(set(options) - set(USER_OPTIONS))
+        if unknown:
+            raise ConfigFileProcessingError(
+                f"Unknown options {unknown} for user '{user_name}'. "
+                f"Expected any of {USER_OPTIONS}."
+            )
+        if not options.get("phone_number"):
+            raise ConfigFileProcessingError(f"No phone_number for user '{user_name}'.")
+        input_file = options.pop("input_file", "") or default_input_file
+        if not input_file:
+            raise ConfigFileProcessingError(f"No input_file for user '{user_name}'.")
+        sheet_names = options.pop("sheet_name", "").split() or default_sheet_names
+        if not sheet_names:
+            raise ConfigFileProcessingError(f"No sheet_name for user '{user_name}'.")
+
+        config_values = dict(input_config_values)
+        config_values["session_cache"] = get_user_session_cache(
+            input_config_values["session_cache"], user_name
+        )
+        if input_config_values["report_dir"]:
+            config_values["report_dir"] = os.path.join(
+                input_config_values["report_dir"], get_user_file_name(user_name)
+            )
+        config_values.update(options)
+        users.append(
+            BatchUser(
+                name=user_name,
+                input_file=input_file,
+                sheet_names=sheet_names,
+                config_values=config_values,
+            )
+        )
+    if not users:
+        raise ConfigFileProcessingError(
+            f"No users in batch manifest '{manifest_file}'."
+        )
+    log.info(f"Read {len(users)} users from batch manifest '{manifest_file}'.")
+    return users
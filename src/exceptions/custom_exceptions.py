@@ -28,6 +28,14 @@ class DataFrameFirstNanIndexTypeError(InputDataProcessingError):
     """Exception raised for type errors in DataFrame first NaN index."""
 
 
+class InputValidationError(InputDataProcessingError):
+    """Exception raised when rows of the input sheet fail validation."""
+
+    def __init__(self, issues: list, message="Input sheet failed validation."):
+        super().__init__(message)
+        self.issues = issues
+
+
 # split to separate files
 
 
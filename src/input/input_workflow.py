@@ -1,28 +1,64 @@
 import logging
 
-from src.input.prep_data import (
-    convert_to_work_item,
-    group_work_items,
-    read_input_file,
-    truncate_dataframe,
-    validate_df_columns,
-)
+from src.input.read_sheet import INPUT_READERS, read_input_columns
+from src.input.validate_input import validate_input_columns
+from src.lib.project_helpers import aggregate_work_items, group_work_items
 
+from src.objects.input_columns import InputColumns
 from src.objects.kiara_project import KiaraProject
 from src.exceptions.custom_exceptions import InputDataProcessingError
 
 log = logging.getLogger(__name__)
 
 
-def process_input_data(file_name: str, sheet_name: str) -> list[KiaraProject]:
+def process_input_data(
+    file_name: str, sheet_name: str, reader: str = "openpyxl"
+) -> list[KiaraProject]:
+    if reader not in INPUT_READERS:
+        raise InputDataProcessingError(
+            f"Invalid input reader '{reader}'. Expected one of {INPUT_READERS}."
+        )
     try:
-        df = read_input_file(file_name, sheet_name)
-        df = truncate_dataframe(df)
-        validate_df_columns(df)
-        work_items = convert_to_work_item(df)
-        projects = group_work_items(work_items)
+        if reader == "pandas":
+            input_columns = read_input_columns_pandas(file_name, sheet_name)
+        else:
+            input_columns = read_input_columns(file_name, sheet_name)
+        work_items = validate_input_columns(input_columns, sheet_name)
+        projects = group_work_items(aggregate_work_items(work_items))
         return projects
+    except InputDataProcessingError:
+        raise
     except Exception as e:
         raise InputDataProcessingError(
             f"Failed to process input data: '{type(e)}'"
         ) from e
+
+
+def read_input_columns_pandas(file_name: str, sheet_name: str) -> InputColumns:
+    # pandas is optional and slow to import - only load it when asked for
+    from src.input.prep_data import (  # pylint: disable=import-outside-toplevel
+        convert_to_input_columns,
+        read_input_file,
+        truncate_dataframe,
+        validate_df_columns,
+    )
+
+    df = read_input_file(file_name, sheet_name)
+    df = truncate_dataframe(df)
+    validate_df_columns(df)
+    return convert_to_input_columns(df)
+
+
+def format_projects(projects: list[KiaraProject]) -> str:
+    lines = []
+    for project in projects:
+        task_type = "general task" if project.is_general_task else "project"
+        lines.append(
+            f"Project '{project.name}' ({task_type}): {len(project.items)} work items"
+        )
+        for work_item in project.items:
+            lines.append(
+                f"  {work_item.date} {work_item.time_spent:>6}h '{work_item.description}'"
+                f" jira_ref='{work_item.jira_ref}' app_ref='{work_item.app_ref}'"
+            )
+    return "\n".join(lines)
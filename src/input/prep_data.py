@@ -5,10 +5,9 @@ import pandas as pd
 from src.exceptions.custom_exceptions import (
     DataFrameFirstNanIndexTypeError,
     InputFileLoadError,
-    InvalidDataFrameColumnsError,
 )
-from src.objects.kiara_project import KiaraProject
-from src.objects.kiara_work_item import KiaraWorkItem
+from src.input.read_sheet import EXPECTED_COLUMNS, validate_columns
+from src.objects.input_columns import InputColumns
 
 log = logging.getLogger(__name__)
 
@@ -46,47 +45,14 @@ def truncate_dataframe(df: pd.DataFrame) -> pd.DataFrame:
 
 
 def validate_df_columns(df: pd.DataFrame) -> None:
-    expected_columns = [
-        "Day",
-        "Project",
-        "Description",
-        "JiraRef",
-        "AppRef",
-        "Date",
-        "TimeSpent",
-    ]
-
     df.columns = df.columns.str.strip()
-
-    if set(df.columns) != set(expected_columns):
-        log.exception(
-            f"Columns in DataFrame do not match expected columns: '{df.columns}'"
-        )
-        raise InvalidDataFrameColumnsError
-    log.debug("DataFrame columns validated.")
-
-
-def convert_to_work_item(df: pd.DataFrame) -> list[KiaraWorkItem]:
-    work_items = []
-    for _, row in df.iterrows():
-        work_item = KiaraWorkItem(
-            day=row["Day"],
-            project=row["Project"],
-            description=row["Description"],
-            jira_ref=row["JiraRef"],
-            app_ref=row["AppRef"],
-            date=row["Date"],
-            time_spent=row["TimeSpent"],
-        )
-        work_items.append(work_item)
-    return work_items
+    validate_columns(list(df.columns))
 
 
-def group_work_items(work_items: list[KiaraWorkItem]) -> list[KiaraProject]:
-    projects = {}
-    for work_item in work_items:
-        project_name = work_item.project
-        if project_name not in projects:
-            projects[project_name] = KiaraProject(project_name)
-        projects[project_name].add_work_item(work_item)
-    return list(projects.values())
+def convert_to_input_columns(df: pd.DataFrame) -> InputColumns:
+    input_columns = InputColumns(EXPECTED_COLUMNS)
+    # the header is row 1 and read_excel keeps a RangeIndex over the data rows
+    input_columns.row_numbers = [index + 2 for index in range(len(df))]
+    for column in EXPECTED_COLUMNS:
+        input_columns.values[column] = df[column].tolist()
+    return input_columns
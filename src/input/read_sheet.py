@@ -0,0 +1,80 @@
+import logging
+
+from openpyxl import load_workbook
+
+from src.exceptions.custom_exceptions import (
+    InputFileLoadError,
+    InvalidDataFrameColumnsError,
+)
+from src.objects.input_columns import InputColumns
+from src.objects.kiara_work_item import is_missing
+
+log = logging.getLogger(__name__)
+
+EXPECTED_COLUMNS = [
+    "Day",
+    "Project",
+    "Description",
+    "JiraRef",
+    "AppRef",
+    "Date",
+    "TimeSpent",
+]
+# same range as pd.read_excel(usecols="A:G")
+COLUMN_COUNT = 7
+
+INPUT_READERS = ["openpyxl", "pandas"]
+
+
+def validate_columns(columns: list[str]) -> None:
+    if set(columns) != set(EXPECTED_COLUMNS):
+        log.exception(
+            f"Columns in input sheet do not match expected columns: '{columns}'"
+        )
+        raise InvalidDataFrameColumnsError
+    log.debug("Input sheet columns validated.")
+
+
+def read_input_columns(file_name: str, sheet_name: str) -> InputColumns:
+    """
+    Streams the rows of the sheet into columns without pandas.
+    Stops at the first row without a Description, like `truncate_dataframe`.
+    """
+    try:
+        workbook = load_workbook(filename=file_name, read_only=True, data_only=True)
+    except FileNotFoundError as e:
+        log.exception(f"File '{file_name}' not found: {e}.")
+        raise InputFileLoadError from e
+    except Exception as e:
+        log.exception("Failed to load input data.")
+        raise InputFileLoadError from e
+
+    try:
+        try:
+            sheet = workbook[sheet_name]
+        except KeyError as e:
+            log.exception(f"Failed to load input data: sheet '{sheet_name}' not found.")
+            raise InputFileLoadError from e
+        log.info(f"Reading input file '{file_name}' - sheet '{sheet_name}'.")
+
+        rows = sheet.iter_rows(max_col=COLUMN_COUNT, values_only=True)
+        header = next(rows, ())
+        columns = [str(cell).strip() if cell is not None else "" for cell in header]
+        validate_columns(columns)
+        positions = {column: columns.index(column) for column in EXPECTED_COLUMNS}
+
+        input_columns = InputColumns(EXPECTED_COLUMNS)
+        # the header is row 1
+        for row_number, row in enumerate(rows, start=2):
+            row = row + (None,) * (COLUMN_COUNT - len(row))
+            if is_missing(row[positions["Description"]]):
+                log.debug(f"Stopped reading input at row '{row_number}'.")
+                break
+            input_columns.add_row(
+                row_number,
+                {column: row[position] for column, position in positions.items()},
+            )
+        return input_columns
+    finally:
+        # read-only workbooks keep the file open until closed
+        workbook.close()
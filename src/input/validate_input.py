@@ -0,0 +1,226 @@
+"""
+Validates and normalizes the input sheet column by column.
+
+Every check runs over a whole column and all issues are collected with their row
+number, so a sheet can be fixed in one go instead of one exception at a time.
+Work items are only built from columns that passed.
+"""
+
+import difflib
+import logging
+import re
+from collections import Counter
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+from src.exceptions.custom_exceptions import InputValidationError
+from src.objects.general_tasks import general_tasks
+from src.objects.input_columns import InputColumns, InputIssue
+from src.objects.kiara_work_item import KiaraWorkItem, is_missing
+
+log = logging.getLogger(__name__)
+
+DEFAULT_PROJECT = "CS0126444 - Wonen Cloudzone - dedicated operationeel projectteam"
+# general tasks start with a three digit code, e.g. '705-Meetings' or '791 Hol/Vac - PT'
+GENERAL_TASK_CODE = re.compile(r"^\d{3}[\s-]")
+# Kiara books time in quarters of an hour
+HOURS_INCREMENT = 0.25
+# except for the general task that closes a week, booked with exactly one minute
+CLOSE_WEEK_TASK = (
+    "Special task to move to next week-enter 00:01-Don't enter other hours-Close week"
+)
+ONE_MINUTE = "0.01"
+
+
+def normalize_app_refs(
+    values: list, row_numbers: list[int], issues: list[InputIssue]
+) -> list[str]:
+    normalized = []
+    for row_number, value in zip(row_numbers, values):
+        if is_missing(value):
+            normalized.append("")
+            continue
+        try:
+            number = float(value)
+            if not number.is_integer():
+                raise ValueError
+            normalized.append(str(int(number)))
+        except (TypeError, ValueError):
+            issues.append(
+                InputIssue(row_number, "AppRef", f"'{value}' is not an integer.")
+            )
+            normalized.append("")
+    return normalized
+
+
+def parse_hours(value: object) -> float:
+    # a cell typed as 00:01 is read as a time, or as text
+    if isinstance(value, time):
+        return value.hour + value.minute / 60
+    if isinstance(value, str) and ":" in value:
+        hours, minutes = value.strip().split(":")
+        return int(hours) + int(minutes) / 60
+    return float(value)
+
+
+def normalize_hours(
+    values: list, row_numbers: list[int], projects: list[str], issues: list[InputIssue]
+) -> list[str]:
+    """Kiara uses decimals to indicate minutes, not parts of an hour"""
+    normalized = []
+    for row_number, value, project in zip(row_numbers, values, projects):
+        if is_missing(value):
+            normalized.append("0.0")
+            continue
+        try:
+            hours = parse_hours(value)
+        except (TypeError, ValueError):
+            issues.append(
+                InputIssue(row_number, "TimeSpent", f"'{value}' is not a number.")
+            )
+            normalized.append("0.0")
+            continue
+        if project == CLOSE_WEEK_TASK and abs(hours * 60 - 1) < 1e-6:
+            normalized.append(ONE_MINUTE)
+            continue
+        quarters = hours / HOURS_INCREMENT
+        if hours < 0 or abs(quarters - round(quarters)) > 1e-9:
+            issues.append(
+                InputIssue(
+                    row_number,
+                    "TimeSpent",
+                    f"'{value}' is not a positive multiple of {HOURS_INCREMENT}h.",
+                )
+            )
+            normalized.append("0.0")
+            continue
+        normalized.append(f"{int(hours)}.{int((hours % 1) * 60)}")
+    return normalized
+
+
+def parse_date(value: object) -> Optional[date]:
+    # openpyxl and pandas return typed dates for date cells, strings otherwise
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return datetime.strptime(str(value).strip(), "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+
+def get_sheet_week_start(
+    sheet_name: str, dates: list[Optional[date]]
+) -> Optional[date]:
+    """
+    Sheets named after a date belong to that date's week. Otherwise the week most
+    rows fall in is taken as the sheet's week.
+    """
+    sheet_date = parse_date(sheet_name)
+    if sheet_date is not None:
+        return sheet_date - timedelta(days=sheet_date.weekday())
+    week_starts = Counter(
+        day - timedelta(days=day.weekday()) for day in dates if day is not None
+    )
+    if not week_starts:
+        return None
+    return week_starts.most_common(1)[0][0]
+
+
+def normalize_dates(
+    values: list, row_numbers: list[int], sheet_name: str, issues: list[InputIssue]
+) -> list[str]:
+    dates = []
+    for row_number, value in zip(row_numbers, values):
+        day = None if is_missing(value) else parse_date(value)
+        if day is None:
+            issues.append(
+                InputIssue(row_number, "Date", f"'{value}' is not a yyyy-MM-dd date.")
+            )
+        dates.append(day)
+
+    week_start = get_sheet_week_start(sheet_name, dates)
+    normalized = []
+    for row_number, day in zip(row_numbers, dates):
+        if day is None:
+            normalized.append("")
+            continue
+        if week_start is not None and not 0 <= (day - week_start).days < 7:
+            issues.append(
+                InputIssue(
+                    row_number,
+                    "Date",
+                    f"'{day.isoformat()}' is outside the week of "
+                    f"'{week_start.isoformat()}'.",
+                )
+            )
+        normalized.append(day.isoformat())
+    return normalized
+
+
+def normalize_projects(
+    values: list, row_numbers: list[int], issues: list[InputIssue]
+) -> list[str]:
+    normalized = []
+    for row_number, value in zip(row_numbers, values):
+        if is_missing(value) or value == "":
+            normalized.append(DEFAULT_PROJECT)
+            continue
+        project = str(value)
+        if GENERAL_TASK_CODE.match(project) and project not in general_tasks:
+            suggestion = difflib.get_close_matches(project, general_tasks, n=1)
+            issues.append(
+                InputIssue(
+                    row_number,
+                    "Project",
+                    f"Unknown general task '{project}'."
+                    + (f" Did you mean '{suggestion[0]}'?" if suggestion else ""),
+                )
+            )
+        normalized.append(project)
+    return normalized
+
+
+def normalize_texts(values: list) -> list[str]:
+    return ["" if is_missing(value) else str(value) for value in values]
+
+
+def validate_input_columns(
+    columns: InputColumns, sheet_name: str
+) -> list[KiaraWorkItem]:
+    """
+    Raises InputValidationError with every issue found in the sheet.
+    """
+    row_numbers = columns.row_numbers
+    issues: list[InputIssue] = []
+    app_refs = normalize_app_refs(columns["AppRef"], row_numbers, issues)
+    projects = normalize_projects(columns["Project"], row_numbers, issues)
+    hours = normalize_hours(columns["TimeSpent"], row_numbers, projects, issues)
+    dates = normalize_dates(columns["Date"], row_numbers, sheet_name, issues)
+    descriptions = normalize_texts(columns["Description"])
+    jira_refs = normalize_texts(columns["JiraRef"])
+
+    if issues:
+        issues.sort(key=lambda issue: issue.row_number)
+        for issue in issues:
+            log.error(f"Sheet '{sheet_name}': {issue}")
+        raise InputValidationError(
+            issues, f"Sheet '{sheet_name}' has {len(issues)} invalid values."
+        )
+    log.debug(f"Validated {len(columns)} rows of sheet '{sheet_name}'.")
+
+    return [
+        KiaraWorkItem(
+            day=day,
+            date=work_date,
+            description=description,
+            jira_ref=jira_ref,
+            time_spent=time_spent,
+            project=project,
+            app_ref=app_ref,
+        )
+        for day, work_date, description, jira_ref, time_spent, project, app_ref in zip(
+            columns["Day"], dates, descriptions, jira_refs, hours, projects, app_refs
+        )
+    ]
@@ -1,11 +1,14 @@
 import logging
+import os
 import sys
 from typing import Optional
 
-from src.objects.logging import ExceptionDebugStackTraceHandler
+from src.objects.logging import BatchUserLogFilter, ExceptionDebugStackTraceHandler
 
 log = logging.getLogger(__name__)
 
+LOG_FORMAT = "%(asctime)20s - %(levelname)s - %(name)s.%(funcName)s - %(message)s"
+
 
 def init_logging(
     log_level: Optional[str],
@@ -21,7 +24,7 @@ def init_logging(
     }
     try:
         logging.basicConfig(
-            format="%(asctime)20s - %(levelname)s - %(name)s.%(funcName)s - %(message)s",
+            format=LOG_FORMAT,
             handlers=[stream_handler],
             level=log_levels.get(
                 log_level.lower() if log_level else "info", logging.INFO
@@ -33,6 +36,19 @@ def init_logging(
         raise e
 
 
+def add_user_log_file(user: str, log_file: str) -> logging.Handler:
+    """
+    Copies everything logged for `user` to its own file. Remove the returned handler
+    from the root logger when the user is done.
+    """
+    os.makedirs(os.path.dirname(log_file), exist_ok=True)
+    file_handler = logging.FileHandler(log_file, mode="w", encoding="utf-8")
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    file_handler.addFilter(BatchUserLogFilter(user))
+    logging.getLogger().addHandler(file_handler)
+    return file_handler
+
+
 def terminate_script(exit_code: int) -> None:
     exit_desc = "Unknown"
     if exit_code == 0:
@@ -1,6 +1,11 @@
 import logging
+from typing import Iterable
 
+from src.lib.reconcile import kiara_time_to_minutes, minutes_to_kiara_time
+from src.objects.kiara_project import KiaraProject
 from src.objects.kiara_work_item import KiaraWorkItem
+from src.objects.timesheet_snapshot import normalize_description
+from src.objects.work_item_row import WorkItemRow
 
 log = logging.getLogger(__name__)
 
@@ -17,3 +22,78 @@ def is_empty_value(work_item: KiaraWorkItem, work_item_key: str) -> bool:
         return True
     log.debug(f"{work_item_key} is empty for work item '{work_item.description}'")
     return False
+
+
+def group_work_items(work_items: Iterable[KiaraWorkItem]) -> list[KiaraProject]:
+    projects = {}
+    for work_item in work_items:
+        project_name = work_item.project
+        if project_name not in projects:
+            projects[project_name] = KiaraProject(project_name)
+        projects[project_name].add_work_item(work_item)
+    return list(projects.values())
+
+
+def _merge_ref(
+    work_item: KiaraWorkItem, duplicate: KiaraWorkItem, attribute: str
+) -> str:
+    ref, duplicate_ref = getattr(work_item, attribute), getattr(duplicate, attribute)
+    if ref and duplicate_ref and ref != duplicate_ref:
+        log.warning(
+            f"Conflicting {attribute} for '{work_item.description}' on "
+            f"'{work_item.date}': '{ref}' and '{duplicate_ref}'. Keeping '{ref}'."
+        )
+    return ref or duplicate_ref
+
+
+def merge_work_items(
+    work_item: KiaraWorkItem, duplicate: KiaraWorkItem
+) -> KiaraWorkItem:
+    return KiaraWorkItem(
+        day=work_item.day,
+        date=work_item.date,
+        description=work_item.description,
+        jira_ref=_merge_ref(work_item, duplicate, "jira_ref"),
+        time_spent=minutes_to_kiara_time(
+            kiara_time_to_minutes(work_item.time_spent)
+            + kiara_time_to_minutes(duplicate.time_spent)
+        ),
+        project=work_item.project,
+        app_ref=_merge_ref(work_item, duplicate, "app_ref"),
+    )
+
+
+def aggregate_work_items(work_items: Iterable[KiaraWorkItem]) -> list[KiaraWorkItem]:
+    """
+    Sums the hours of work items with the same project, description and date.
+    Kiara has one cell per description and day - writing both would keep only the last.
+    Descriptions are compared the way Kiara matches rows.
+    """
+    aggregated: dict[tuple[str, str, str], KiaraWorkItem] = {}
+    for work_item in work_items:
+        key = work_item.key
+        duplicate = aggregated.get(key)
+        if duplicate is None:
+            aggregated[key] = work_item
+            continue
+        aggregated[key] = merge_work_items(duplicate, work_item)
+        log.info(
+            f"Merged duplicate work item '{work_item.description}' on "
+            f"'{work_item.date}' - {aggregated[key].time_spent}h in total."
+        )
+    return list(aggregated.values())
+
+
+def pivot_work_items(work_items: Iterable[KiaraWorkItem]) -> list[WorkItemRow]:
+    """
+    One row per project and description with the work items of every day, in input order.
+    Work items must be aggregated first.
+    """
+    rows: dict[tuple[str, str], WorkItemRow] = {}
+    for work_item in work_items:
+        key = (work_item.project, normalize_description(work_item.description))
+        row = rows.get(key)
+        if row is None:
+            row = rows[key] = WorkItemRow(work_item.project, work_item.description)
+        row.add(work_item)
+    return list(rows.values())
@@ -0,0 +1,71 @@
+import logging
+import re
+
+from src.objects.change_plan import CellChange, CellMatch, ChangePlan, RowCreation
+from src.objects.kiara_project import KiaraProject
+from src.objects.timesheet_snapshot import TimesheetSnapshot, normalize_description
+
+log = logging.getLogger(__name__)
+
+
+def kiara_time_to_minutes(value: str) -> int:
+    """
+    Kiara uses decimals to indicate minutes, not parts of an hour: '7.30' is 7h30.
+    """
+    value = str(value).strip()
+    if not value:
+        return 0
+    parts = re.split(r"[.,:]", value, maxsplit=1)
+    hours = int(parts[0]) if parts[0] else 0
+    minutes = int(parts[1]) if len(parts) > 1 and parts[1] else 0
+    return hours * 60 + minutes
+
+
+def minutes_to_kiara_time(minutes: int) -> str:
+    return f"{minutes // 60}.{minutes % 60}"
+
+
+def build_change_plan(
+    project: KiaraProject, snapshot: TimesheetSnapshot, date_indices: dict
+) -> ChangePlan:
+    plan = ChangePlan(project.name)
+    new_descriptions: set[str] = set()
+    for description, row_indices in snapshot.find_duplicates().items():
+        log.warning(
+            f"Project '{project.name}' has duplicate rows {row_indices} for "
+            f"'{description}'. Only row '{row_indices[0]}' is updated."
+        )
+
+    for work_item in project.items:
+        column_index = date_indices.get(work_item.formatted_date)
+        if column_index is None:
+            log.warning(
+                f"Date {work_item.formatted_date} not found in selected week. "
+                f"Skipping '{work_item.description}'."
+            )
+            plan.skipped.append(work_item)
+            continue
+
+        row_index = snapshot.find_description(work_item.description)
+        if row_index is None:
+            key = normalize_description(work_item.description)
+            if key not in new_descriptions:
+                new_descriptions.add(key)
+                plan.rows_to_create.append(RowCreation(work_item))
+            plan.cells_to_change.append(CellChange(work_item, column_index, None, ""))
+            continue
+
+        current_value = snapshot.get_row(row_index).hours[column_index]
+        if kiara_time_to_minutes(current_value) == kiara_time_to_minutes(
+            work_item.time_spent
+        ):
+            plan.cells_correct.append(
+                CellMatch(work_item, column_index, row_index, current_value)
+            )
+        else:
+            plan.cells_to_change.append(
+                CellChange(work_item, column_index, row_index, current_value)
+            )
+
+    log.info(repr(plan))
+    return plan
@@ -0,0 +1,149 @@
+"""
+Central retry policy for Playwright actions.
+
+Every action belongs to a class - navigation, lookup or fill - with its own timeout and
+number of attempts. Retries wait with exponential backoff and full jitter and draw from
+one budget per run, so a slow Kiara day degrades gracefully without retrying forever.
+"""
+
+import logging
+import random
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from src.exceptions.custom_exceptions import ConfigFileProcessingError
+from src.lib.tracing import record_retry
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+ACTION_CLASSES = ["navigation", "lookup", "fill"]
+
+
+class ActionPolicy:
+    def __init__(self, timeout: int, attempts: int):
+        # ms, passed to the Playwright call
+        self.timeout = timeout
+        self.attempts = attempts
+
+    def __repr__(self):
+        return f"ActionPolicy(timeout={self.timeout}, attempts={self.attempts})"
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        actions: Optional[dict[str, ActionPolicy]] = None,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        budget: int = 20,
+    ):
+        self.actions = actions or {
+            "navigation": ActionPolicy(timeout=15000, attempts=3),
+            "lookup": ActionPolicy(timeout=3000, attempts=2),
+            "fill": ActionPolicy(timeout=3000, attempts=2),
+        }
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.budget = budget
+        self.retries_used = 0
+
+    def timeout(self, action_class: str) -> int:
+        return self.actions[action_class].timeout
+
+    def attempts(self, action_class: str) -> int:
+        return self.actions[action_class].attempts
+
+    def backoff(self, attempt: int) -> float:
+        """Seconds to wait before retry `attempt` (1-based), full jitter."""
+        return random.uniform(
+            0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        )
+
+    def take_retry(self) -> bool:
+        if self.retries_used >= self.budget:
+            return False
+        self.retries_used += 1
+        return True
+
+    def __repr__(self):
+        return (
+            f"RetryPolicy(actions={self.actions}, backoff_base={self.backoff_base}, "
+            f"backoff_max={self.backoff_max}, budget={self.budget}, "
+            f"retries_used={self.retries_used})"
+        )
+
+
+retry_policy = RetryPolicy()
+
+
+def configure_retry_policy(input_config_values: dict) -> None:
+    global retry_policy  # pylint: disable=global-statement
+    try:
+        actions = {
+            action_class: ActionPolicy(
+                timeout=int(input_config_values[f"{action_class}_timeout"]),
+                attempts=max(1, int(input_config_values[f"{action_class}_attempts"])),
+            )
+            for action_class in ACTION_CLASSES
+        }
+        retry_policy = RetryPolicy(
+            actions=actions,
+            backoff_base=float(input_config_values["backoff_base"]),
+            backoff_max=float(input_config_values["backoff_max"]),
+            budget=int(input_config_values["retry_budget"]),
+        )
+    except ValueError as e:
+        raise ConfigFileProcessingError(f"Invalid [Retry] option: {e}") from e
+    log.debug(f"Retry policy: {retry_policy}")
+
+
+def get_timeout(action_class: str) -> int:
+    return retry_policy.timeout(action_class)
+
+
+async def run_with_retry(
+    action_class: str,
+    description: str,
+    action: Callable[[int], Awaitable[T]],
+    is_done: Optional[Callable[[], Awaitable[bool]]] = None,
+) -> Optional[T]:
+    """
+    Runs `action(timeout)` and retries it on Playwright errors as the policy allows.
+    Only wrap actions that are safe to repeat: lookups, fills and page loads. A click
+    that submits may have gone through even though it raised. Either don't retry it,
+    or pass `is_done`: it's checked before every retry and if the failed attempt went
+    through after all, None is returned instead.
+    """
+    # keep the CLI startup light, these are loaded by the browser phase anyway
+    import asyncio  # pylint: disable=import-outside-toplevel
+    from playwright.async_api import (  # pylint: disable=import-outside-toplevel
+        Error as PlaywrightError,
+        TimeoutError as PlaywrightTimeoutError,
+    )
+
+    # navigations also fail on network errors, lookups and fills only on timeouts
+    retry_on = (
+        PlaywrightError if action_class == "navigation" else PlaywrightTimeoutError
+    )
+    attempts = retry_policy.attempts(action_class)
+    for attempt in range(1, attempts + 1):
+        try:
+            return await action(retry_policy.timeout(action_class))
+        except retry_on as e:
+            if is_done is not None and await is_done():
+                log.info(f"Not retrying {description}, it went through after all.")
+                return None
+            if attempt == attempts:
+                raise
+            if not retry_policy.take_retry():
+                log.warning(f"Retry budget exhausted. Not retrying {description}.")
+                raise
+            delay = retry_policy.backoff(attempt)
+            log.warning(
+                f"Attempt {attempt}/{attempts} to {description} failed, "
+                f"retrying in {delay:.1f}s: {str(e).splitlines()[0]}"
+            )
+            record_retry()
+            await asyncio.sleep(delay)
+    raise AssertionError("unreachable")
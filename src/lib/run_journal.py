@@ -0,0 +1,144 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from typing import Optional
+
+from src.objects.kiara_project import KiaraProject
+from src.objects.kiara_work_item import KiaraWorkItem
+from src.objects.timesheet_snapshot import normalize_description
+
+log = logging.getLogger(__name__)
+
+
+def get_journal_path(
+    journal_dir: str, input_file_name: str, week_start: str, user: str = ""
+) -> Optional[str]:
+    """
+    One journal per input file, week and batch user, so unrelated runs don't collide.
+    """
+    if not journal_dir:
+        return None
+    key = "\n".join([os.path.abspath(input_file_name), week_start, user])
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+    readable = re.sub(r"[^\w.-]", "_", f"{user}-{week_start}" if user else week_start)
+    return os.path.join(
+        os.path.abspath(os.path.expanduser(journal_dir)), f"{readable}-{digest}.jsonl"
+    )
+
+
+def _get_entry_key(
+    project: str, description: str, date: str, hours: str
+) -> tuple[str, str, str, str]:
+    # the same row as far as the timesheet lookup is concerned
+    return project, normalize_description(description), date, hours
+
+
+class RunJournal:
+    """
+    Append-only record of the work items written to the timesheet, one JSON line each.
+    A resumed run skips every work item that is already in the journal.
+    """
+
+    def __init__(self, path: Optional[str], resume: bool = False):
+        self.path = path
+        self.resume = resume
+        self.completed: set[tuple[str, str, str, str]] = set()
+        if not path:
+            return
+        if resume:
+            self._load()
+        elif os.path.isfile(path):
+            os.remove(path)
+            log.debug(f"Started a new journal, removed '{path}'.")
+
+    def _load(self) -> None:
+        if not os.path.isfile(self.path):
+            log.info(f"No journal found at '{self.path}'. Nothing to resume.")
+            return
+        line = ""
+        with open(self.path, encoding="utf-8") as journal:
+            for line_number, line in enumerate(journal, start=1):
+                try:
+                    entry = json.loads(line)
+                    self.completed.add(
+                        _get_entry_key(
+                            entry["project"],
+                            entry["description"],
+                            entry["date"],
+                            entry["hours"],
+                        )
+                    )
+                except (ValueError, KeyError):
+                    # a run killed mid-write leaves a partial last line
+                    log.warning(
+                        f"Ignoring unreadable journal line {line_number} in '{self.path}'."
+                    )
+        if line and not line.endswith("\n"):
+            # start the next entry on a fresh line
+            with open(self.path, "a", encoding="utf-8") as journal:
+                journal.write("\n")
+        log.info(
+            f"Resuming from journal '{self.path}': {len(self.completed)} completed work items."
+        )
+
+    def is_completed(self, work_item: KiaraWorkItem) -> bool:
+        return (
+            _get_entry_key(
+                work_item.project,
+                work_item.description,
+                work_item.date,
+                work_item.time_spent,
+            )
+            in self.completed
+        )
+
+    def get_remaining_projects(
+        self, projects: list[KiaraProject]
+    ) -> list[KiaraProject]:
+        if not self.completed:
+            return projects
+        remaining_projects = []
+        for project in projects:
+            remaining = KiaraProject(project.name)
+            for work_item in project.items:
+                if self.is_completed(work_item):
+                    log.info(
+                        f"Skipping completed work item '{work_item.description}' "
+                        f"on '{work_item.date}'."
+                    )
+                else:
+                    remaining.add_work_item(work_item)
+            if remaining.items:
+                remaining_projects.append(remaining)
+        return remaining_projects
+
+    def record(self, work_item: KiaraWorkItem, row_index: Optional[int]) -> None:
+        key = _get_entry_key(
+            work_item.project,
+            work_item.description,
+            work_item.date,
+            work_item.time_spent,
+        )
+        self.completed.add(key)
+        if not self.path:
+            return
+        entry = {
+            "project": work_item.project,
+            "description": work_item.description,
+            "date": work_item.date,
+            "hours": work_item.time_spent,
+            "row_index": row_index,
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as journal:
+                journal.write(json.dumps(entry) + "\n")
+        except OSError as e:
+            log.warning(f"Failed to write journal entry: {e}")
+
+    def __repr__(self):
+        return f"RunJournal(path={self.path}, completed={len(self.completed)})"
@@ -0,0 +1,70 @@
+import json
+import logging
+import os
+import time
+from typing import Optional
+
+log = logging.getLogger(__name__)
+
+
+def get_session_cache_path(session_cache: str) -> Optional[str]:
+    if not session_cache:
+        return None
+    return os.path.abspath(os.path.expanduser(session_cache))
+
+
+def is_session_state(path: str) -> bool:
+    try:
+        with open(path, encoding="utf-8") as session_file:
+            state = json.load(session_file)
+    except (OSError, ValueError):
+        return False
+    return isinstance(state, dict) and "cookies" in state
+
+
+def get_cached_session_state(session_cache: str, max_age_hours: float) -> Optional[str]:
+    """
+    Returns the path of the cached storage state if it exists and isn't too old to reuse.
+    Expired and unreadable caches are removed, the session cookies are of no use anymore.
+    """
+    path = get_session_cache_path(session_cache)
+    if not path or not os.path.isfile(path):
+        log.debug("No cached session found.")
+        return None
+    age_hours = (time.time() - os.path.getmtime(path)) / 3600
+    if age_hours > max_age_hours:
+        log.info(
+            f"Cached session is {age_hours:.1f}h old (max {max_age_hours}h). Removing it."
+        )
+        remove_session_state(session_cache)
+        return None
+    if not is_session_state(path):
+        log.warning(f"Cached session '{path}' is not a storage state. Removing it.")
+        remove_session_state(session_cache)
+        return None
+    log.debug(f"Found cached session '{path}', {age_hours:.1f}h old.")
+    return path
+
+
+def write_session_state(session_cache: str, state: dict) -> None:
+    """
+    The storage state holds session cookies - only the current user may read it.
+    """
+    path = get_session_cache_path(session_cache)
+    if not path:
+        return
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+    temp_path = f"{path}.tmp"
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as session_file:
+        json.dump(state, session_file)
+    os.chmod(temp_path, 0o600)
+    os.replace(temp_path, path)
+    log.info(f"Saved session to '{path}'.")
+
+
+def remove_session_state(session_cache: str) -> None:
+    path = get_session_cache_path(session_cache)
+    if path and os.path.isfile(path):
+        os.remove(path)
+        log.debug(f"Removed cached session '{path}'.")
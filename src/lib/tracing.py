@@ -0,0 +1,255 @@
+"""
+Lightweight timing spans for the browser steps.
+
+Functions are traced with `@traced(labels=[...])`, blocks with `with trace_span(...)`.
+Spans nest per asyncio task. Tracing is off by default - a disabled tracer only costs
+a flag check per call.
+"""
+
+import atexit
+import functools
+import inspect
+import json
+import logging
+import os
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Callable, Iterator, Optional
+
+log = logging.getLogger(__name__)
+
+
+class Span:
+    def __init__(
+        self, name: str, labels: dict[str, str], parent: Optional["Span"], lane: int
+    ):
+        self.name = name
+        self.labels = labels
+        self.parent = parent
+        self.lane = lane
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.retries = 0
+        # planned repeats that aren't failures, e.g. extra copy submits
+        self.counters: dict[str, int] = defaultdict(int)
+        self.children_duration = 0.0
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    @property
+    def self_duration(self) -> float:
+        return self.duration - self.children_duration
+
+    def __repr__(self):
+        return (
+            f"Span(name={self.name}, labels={self.labels}, "
+            f"duration={self.duration:.4f}, retries={self.retries})"
+        )
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+class Tracer:
+    def __init__(self):
+        self.enabled = False
+        self.trace_file: Optional[str] = None
+        self.spans: list[Span] = []
+        self.origin = time.perf_counter()
+        self._lanes: dict[int, int] = {}
+
+    def configure(self, enabled: bool, trace_file: Optional[str] = None) -> None:
+        self.enabled = enabled
+        self.trace_file = trace_file or None
+        self.spans = []
+        self.origin = time.perf_counter()
+        self._lanes = {}
+
+    def _get_lane(self) -> int:
+        # one lane per asyncio task, so concurrent weeks don't overlap in the viewer
+        # asyncio is already loaded by then - importing it here keeps startup light
+        import asyncio  # pylint: disable=import-outside-toplevel
+
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        if task is None:
+            return 0
+        return self._lanes.setdefault(id(task), len(self._lanes) + 1)
+
+    @contextmanager
+    def span(self, name: str, **labels: str) -> Iterator[Span]:
+        parent = _current_span.get()
+        span = Span(name, labels, parent, parent.lane if parent else self._get_lane())
+        token = _current_span.set(span)
+        try:
+            yield span
+        finally:
+            span.end = time.perf_counter()
+            _current_span.reset(token)
+            if parent is not None:
+                parent.children_duration += span.duration
+            self.spans.append(span)
+
+    def record_retry(self, count: int = 1) -> None:
+        span = _current_span.get()
+        if span is not None:
+            span.retries += count
+
+    def record_count(self, counter: str, count: int = 1) -> None:
+        span = _current_span.get()
+        if span is not None:
+            span.counters[counter] += count
+
+    def summary(self) -> str:
+        rows: dict[str, list[float]] = defaultdict(lambda: [0, 0.0, 0.0, 0.0, 0])
+        counters: dict[tuple[str, str], int] = defaultdict(int)
+        for span in self.spans:
+            for counter, count in span.counters.items():
+                counters[(span.name, counter)] += count
+            row = rows[span.name]
+            row[0] += 1
+            row[1] += span.duration
+            row[2] += span.self_duration
+            row[3] = max(row[3], span.duration)
+            row[4] += span.retries
+
+        name_width = max([len("span")] + [len(name) for name in rows])
+        lines = [
+            f"{'span':<{name_width}} {'calls':>6} {'total ms':>10} {'self ms':>10} "
+            f"{'mean ms':>9} {'max ms':>9} {'retries':>7}"
+        ]
+        for name, (calls, total, self_total, longest, retries) in sorted(
+            rows.items(), key=lambda item: item[1][1], reverse=True
+        ):
+            lines.append(
+                f"{name:<{name_width}} {calls:>6} {total * 1000:>10.1f} "
+                f"{self_total * 1000:>10.1f} {total * 1000 / calls:>9.1f} "
+                f"{longest * 1000:>9.1f} {retries:>7}"
+            )
+        for (name, counter), count in sorted(counters.items()):
+            lines.append(f"{name:<{name_width}} {counter}: {count}")
+        return "\n".join(lines)
+
+    def to_chrome_trace(self) -> dict:
+        pid = os.getpid()
+        events = []
+        for span in self.spans:
+            args = dict(span.labels)
+            if span.retries:
+                args["retries"] = span.retries
+            args.update(span.counters)
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": span.name.split(".")[0],
+                    "ph": "X",
+                    "ts": round((span.start - self.origin) * 1_000_000),
+                    "dur": round(span.duration * 1_000_000),
+                    "pid": pid,
+                    "tid": span.lane,
+                    "args": args,
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, trace_file: str) -> None:
+        path = os.path.abspath(os.path.expanduser(trace_file))
+        with open(path, "w", encoding="utf-8") as output:
+            json.dump(self.to_chrome_trace(), output)
+        log.info(f"Wrote trace of {len(self.spans)} spans to '{path}'.")
+
+    def report(self) -> None:
+        if not self.enabled or not self.spans:
+            return
+        print(self.summary())
+        if self.trace_file:
+            try:
+                self.export_chrome_trace(self.trace_file)
+            except OSError as e:
+                log.warning(f"Failed to write trace file: {e}")
+
+
+tracer = Tracer()
+
+
+def configure_tracing(enabled: bool, trace_file: Optional[str] = None) -> None:
+    """
+    Enables tracing and prints the summary (and writes the trace file) at exit.
+    """
+    tracer.configure(enabled, trace_file)
+    if enabled:
+        atexit.register(tracer.report)
+
+
+def trace_span(name: str, **labels: str):
+    if not tracer.enabled:
+        return nullcontext()
+    return tracer.span(name, **labels)
+
+
+def record_retry(count: int = 1) -> None:
+    if tracer.enabled:
+        tracer.record_retry(count)
+
+
+def record_count(counter: str, count: int = 1) -> None:
+    if tracer.enabled:
+        tracer.record_count(counter, count)
+
+
+def _label_value(value: object) -> str:
+    # work items are labelled by description, projects by name
+    for attribute in ["description", "name"]:
+        label = getattr(value, attribute, None)
+        if isinstance(label, str):
+            return label
+    return str(value)
+
+
+def traced(name: Optional[str] = None, labels: Optional[list[str]] = None) -> Callable:
+    """
+    Traces every call of the decorated function as a span.
+    `labels` are parameter names whose values are recorded with the span.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        span_name = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+        signature = inspect.signature(func)
+
+        def get_labels(args: tuple, kwargs: dict) -> dict[str, str]:
+            if not labels:
+                return {}
+            arguments = signature.bind_partial(*args, **kwargs).arguments
+            return {
+                label: _label_value(arguments[label])
+                for label in labels
+                if label in arguments
+            }
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not tracer.enabled:
+                    return await func(*args, **kwargs)
+                with tracer.span(span_name, **get_labels(args, kwargs)):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with tracer.span(span_name, **get_labels(args, kwargs)):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,142 @@
+import csv
+import json
+import logging
+import os
+from datetime import date, timedelta
+from typing import Optional
+
+from src.lib.reconcile import kiara_time_to_minutes
+from src.objects.kiara_project import KiaraProject
+from src.objects.timesheet_snapshot import TimesheetSnapshot
+from src.objects.verification_report import VerificationReport, VerifiedCell
+
+log = logging.getLogger(__name__)
+
+REPORT_COLUMNS = [
+    "project",
+    "description",
+    "date",
+    "expected",
+    "actual",
+    "status",
+    "reason",
+]
+
+
+def get_week_start(projects: list[KiaraProject]) -> str:
+    dates = [
+        date.fromisoformat(work_item.date)
+        for project in projects
+        for work_item in project.items
+    ]
+    if not dates:
+        return ""
+    first = min(dates)
+    return (first - timedelta(days=first.weekday())).isoformat()
+
+
+def _read_minutes(value: str) -> Optional[int]:
+    try:
+        return kiara_time_to_minutes(value)
+    except ValueError:
+        return None
+
+
+def build_verification_report(
+    week_start: str,
+    projects: list[KiaraProject],
+    task_indices: dict[str, str],
+    snapshots: dict[int, TimesheetSnapshot],
+    date_indices: dict[str, int],
+) -> VerificationReport:
+    """
+    Diffs every work item against the cell it was written to, as read back from Kiara.
+    """
+    report = VerificationReport(week_start)
+    for project in projects:
+        task_index = task_indices.get(project.name)
+        snapshot = snapshots.get(int(task_index)) if task_index is not None else None
+        for work_item in project.items:
+            expected = kiara_time_to_minutes(work_item.time_spent)
+            actual_value: Optional[str] = None
+            actual: Optional[int] = None
+            reason = ""
+            column_index = date_indices.get(work_item.formatted_date)
+            row_index = (
+                snapshot.find_description(work_item.description)
+                if snapshot is not None
+                else None
+            )
+            if column_index is None:
+                status, reason = "skipped", "date not in selected week"
+            elif task_index is None:
+                status, reason = "failed", "project not in timesheet"
+            elif snapshot is None:
+                status, reason = "failed", "task not read back"
+            elif row_index is None:
+                status, reason = "failed", "row not in timesheet"
+            else:
+                actual_value = snapshot.get_row(row_index).hours[column_index]
+                actual = _read_minutes(actual_value)
+                if actual == expected:
+                    status = "written"
+                else:
+                    status = "mismatched"
+                    if actual is None:
+                        reason = "unreadable value"
+            report.add(
+                VerifiedCell(
+                    project=project.name,
+                    description=work_item.description,
+                    date=work_item.date,
+                    expected=work_item.time_spent,
+                    actual=actual_value,
+                    status=status,
+                    reason=reason,
+                ),
+                expected=expected,
+                actual=actual or 0,
+            )
+    return report
+
+
+def log_verification_report(report: VerificationReport) -> None:
+    for cell in report.cells:
+        if cell.status in ["mismatched", "failed"]:
+            found = cell.reason if cell.actual is None else f"found '{cell.actual}'"
+            log.error(
+                f"Verification {cell.status}: '{cell.description}' of "
+                f"'{cell.project}' on '{cell.date}': expected '{cell.expected}', "
+                f"{found}."
+            )
+    counts = ", ".join(f"{count} {status}" for status, count in report.counts.items())
+    if report.verified:
+        log.info(f"Verified week '{report.week_start}': {counts}.")
+    else:
+        log.error(f"Week '{report.week_start}' doesn't match the input: {counts}.")
+
+
+def write_verification_report(
+    report: VerificationReport, report_dir: str
+) -> Optional[str]:
+    """
+    Writes `<week_start>.json` and `<week_start>.csv` to the report directory.
+    Returns the path of the JSON report, None if it's disabled or couldn't be written.
+    """
+    if not report_dir:
+        return None
+    report_dir = os.path.abspath(os.path.expanduser(report_dir))
+    base_name = os.path.join(report_dir, report.week_start or "report")
+    try:
+        os.makedirs(report_dir, exist_ok=True)
+        with open(f"{base_name}.json", "w", encoding="utf-8") as output:
+            json.dump(report.to_dict(), output, indent=2)
+        with open(f"{base_name}.csv", "w", encoding="utf-8", newline="") as output:
+            writer = csv.DictWriter(output, fieldnames=REPORT_COLUMNS)
+            writer.writeheader()
+            writer.writerows(report.to_rows())
+    except OSError as e:
+        log.warning(f"Failed to write verification report to '{report_dir}': {e}")
+        return None
+    log.info(f"Wrote verification report to '{base_name}.json' and '.csv'.")
+    return f"{base_name}.json"
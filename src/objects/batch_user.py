@@ -0,0 +1,73 @@
+from typing import Optional
+
+from src.objects.week_result import WeekResult
+
+
+class BatchUser:
+    def __init__(
+        self,
+        name: str,
+        input_file: str,
+        sheet_names: list[str],
+        config_values: dict[str, str],
+    ):
+        self.name = name
+        self.input_file = input_file
+        # one sheet per week, the week is taken from the sheet's dates
+        self.sheet_names = sheet_names
+        # the run's config with the user's options from the manifest applied
+        self.config_values = config_values
+
+    def __repr__(self):
+        return (
+            f"BatchUser(name={self.name}, input_file={self.input_file}, "
+            f"sheet_names={self.sheet_names})"
+        )
+
+
+class BatchUserResult:
+    def __init__(
+        self,
+        user: str,
+        weeks: Optional[list[WeekResult]] = None,
+        duration: float = 0.0,
+        error: Optional[str] = None,
+    ):
+        self.user = user
+        self.weeks = weeks or []
+        self.duration = duration
+        # set if the user failed before any week was processed, e.g. on login
+        self.error = error
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None and all(week.succeeded for week in self.weeks)
+
+    @property
+    def exit_code(self) -> int:
+        return 0 if self.succeeded else 1
+
+    def to_dict(self) -> dict:
+        return {
+            "user": self.user,
+            "status": "done" if self.succeeded else "failed",
+            "exit_code": self.exit_code,
+            "duration": round(self.duration, 1),
+            "error": self.error,
+            "weeks": [
+                {
+                    "week_start": week.week_start,
+                    "status": week.status,
+                    "projects": week.projects,
+                    "duration": round(week.duration, 1),
+                    "error": week.error,
+                }
+                for week in self.weeks
+            ],
+        }
+
+    def __repr__(self):
+        return (
+            f"BatchUserResult(user={self.user}, weeks={self.weeks}, "
+            f"duration={self.duration:.1f}s, error={self.error})"
+        )
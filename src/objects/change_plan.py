@@ -0,0 +1,91 @@
+from typing import Optional
+
+from src.objects.kiara_work_item import KiaraWorkItem
+
+
+class RowCreation:
+    def __init__(self, work_item: KiaraWorkItem):
+        self.work_item = work_item
+
+    def __repr__(self):
+        return f"RowCreation(description={self.work_item.description})"
+
+
+class CellChange:
+    def __init__(
+        self,
+        work_item: KiaraWorkItem,
+        column_index: int,
+        row_index: Optional[int],
+        current_value: str,
+    ):
+        self.work_item = work_item
+        self.column_index = column_index
+        # None if the row still has to be created
+        self.row_index = row_index
+        self.current_value = current_value
+
+    @property
+    def target_value(self) -> str:
+        return self.work_item.time_spent
+
+    def __repr__(self):
+        return (
+            f"CellChange(description={self.work_item.description}, date={self.work_item.date}, "
+            f"row_index={self.row_index}, current={self.current_value}, target={self.target_value})"
+        )
+
+
+class CellMatch(CellChange):
+    """Cell that already holds the target value."""
+
+    def __repr__(self):
+        return (
+            f"CellMatch(description={self.work_item.description}, date={self.work_item.date}, "
+            f"row_index={self.row_index}, value={self.current_value})"
+        )
+
+
+class ChangePlan:
+    def __init__(self, project_name: str):
+        self.project_name = project_name
+        self.rows_to_create: list[RowCreation] = []
+        self.cells_to_change: list[CellChange] = []
+        self.cells_correct: list[CellMatch] = []
+        # work items dated outside of the selected week
+        self.skipped: list[KiaraWorkItem] = []
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.rows_to_create and not self.cells_to_change
+
+    def format(self) -> str:
+        lines = [
+            f"Project '{self.project_name}': {len(self.rows_to_create)} rows to create, "
+            f"{len(self.cells_to_change)} cells to change, "
+            f"{len(self.cells_correct)} cells already correct."
+        ]
+        for work_item in self.skipped:
+            lines.append(
+                f"  ! skip '{work_item.description}' on '{work_item.date}': "
+                "date not in selected week"
+            )
+        for row in self.rows_to_create:
+            lines.append(f"  + create row '{row.work_item.description}'")
+        for cell in self.cells_to_change:
+            lines.append(
+                f"  ~ '{cell.work_item.description}' on '{cell.work_item.date}': "
+                f"'{cell.current_value}' -> '{cell.target_value}'"
+            )
+        for cell in self.cells_correct:
+            lines.append(
+                f"  = '{cell.work_item.description}' on '{cell.work_item.date}': "
+                f"'{cell.current_value}'"
+            )
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return (
+            f"ChangePlan(project={self.project_name}, rows_to_create={len(self.rows_to_create)}, "
+            f"cells_to_change={len(self.cells_to_change)}, cells_correct={len(self.cells_correct)})"
+        )
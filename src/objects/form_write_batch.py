@@ -0,0 +1,32 @@
+FILL_MODES = ["batch", "cell"]
+
+
+class FormWriteBatch:
+    """
+    Pending `(input name, value)` writes for the timesheet form.
+    A later write to the same input replaces the earlier one, like a second fill() would.
+    """
+
+    def __init__(self, fill_mode: str = "batch"):
+        if fill_mode not in FILL_MODES:
+            raise ValueError(
+                f"Invalid fill mode '{fill_mode}'. Expected one of {FILL_MODES}."
+            )
+        self.fill_mode = fill_mode
+        # text inputs take strings, checkboxes bools
+        self.writes: dict[str, str | bool] = {}
+
+    def add(self, input_name: str, value: str | bool) -> None:
+        self.writes[input_name] = value
+
+    def items(self) -> list[tuple[str, str | bool]]:
+        return list(self.writes.items())
+
+    def clear(self) -> None:
+        self.writes = {}
+
+    def __len__(self):
+        return len(self.writes)
+
+    def __repr__(self):
+        return f"FormWriteBatch(fill_mode={self.fill_mode}, writes={len(self.writes)})"
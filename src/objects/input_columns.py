@@ -0,0 +1,39 @@
+class InputIssue:
+    def __init__(self, row_number: int, column: str, message: str):
+        # row number as shown in the spreadsheet, the header is row 1
+        self.row_number = row_number
+        self.column = column
+        self.message = message
+
+    def __str__(self):
+        return f"Row {self.row_number}, {self.column}: {self.message}"
+
+    def __repr__(self):
+        return (
+            f"InputIssue(row_number={self.row_number}, column={self.column}, "
+            f"message={self.message})"
+        )
+
+
+class InputColumns:
+    """
+    Raw cell values of the input sheet, one list per column, before validation.
+    """
+
+    def __init__(self, columns: list[str]):
+        self.row_numbers: list[int] = []
+        self.values: dict[str, list] = {column: [] for column in columns}
+
+    def add_row(self, row_number: int, row: dict[str, object]) -> None:
+        self.row_numbers.append(row_number)
+        for column, values in self.values.items():
+            values.append(row.get(column))
+
+    def __getitem__(self, column: str) -> list:
+        return self.values[column]
+
+    def __len__(self):
+        return len(self.row_numbers)
+
+    def __repr__(self):
+        return f"InputColumns(columns={list(self.values)}, rows={len(self)})"
@@ -1,11 +1,15 @@
+import sys
+
 from src.objects.kiara_work_item import KiaraWorkItem
 from src.objects.general_tasks import general_tasks
 
 
 class KiaraProject:
+    __slots__ = ("name", "items")
+
     def __init__(self, name: str):
-        self.name = name
-        self.items = []
+        self.name = sys.intern(name)
+        self.items: list[KiaraWorkItem] = []
 
     @property
     def is_general_task(self) -> bool:
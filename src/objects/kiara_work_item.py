@@ -1,116 +1,106 @@
-import logging
 import math
-import re
+import sys
 from typing import Optional
 
-import pandas as pd
+from src.objects.timesheet_snapshot import normalize_description
 
-from src.exceptions.custom_exceptions import AppRefInvalidValueError
 
-log = logging.getLogger(__name__)
+def is_missing(value: object) -> bool:
+    """
+    Empty cell: None from openpyxl, NaN from pandas.
+    """
+    return value is None or (isinstance(value, float) and math.isnan(value))
 
 
 class KiaraWorkItem:
+    """
+    One row of the input sheet. Values are validated and normalized by
+    `validate_input_columns` - time_spent in Kiara's "h.mm" notation, empty refs as "" -
+    construction only checks that they're strings.
+    Immutable - work items are shared by projects, plans, journals and indices.
+    """
+
+    __slots__ = (
+        "day",
+        "date",
+        "description",
+        "jira_ref",
+        "time_spent",
+        "project",
+        "app_ref",
+        "_formatted_date",
+    )
+
     def __init__(
         self,
         day=None,
-        date="",
-        description="",
-        jira_ref: Optional[str] = None,
-        time_spent: Optional[float] = None,
-        project: Optional[str] = None,
-        app_ref: Optional[str] = None,
+        date: str = "",
+        description: str = "",
+        jira_ref: str = "",
+        time_spent: str = "0.0",
+        project: str = "",
+        app_ref: str = "",
     ):
-        self.day = day
-        self.date = date
-        self.description = description
-        self.jira_ref = jira_ref
-        self.time_spent = time_spent
-        self.project = project
-        self.app_ref = app_ref
-
-    @property
-    def description(self) -> str:
-        return self._description
-
-    @property
-    def app_ref(self) -> str:
-        return self._app_ref
+        # pylint: disable=unidiomatic-typecheck
+        if not (
+            type(date) is str
+            and type(description) is str
+            and type(jira_ref) is str
+            and type(time_spent) is str
+            and type(project) is str
+            and type(app_ref) is str
+        ):
+            raise TypeError(
+                "Work item values must be strings, got "
+                f"{(date, description, jira_ref, time_spent, project, app_ref)!r}."
+            )
+        set_slot = object.__setattr__
+        set_slot(self, "day", day)
+        set_slot(self, "date", date)
+        # every work item of a project repeats its name, and descriptions recur per day
+        set_slot(self, "description", sys.intern(description))
+        set_slot(self, "jira_ref", jira_ref)
+        set_slot(self, "time_spent", time_spent)
+        set_slot(self, "project", sys.intern(project))
+        set_slot(self, "app_ref", app_ref)
+        set_slot(self, "_formatted_date", None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"KiaraWorkItem is immutable, can't set '{name}'.")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"KiaraWorkItem is immutable, can't delete '{name}'.")
 
     @property
-    def jira_ref(self) -> str:
-        return self._jira_ref
+    def formatted_date(self) -> str:
+        """Month-day without leading zeros, as in Kiara's date column headers."""
+        if self._formatted_date is None:
+            _, month, day = self.date.split("-")
+            object.__setattr__(self, "_formatted_date", f"{int(month)}-{int(day)}")
+        return self._formatted_date
 
     @property
-    def project(self) -> str:
-        return self._project
+    def key(self) -> tuple[str, str, str]:
+        """The Kiara cell the work item is written to, one per description and day."""
+        return (self.project, normalize_description(self.description), self.date)
 
-    @property
-    def time_spent(self) -> str:
-        return self._time_spent
+    def _values(self) -> tuple[str, str, str, str, str, str]:
+        return (
+            self.project,
+            self.description,
+            self.date,
+            self.time_spent,
+            self.jira_ref,
+            self.app_ref,
+        )
 
-    @property
-    def formatted_date(self) -> str:
-        date_parts = self.date.split("-")
-        date_parts = [re.sub(r"^0", "", part) for part in date_parts]
-        return f"{date_parts[1]}-{date_parts[2]}"
-
-    @app_ref.setter
-    def app_ref(self, value: Optional[str]) -> None:
-        if pd.isna(value):
-            self._app_ref = ""
-            log.debug(
-                f"AppRef for '{self.description}'  is NaN, setting to empty string."
-            )
-        else:
-            try:
-                self._app_ref = str(int(value))
-                log.debug(f"AppRef for '{self.description}' is '{self._app_ref}'.")
-            except ValueError as e:
-                raise AppRefInvalidValueError(
-                    f"AppRef for '{self.description}' is not an integer: '{value}'."
-                ) from e
-
-    @jira_ref.setter
-    def jira_ref(self, value: Optional[str]) -> None:
-        if pd.isna(value):
-            self._jira_ref = ""
-            log.debug(
-                f"JiraRef for '{self.description}'  is NaN, setting to empty string."
-            )
-        else:
-            self._jira_ref = str(value)
+    def __eq__(self, other):
+        if not isinstance(other, KiaraWorkItem):
+            return NotImplemented
+        return self._values() == other._values()
 
-    @project.setter
-    def project(self, value: Optional[str]) -> None:
-        default_project = (
-            "CS0126444 - Wonen Cloudzone - dedicated operationeel projectteam"
-        )
-        if (isinstance(value, float) and math.isnan(value)) or value == "":
-            self._project = default_project
-            log.debug(
-                (
-                    f"Project for '{self.description}' is NaN or empty, "
-                    f"setting to default project: '{default_project}'"
-                )
-            )
-        else:
-            self._project = str(value)
-
-    @description.setter
-    def description(self, value: str) -> None:
-        self._description = str(value)
-
-    @time_spent.setter
-    def time_spent(self, value: float) -> None:
-        """Kiara uses decimals to indicate minutes, not parts of an hour"""
-        if pd.isna(value):
-            self._time_spent = "0.0"
-            log.debug(f"Time spent for '{self.description}' is NaN, setting to 0.0.")
-        else:
-            hours = int(value)
-            minutes = int((value % 1) * 60)
-            self._time_spent = f"{hours}.{minutes}"
+    def __hash__(self):
+        return hash(self._values())
 
     def __repr__(self):
         return (
@@ -121,6 +111,8 @@ class KiaraWorkItem:
 
 
 class TestWorkItemResult:
+    __slots__ = ("exists", "index")
+
     def __init__(self, exists: bool = False, index: Optional[int] = None):
         self.exists = exists
         self.index = index
@@ -1,4 +1,9 @@
 import logging
+from contextvars import ContextVar
+from typing import Optional
+
+# name of the batch user a log record belongs to, set per asyncio task
+batch_user: ContextVar[Optional[str]] = ContextVar("batch_user", default=None)
 
 
 class ExceptionDebugStackTraceHandler(logging.StreamHandler):
@@ -20,3 +25,16 @@ class ExceptionDebugStackTraceHandler(logging.StreamHandler):
         ):
             record.exc_info = None
         super().emit(record)
+
+
+class BatchUserLogFilter(logging.Filter):
+    """
+    Only passes the records logged while working for one batch user.
+    """
+
+    def __init__(self, user: str):
+        super().__init__()
+        self.user = user
+
+    def filter(self, record):
+        return batch_user.get() == self.user
@@ -0,0 +1,54 @@
+import logging
+from collections import Counter
+from typing import Optional
+
+from src.lib.run_journal import RunJournal
+
+log = logging.getLogger(__name__)
+
+# false = never reload after copying, true = always toggle the project section,
+# adaptive = only escalate when the copied rows are missing from the snapshot
+SAFE_MODES = ["false", "true", "adaptive"]
+
+
+class TimesheetContext:
+    """
+    Per-run state shared by every project of the timesheet week being processed.
+    """
+
+    def __init__(
+        self,
+        safe_mode: str = "false",
+        fill_mode: str = "batch",
+        reconcile: bool = False,
+        plan_only: bool = False,
+        journal: Optional[RunJournal] = None,
+        verify: bool = False,
+    ):
+        self.safe_mode = safe_mode
+        # adaptive safe mode: 'verified' copies, 'toggle' and 'reload' escalations
+        self.escalations: Counter = Counter()
+        self.fill_mode = fill_mode
+        self.reconcile = reconcile
+        self.plan_only = plan_only
+        # work items written to the timesheet, skipped by a resumed run
+        self.journal = journal
+        # read the week back and diff it with the input once all changes are made
+        self.verify = verify
+        # date ('M-D') -> column index, the week header doesn't change within a week
+        self.date_indices: Optional[dict[str, int]] = None
+        # task name -> task index, read once per week for both sections
+        self.task_indices: Optional[dict[str, str]] = None
+
+    def invalidate_week_cache(self) -> None:
+        """Call whenever the timesheet navigates to a different week."""
+        log.debug("Invalidated cached date column and task indices.")
+        self.date_indices = None
+        self.task_indices = None
+
+    def __repr__(self):
+        return (
+            f"TimesheetContext(safe_mode={self.safe_mode}, fill_mode={self.fill_mode}, "
+            f"reconcile={self.reconcile}, plan_only={self.plan_only}, "
+            f"verify={self.verify})"
+        )
@@ -0,0 +1,175 @@
+import bisect
+import logging
+from typing import Iterable, Optional
+
+from src.browser.selectors import (
+    DESCRIPTION_FIELD,
+    HOURS_FIELD,
+    ROW_FIELDS,
+    parse_input_name,
+)
+
+log = logging.getLogger(__name__)
+
+DAYS_PER_WEEK = 7
+
+
+COPY_PREFIX = "Copy "
+
+
+def normalize_description(description: str) -> str:
+    """
+    Kiara matches descriptions case-insensitively and ignores surrounding whitespace,
+    'Copy ' prefixed dummy rows included.
+    """
+    return " ".join(str(description).split()).casefold()
+
+
+class DescriptionIndex:
+    """
+    Normalized description -> sorted row indices, kept up to date on every rename.
+    """
+
+    def __init__(self):
+        self.rows: dict[str, list[int]] = {}
+
+    def add(self, row_index: int, description: str) -> None:
+        key = normalize_description(description)
+        if key:
+            bisect.insort(self.rows.setdefault(key, []), row_index)
+
+    def remove(self, row_index: int, description: str) -> None:
+        key = normalize_description(description)
+        row_indices = self.rows.get(key)
+        if row_indices and row_index in row_indices:
+            row_indices.remove(row_index)
+            if not row_indices:
+                del self.rows[key]
+
+    def rename(self, row_index: int, old_description: str, description: str) -> None:
+        self.remove(row_index, old_description)
+        self.add(row_index, description)
+
+    def find_all(self, description: str) -> list[int]:
+        return list(self.rows.get(normalize_description(description), []))
+
+    def find(self, description: str) -> Optional[int]:
+        row_indices = self.rows.get(normalize_description(description))
+        return row_indices[0] if row_indices else None
+
+    def duplicates(self) -> dict[str, list[int]]:
+        return {key: list(rows) for key, rows in self.rows.items() if len(rows) > 1}
+
+    def clear(self) -> None:
+        self.rows = {}
+
+    def __len__(self):
+        return len(self.rows)
+
+
+class SnapshotRow:
+    def __init__(self, index: int):
+        self.index = index
+        self.description = ""
+        self.jira_ref = ""
+        self.app_ref = ""
+        self.hours: list[str] = [""] * DAYS_PER_WEEK
+        self.to_be_copied = False
+
+    def __repr__(self):
+        return (
+            f"SnapshotRow(index={self.index}, description={self.description}, "
+            f"jira_ref={self.jira_ref}, app_ref={self.app_ref}, hours={self.hours})"
+        )
+
+
+class TimesheetSnapshot:
+    """
+    In-memory copy of all `taak[i].prestatie[j]` inputs of a single task.
+    Read from the page in one round trip and updated in place after every mutation.
+    """
+
+    def __init__(self, task_index: int):
+        self.task_index = int(task_index)
+        self.rows: dict[int, SnapshotRow] = {}
+        self.descriptions = DescriptionIndex()
+
+    @classmethod
+    def from_inputs(
+        cls, task_index: int, inputs: list[tuple[str, str | bool]]
+    ) -> "TimesheetSnapshot":
+        snapshot = cls(task_index)
+        snapshot.load(inputs)
+        return snapshot
+
+    def load(self, inputs: list[tuple[str, str | bool]]) -> None:
+        self.rows = {}
+        self.descriptions.clear()
+        for name, value in inputs:
+            self.apply_input(name, value)
+        log.debug(f"Loaded {len(self.rows)} rows for task '{self.task_index}'.")
+
+    def apply_input(self, name: str, value: str | bool) -> None:
+        input_name = parse_input_name(name)
+        if input_name is None or input_name.task != self.task_index:
+            return
+        row_index = input_name.row
+        row = self.rows.get(row_index)
+        if row is None:
+            row = self.rows[row_index] = SnapshotRow(row_index)
+
+        day_index, field = input_name.day, input_name.field
+        if day_index is not None:
+            if field == HOURS_FIELD and day_index < DAYS_PER_WEEK:
+                row.hours[day_index] = str(value)
+        elif field == DESCRIPTION_FIELD:
+            self.descriptions.rename(row_index, row.description, str(value))
+            row.description = str(value)
+        elif field in ROW_FIELDS:
+            attribute = ROW_FIELDS[field]
+            setattr(
+                row, attribute, bool(value) if attribute == "to_be_copied" else value
+            )
+
+    @property
+    def highest_index(self) -> Optional[int]:
+        return max(self.rows) if self.rows else None
+
+    def get_row(self, row_index: int) -> SnapshotRow:
+        return self.rows[int(row_index)]
+
+    def find_description(self, description: str) -> Optional[int]:
+        """
+        Lowest row index with this description. See `find_duplicates` for the others.
+        """
+        return self.descriptions.find(description)
+
+    def find_all_descriptions(self, description: str) -> list[int]:
+        return self.descriptions.find_all(description)
+
+    def find_duplicates(self) -> dict[str, list[int]]:
+        return self.descriptions.duplicates()
+
+    def find_dummy_rows(self, exclude: Iterable[str] = ()) -> list[int]:
+        """
+        Rows made by the copy button but never given their own description, e.g. by a
+        run that crashed between copying and filling them: no hours and exactly
+        'Copy <description of another row>'. Descriptions in `exclude`, the input's,
+        are real activities that happen to start with 'Copy '.
+        """
+        excluded = {normalize_description(description) for description in exclude}
+        descriptions = {row.description for row in self.rows.values()}
+        return [
+            row_index
+            for row_index, row in sorted(self.rows.items())
+            if row.description.startswith(COPY_PREFIX)
+            and row.description[len(COPY_PREFIX) :] in descriptions
+            and normalize_description(row.description) not in excluded
+            and not any(str(hours).strip() for hours in row.hours)
+        ]
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __repr__(self):
+        return f"TimesheetSnapshot(task_index={self.task_index}, rows={len(self.rows)})"
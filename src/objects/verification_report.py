@@ -0,0 +1,131 @@
+from typing import Optional
+
+from src.lib.reconcile import minutes_to_kiara_time
+
+# written = Kiara holds the input's hours, mismatched = it holds other hours,
+# failed = the row or project isn't in the timesheet, skipped = date not in the week
+CELL_STATUSES = ["written", "skipped", "mismatched", "failed"]
+
+
+class VerifiedCell:
+    __slots__ = (
+        "project",
+        "description",
+        "date",
+        "expected",
+        "actual",
+        "status",
+        "reason",
+    )
+
+    def __init__(
+        self,
+        project: str,
+        description: str,
+        date: str,
+        expected: str,
+        actual: Optional[str],
+        status: str,
+        reason: str = "",
+    ):
+        self.project = project
+        self.description = description
+        self.date = date
+        self.expected = expected
+        # None if the cell wasn't read back
+        self.actual = actual
+        self.status = status
+        self.reason = reason
+
+    def to_dict(self) -> dict:
+        return {
+            "project": self.project,
+            "description": self.description,
+            "date": self.date,
+            "expected": self.expected,
+            "actual": self.actual,
+            "status": self.status,
+            "reason": self.reason,
+        }
+
+    def __repr__(self):
+        return (
+            f"VerifiedCell(project={self.project}, description={self.description}, "
+            f"date={self.date}, expected={self.expected}, actual={self.actual}, "
+            f"status={self.status})"
+        )
+
+
+class HourTotals:
+    """Minutes of the input and of the read-back timesheet."""
+
+    __slots__ = ("expected", "actual")
+
+    def __init__(self):
+        self.expected = 0
+        self.actual = 0
+
+    def add(self, expected: int, actual: int) -> None:
+        self.expected += expected
+        self.actual += actual
+
+    def to_dict(self) -> dict:
+        return {
+            "expected": minutes_to_kiara_time(self.expected),
+            "actual": minutes_to_kiara_time(self.actual),
+        }
+
+
+class VerificationReport:
+    def __init__(self, week_start: str):
+        self.week_start = week_start
+        self.cells: list[VerifiedCell] = []
+        self.day_totals: dict[str, HourTotals] = {}
+        self.project_totals: dict[str, HourTotals] = {}
+
+    def add(self, cell: VerifiedCell, expected: int, actual: int) -> None:
+        self.cells.append(cell)
+        self.day_totals.setdefault(cell.date, HourTotals()).add(expected, actual)
+        self.project_totals.setdefault(cell.project, HourTotals()).add(expected, actual)
+
+    @property
+    def counts(self) -> dict[str, int]:
+        counts = dict.fromkeys(CELL_STATUSES, 0)
+        for cell in self.cells:
+            counts[cell.status] += 1
+        return counts
+
+    @property
+    def verified(self) -> bool:
+        counts = self.counts
+        return not counts["mismatched"] and not counts["failed"]
+
+    def to_dict(self) -> dict:
+        return {
+            "week_start": self.week_start,
+            "status": "verified" if self.verified else "mismatched",
+            "counts": self.counts,
+            "day_totals": {
+                day: totals.to_dict() for day, totals in sorted(self.day_totals.items())
+            },
+            "project_totals": {
+                project: totals.to_dict()
+                for project, totals in self.project_totals.items()
+            },
+            "cells": [cell.to_dict() for cell in self.cells],
+        }
+
+    def to_rows(self) -> list[dict]:
+        """
+        One row per cell, followed by the totals: per project without a date, per day
+        without a project.
+        """
+        rows = [cell.to_dict() for cell in self.cells]
+        for project, totals in self.project_totals.items():
+            rows.append({"project": project, "status": "total", **totals.to_dict()})
+        for day, totals in sorted(self.day_totals.items()):
+            rows.append({"date": day, "status": "total", **totals.to_dict()})
+        return rows
+
+    def __repr__(self):
+        return f"VerificationReport(week_start={self.week_start}, counts={self.counts})"
@@ -0,0 +1,28 @@
+from typing import Optional
+
+
+class WeekResult:
+    def __init__(
+        self,
+        week_start: str,
+        status: str,
+        projects: int = 0,
+        duration: float = 0.0,
+        error: Optional[str] = None,
+    ):
+        self.week_start = week_start
+        # done | mismatched | failed
+        self.status = status
+        self.projects = projects
+        self.duration = duration
+        self.error = error
+
+    @property
+    def succeeded(self) -> bool:
+        return self.status == "done"
+
+    def __repr__(self):
+        return (
+            f"WeekResult(week_start={self.week_start}, status={self.status}, "
+            f"projects={self.projects}, duration={self.duration:.1f}s, error={self.error})"
+        )
@@ -0,0 +1,42 @@
+from datetime import date
+from typing import Optional
+
+from src.objects.kiara_work_item import KiaraWorkItem
+
+DAYS_PER_WEEK = 7
+
+
+class WorkItemRow:
+    """
+    All work items of one description in a week, one value per weekday like a
+    timesheet row. Monday is day 0.
+    """
+
+    __slots__ = ("project", "description", "days")
+
+    def __init__(self, project: str, description: str):
+        self.project = project
+        self.description = description
+        self.days: list[Optional[KiaraWorkItem]] = [None] * DAYS_PER_WEEK
+
+    def add(self, work_item: KiaraWorkItem) -> None:
+        day_index = date.fromisoformat(work_item.date).weekday()
+        if self.days[day_index] is not None:
+            raise ValueError(
+                f"Row '{self.description}' already has a work item on '{work_item.date}'."
+            )
+        self.days[day_index] = work_item
+
+    @property
+    def work_items(self) -> list[KiaraWorkItem]:
+        return [work_item for work_item in self.days if work_item is not None]
+
+    def __len__(self):
+        return sum(1 for work_item in self.days if work_item is not None)
+
+    def __repr__(self):
+        hours = [work_item.time_spent if work_item else "" for work_item in self.days]
+        return (
+            f"WorkItemRow(project={self.project}, description={self.description}, "
+            f"hours={hours})"
+        )
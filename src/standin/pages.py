@@ -0,0 +1,141 @@
+from html import escape
+
+from src.standin.state import StandinState, StandinTask
+
+TIMESHEET_PATH = "/Kiara/secure/tijdsregistratie/detailtijdsregistratie.do"
+
+DAY_NAMES = ["Ma", "Di", "Wo", "Do", "Vr", "Za", "Zo"]
+
+# 16x16 grey square, Playwright only clicks images with a bounding box
+ICON = (
+    "data:image/svg+xml;utf8,"
+    "<svg xmlns='http://www.w3.org/2000/svg' width='16' height='16'>"
+    "<rect width='16' height='16' fill='%23888'/></svg>"
+)
+
+SCRIPT = """
+<script>
+function kiaraAction(action) {
+    document.getElementById("action").value = action;
+    document.forms["timesheet"].submit();
+    return false;
+}
+</script>
+"""
+
+
+def _page(title: str, body: str) -> str:
+    return (
+        "<!DOCTYPE html><html><head><meta charset='utf-8'>"
+        f"<title>{escape(title)}</title>{SCRIPT}</head><body>{body}</body></html>"
+    )
+
+
+def _action_image(action: str, alt: str) -> str:
+    return (
+        f"<a href='#' onclick=\"return kiaraAction('{escape(action)}')\">"
+        f"<img alt='{escape(alt)}' src=\"{ICON}\" width='16' height='16'></a>"
+    )
+
+
+def render_landing_page() -> str:
+    return _page(
+        "Kiara",
+        "<table><tr><td>Welkom in Kiara</td>"
+        f"<td><a href='{TIMESHEET_PATH}'>"
+        f"<img alt='knop ga verder' src=\"{ICON}\" width='16' height='16'></a></td>"
+        "</tr></table>",
+    )
+
+
+def render_auth_method_page() -> str:
+    return _page(
+        "Aanmelden",
+        "<a href='/auth/itsme' class='auth-method'>"
+        "<span class='auth-method__title__text'>itsme®</span></a>",
+    )
+
+
+def render_itsme_page() -> str:
+    return _page(
+        "itsme",
+        "<form method='post' action='/auth/itsme'>"
+        "<input type='tel' autocomplete='tel' name='phone'>"
+        "<button type='submit'>Versturen</button></form>",
+    )
+
+
+def _toggle_cell(action: str, expanded: bool) -> str:
+    return f"<td>{_action_image(action, 'Collapse' if expanded else 'Expand')}</td>"
+
+
+def _input(name: str, value: str) -> str:
+    return f"<input type='text' name='{escape(name)}' value='{escape(value)}'>"
+
+
+def _render_task(state: StandinState, task: StandinTask) -> str:
+    html = (
+        f"<tr><td><input type='hidden' name='taak[{task.index}].id' value='{task.index}'>"
+        f"{escape(task.name)}</td>"
+        f"{_toggle_cell(f'toggle-task:{task.index}', task.expanded)}</tr>"
+    )
+    if not state.is_task_visible(task):
+        return html
+    for row_index, row in enumerate(task.rows):
+        prefix = f"taak[{task.index}].prestatie[{row_index}]"
+        checked = " checked" if row.to_be_copied else ""
+        html += (
+            f"<tr><td><input type='checkbox' name='{prefix}.toBeCopied'{checked}></td>"
+            f"<td>{_input(f'{prefix}.omschrijving', row.description)}</td>"
+            f"<td>{_input(f'{prefix}.incident.lineItem', row.jira_ref)}</td>"
+            f"<td>{_input(f'{prefix}.toepassing.nummer', row.app_ref)}</td>"
+        )
+        for day_index, hours in enumerate(row.hours):
+            html += f"<td>{_input(f'{prefix}.dagPrestatie[{day_index}].gepresteerdeTijd', hours)}</td>"
+        html += "</tr>"
+    return html
+
+
+def _render_section(state: StandinState, section: str, title: str) -> str:
+    expanded = state.sections_expanded[section]
+    html = (
+        f"<tr><td>{escape(title)}</td>"
+        f"{_toggle_cell(f'toggle-section:{section}', expanded)}</tr>"
+    )
+    if not expanded:
+        return html
+    for task in state.tasks:
+        if task.is_general == (section == "general"):
+            html += _render_task(state, task)
+    return html
+
+
+def render_timesheet_page(state: StandinState) -> str:
+    # the tool finds the week header as 'table:nth-of-type(4) tr:nth-of-type(3) th'
+    headers = "".join(
+        f"<th>{DAY_NAMES[i]}<br>{day.day}/{day.month}</th>"
+        for i, day in enumerate(state.week_dates)
+    )
+    body = (
+        "<form name='timesheet' method='post' action='" + TIMESHEET_PATH + "'>"
+        "<input type='hidden' id='action' name='action' value=''>"
+        "<table><tr><td>Kiara - detail tijdsregistratie</td></tr></table>"
+        f"<table><tr><td>Week van {state.current_week.isoformat()}</td></tr></table>"
+        "<table><tr>"
+        f"<td>{_action_image('previous-week', 'knop vorige week')}</td>"
+        f"<td>{_action_image('next-week', 'knop volgende week')}</td>"
+        "</tr></table>"
+        "<table>"
+        "<tr><th colspan='11'>Prestaties</th></tr>"
+        "<tr><th colspan='11'></th></tr>"
+        f"<tr><th></th><th>Activiteit</th><th>JIRA</th><th>Toepassing</th>{headers}</tr>"
+        f"{_render_section(state, 'projects', 'Project-gerelateerde Taken')}"
+        f"{_render_section(state, 'general', 'Algemene Taken')}"
+        "</table>"
+        "<table><tr>"
+        f"<td>{_action_image('copy', 'knop voeg nieuwe activiteit toe')}</td>"
+        f"<td>{_action_image('save', 'knop bewaar voorlopig')}</td>"
+        "</tr></table>"
+        "</form>"
+    )
+    return _page("Kiara - detail tijdsregistratie", body)
@@ -0,0 +1,170 @@
+"""
+Local stand-in for the Kiara screens used by the tool, for offline end-to-end runs.
+
+    python -m src.standin.server --port 8765 --week 2024-09-30
+
+Then set `base_url = http://localhost:8765` in the [Browser] section of config.ini.
+"""
+
+import argparse
+import json
+import logging
+import os
+import secrets
+import threading
+from datetime import date, datetime
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+from src.standin.pages import (
+    TIMESHEET_PATH,
+    render_auth_method_page,
+    render_itsme_page,
+    render_landing_page,
+    render_timesheet_page,
+)
+from src.standin.state import StandinState
+
+log = logging.getLogger(__name__)
+
+SESSION_COOKIE = "KIARA_STANDIN_SESSION"
+DEFAULT_FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "timesheet.json")
+
+
+class StandinRequestHandler(BaseHTTPRequestHandler):
+    state: StandinState
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        log.debug(f"{self.address_string()} - {format % args}")
+
+    def _session_token(self) -> Optional[str]:
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        morsel = cookie.get(SESSION_COOKIE)
+        return morsel.value if morsel else None
+
+    def _send(self, status: int, body: str, content_type: str = "text/html") -> None:
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _redirect(self, location: str, cookie: Optional[str] = None) -> None:
+        self.send_response(303)
+        self.send_header("Location", location)
+        if cookie:
+            self.send_header("Set-Cookie", f"{SESSION_COOKIE}={cookie}; Path=/")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _read_form(self) -> dict[str, list[str]]:
+        length = int(self.headers.get("Content-Length", 0))
+        return parse_qs(self.rfile.read(length).decode("utf-8"), keep_blank_values=True)
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        path = urlparse(self.path).path
+        with self.state.lock:
+            self.state.stats[f"GET {path}"] += 1
+            if path == "/__standin/stats":
+                self._send(200, json.dumps(self.state.stats), "application/json")
+            elif path == "/__standin/state":
+                self._send(200, json.dumps(self.state.to_dict()), "application/json")
+            elif path == "/auth":
+                self._send(200, render_auth_method_page())
+            elif path == "/auth/itsme":
+                self._send(200, render_itsme_page())
+            elif not self.state.is_authenticated(self._session_token()):
+                self._redirect("/auth")
+            elif path in ["/", "/Kiara"]:
+                self._send(200, render_landing_page())
+            elif path == TIMESHEET_PATH:
+                self.state.stats["page_loads"] += 1
+                self._send(200, render_timesheet_page(self.state))
+            else:
+                self._send(404, "Not found", "text/plain")
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        path = urlparse(self.path).path
+        form = self._read_form()
+        with self.state.lock:
+            self.state.stats[f"POST {path}"] += 1
+            if path == "/__standin/reset":
+                self.state.reset()
+                self._send(200, "{}", "application/json")
+            elif path == "/auth/itsme":
+                token = secrets.token_hex(16)
+                self.state.sessions.add(token)
+                self._redirect("/", cookie=token)
+            elif not self.state.is_authenticated(self._session_token()):
+                self._redirect("/auth")
+            elif path == TIMESHEET_PATH:
+                self.state.apply_form(form)
+                self.state.handle_action(form.get("action", [""])[-1])
+                self.state.stats["page_loads"] += 1
+                self._send(200, render_timesheet_page(self.state))
+            else:
+                self._send(404, "Not found", "text/plain")
+
+
+def create_server(
+    state: StandinState, host: str = "127.0.0.1", port: int = 8765
+) -> ThreadingHTTPServer:
+    handler = type("BoundStandinRequestHandler", (StandinRequestHandler,), {})
+    handler.state = state
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def start_server_in_thread(server: ThreadingHTTPServer) -> threading.Thread:
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    log.info(
+        f"Kiara stand-in listening on http://{server.server_address[0]}:{server.server_address[1]}"
+    )
+    return thread
+
+
+def get_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Local Kiara stand-in server.")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", "-p", type=int, default=8765)
+    parser.add_argument(
+        "--week",
+        "-w",
+        type=str,
+        default=None,
+        help="Week shown when opening the timesheet, yyyy-MM-dd. Defaults to the current week.",
+    )
+    parser.add_argument(
+        "--fixture",
+        type=str,
+        default=DEFAULT_FIXTURE,
+        help="JSON file with the projects, general tasks and rows of the timesheet.",
+    )
+    parser.add_argument(
+        "--no-auth",
+        action="store_true",
+        help="Treat every request as authenticated, like an externally launched browser.",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    args = get_args()
+    week = (
+        datetime.strptime(args.week, "%Y-%m-%d").date() if args.week else date.today()
+    )
+    standin_state = StandinState.from_fixture_file(
+        args.fixture, week, require_auth=not args.no_auth
+    )
+    standin_server = create_server(standin_state, args.host, args.port)
+    log.info(f"Kiara stand-in listening on http://{args.host}:{args.port}")
+    try:
+        standin_server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        standin_server.server_close()
@@ -0,0 +1,187 @@
+import json
+import logging
+import re
+import threading
+from collections import Counter
+from copy import deepcopy
+from datetime import date, timedelta
+from typing import Optional
+
+log = logging.getLogger(__name__)
+
+DAYS_PER_WEEK = 7
+
+INPUT_NAME_PATTERN = re.compile(
+    r"^taak\[(\d+)\]\.prestatie\[(\d+)\]\.(?:dagPrestatie\[(\d+)\]\.)?(.+)$"
+)
+
+
+class StandinRow:
+    def __init__(
+        self,
+        description: str = "",
+        jira_ref: str = "",
+        app_ref: str = "",
+        hours: Optional[list[str]] = None,
+    ):
+        self.description = description
+        self.jira_ref = jira_ref
+        self.app_ref = app_ref
+        self.hours = hours if hours else [""] * DAYS_PER_WEEK
+        self.to_be_copied = False
+
+    def copy(self) -> "StandinRow":
+        # Kiara copies the activity, not the hours booked on it
+        return StandinRow(f"Copy {self.description}", self.jira_ref, self.app_ref)
+
+    def to_dict(self) -> dict:
+        return {
+            "description": self.description,
+            "jira_ref": self.jira_ref,
+            "app_ref": self.app_ref,
+            "hours": self.hours,
+        }
+
+
+class StandinTask:
+    def __init__(self, index: int, name: str, is_general: bool, rows: list[StandinRow]):
+        self.index = index
+        self.name = name
+        self.is_general = is_general
+        self.rows = rows
+        self.expanded = False
+
+    def sort_rows(self) -> None:
+        # Kiara sorts on the raw description: uppercase sorts before lowercase
+        self.rows.sort(key=lambda row: row.description)
+
+    def to_dict(self) -> dict:
+        return {
+            "index": self.index,
+            "name": self.name,
+            "is_general": self.is_general,
+            "rows": [row.to_dict() for row in self.rows],
+        }
+
+
+class StandinState:
+    """
+    Server-side session of the stand-in. Like Kiara, the open week and the expanded
+    sections belong to the session, not to the browser tab.
+    """
+
+    def __init__(self, fixture: dict, week_start: date, require_auth: bool = True):
+        self.fixture = fixture
+        self.require_auth = require_auth
+        self.lock = threading.Lock()
+        self.reset(week_start)
+
+    @classmethod
+    def from_fixture_file(
+        cls, fixture_file: str, week_start: date, require_auth: bool = True
+    ) -> "StandinState":
+        with open(fixture_file, encoding="utf-8") as fixture:
+            return cls(json.load(fixture), week_start, require_auth)
+
+    def reset(self, week_start: Optional[date] = None) -> None:
+        if week_start is not None:
+            self.week_start = week_start - timedelta(days=week_start.weekday())
+        self.current_week = self.week_start
+        self.weeks: dict[date, list[StandinTask]] = {}
+        self.sections_expanded = {"projects": True, "general": False}
+        self.sessions: set[str] = set()
+        self.stats: Counter = Counter()
+
+    def is_authenticated(self, session_token: Optional[str]) -> bool:
+        return not self.require_auth or session_token in self.sessions
+
+    @property
+    def tasks(self) -> list[StandinTask]:
+        if self.current_week not in self.weeks:
+            self.weeks[self.current_week] = self._load_tasks()
+        return self.weeks[self.current_week]
+
+    def _load_tasks(self) -> list[StandinTask]:
+        tasks = []
+        fixture_tasks = [(task, False) for task in self.fixture["projects"]] + [
+            (task, True) for task in self.fixture["general_tasks"]
+        ]
+        for index, (fixture_task, is_general) in enumerate(fixture_tasks):
+            rows = [StandinRow(**deepcopy(row)) for row in fixture_task["rows"]]
+            task = StandinTask(index, fixture_task["name"], is_general, rows)
+            task.sort_rows()
+            tasks.append(task)
+        return tasks
+
+    def get_task(self, task_index: int) -> Optional[StandinTask]:
+        return next((task for task in self.tasks if task.index == task_index), None)
+
+    @property
+    def week_dates(self) -> list[date]:
+        return [self.current_week + timedelta(days=i) for i in range(DAYS_PER_WEEK)]
+
+    def is_task_visible(self, task: StandinTask) -> bool:
+        section = "general" if task.is_general else "projects"
+        return self.sections_expanded[section] and task.expanded
+
+    def apply_form(self, form: dict[str, list[str]]) -> None:
+        # unchecked boxes aren't posted
+        for task in self.tasks:
+            for row in task.rows:
+                row.to_be_copied = False
+
+        for name, values in form.items():
+            match = INPUT_NAME_PATTERN.match(name)
+            if not match:
+                continue
+            task = self.get_task(int(match.group(1)))
+            row_index = int(match.group(2))
+            if task is None or row_index >= len(task.rows):
+                continue
+            row = task.rows[row_index]
+            day_index, field, value = match.group(3), match.group(4), values[-1]
+            if day_index is not None and field == "gepresteerdeTijd":
+                row.hours[int(day_index)] = value
+            elif field == "omschrijving":
+                row.description = value
+            elif field == "incident.lineItem":
+                row.jira_ref = value
+            elif field == "toepassing.nummer":
+                row.app_ref = value
+            elif field == "toBeCopied":
+                row.to_be_copied = True
+
+    def handle_action(self, action: str) -> None:
+        if action:
+            self.stats[f"action:{action.split(':')[0]}"] += 1
+        if action == "copy":
+            self._copy_rows()
+        elif action == "save":
+            self.stats["saves"] += 1
+        elif action == "previous-week":
+            self.current_week -= timedelta(days=DAYS_PER_WEEK)
+        elif action == "next-week":
+            self.current_week += timedelta(days=DAYS_PER_WEEK)
+        elif action.startswith("toggle-section:"):
+            section = action.split(":", 1)[1]
+            self.sections_expanded[section] = not self.sections_expanded[section]
+        elif action.startswith("toggle-task:"):
+            task = self.get_task(int(action.split(":", 1)[1]))
+            if task is not None:
+                task.expanded = not task.expanded
+
+    def _copy_rows(self) -> None:
+        for task in self.tasks:
+            copies = [row.copy() for row in task.rows if row.to_be_copied]
+            for row in task.rows:
+                row.to_be_copied = False
+            if copies:
+                task.rows.extend(copies)
+                task.sort_rows()
+                self.stats["copied_rows"] += len(copies)
+
+    def to_dict(self) -> dict:
+        return {
+            "week_start": self.current_week.isoformat(),
+            "tasks": [task.to_dict() for task in self.tasks],
+        }
@@ -0,0 +1,15 @@
+import os
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def chromium():
+    """Skips the stand-in runs where Playwright's Chromium isn't installed."""
+    # pylint: disable=import-outside-toplevel
+    from playwright.sync_api import sync_playwright
+
+    with sync_playwright() as p:
+        executable_path = p.chromium.executable_path
+    if not os.path.isfile(executable_path):
+        pytest.skip(f"Chromium not installed at '{executable_path}'.")
@@ -0,0 +1,63 @@
+from typing import Optional
+
+from src.browser.selectors import (
+    DESCRIPTION_FIELD,
+    get_day_input_name,
+    get_row_input_name,
+)
+from src.objects.kiara_project import KiaraProject
+from src.objects.kiara_work_item import KiaraWorkItem
+from src.objects.timesheet_snapshot import TimesheetSnapshot
+
+# Kiara's date column headers of the week of 2024-09-30
+WEEK_DATE_INDICES = {
+    "9-30": 0,
+    "10-1": 1,
+    "10-2": 2,
+    "10-3": 3,
+    "10-4": 4,
+    "10-5": 5,
+    "10-6": 6,
+}
+
+
+def make_work_item(
+    description: str,
+    date: str = "2024-09-30",
+    time_spent: str = "1.0",
+    project: str = "Project",
+    jira_ref: str = "",
+    app_ref: str = "",
+) -> KiaraWorkItem:
+    return KiaraWorkItem(
+        date=date,
+        description=description,
+        jira_ref=jira_ref,
+        time_spent=time_spent,
+        project=project,
+        app_ref=app_ref,
+    )
+
+
+def make_project(name: str, work_items: list[KiaraWorkItem]) -> KiaraProject:
+    project = KiaraProject(name)
+    for work_item in work_items:
+        project.add_work_item(work_item)
+    return project
+
+
+def make_snapshot(
+    task_index: int, rows: list[tuple[str, list[Optional[str]]]]
+) -> TimesheetSnapshot:
+    """Snapshot of a task with one (description, hours per weekday) tuple per row."""
+    inputs: list[tuple[str, str | bool]] = []
+    for row_index, (description, hours) in enumerate(rows):
+        inputs.append(
+            (get_row_input_name(task_index, row_index, DESCRIPTION_FIELD), description)
+        )
+        for day_index, value in enumerate(hours):
+            if value is not None:
+                inputs.append(
+                    (get_day_input_name(task_index, row_index, day_index), value)
+                )
+    return TimesheetSnapshot.from_inputs(task_index, inputs)
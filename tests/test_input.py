@@ -0,0 +1,17 @@
+from src.config.input import get_week_starts
+
+
+def test_get_week_starts_covers_every_week_of_the_range():
+    assert get_week_starts("2024-10-02", "2024-10-14") == [
+        "2024-09-30",
+        "2024-10-07",
+        "2024-10-14",
+    ]
+
+
+def test_get_week_starts_of_a_single_day():
+    assert get_week_starts("2024-10-06", "2024-10-06") == ["2024-09-30"]
+
+
+def test_get_week_starts_of_an_inverted_range_is_empty():
+    assert get_week_starts("2024-10-14", "2024-09-30") == []
@@ -0,0 +1,27 @@
+import pytest
+
+from tests.helpers import make_work_item
+
+
+def test_key_is_the_cell_the_work_item_is_written_to():
+    work_item = make_work_item(" Daily  Standup ", time_spent="1.30", jira_ref="A-1")
+
+    assert work_item.key == ("Project", "daily standup", "2024-09-30")
+    assert work_item.key == make_work_item("daily standup", time_spent="2.0").key
+
+
+def test_equality_compares_every_value():
+    assert make_work_item("Work") == make_work_item("Work")
+    assert make_work_item("Work") != make_work_item("Work", time_spent="2.0")
+    assert len({make_work_item("Work"), make_work_item("Work")}) == 1
+
+
+def test_is_immutable():
+    work_item = make_work_item("Work")
+    with pytest.raises(AttributeError):
+        work_item.time_spent = "2.0"
+
+
+def test_only_accepts_strings():
+    with pytest.raises(TypeError):
+        make_work_item("Work", time_spent=1.5)
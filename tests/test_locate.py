@@ -0,0 +1,33 @@
+import pytest
+
+from src.browser.locate import parse_date_headers
+from src.exceptions.custom_exceptions import TargetElementNotFoundError
+from tests.helpers import WEEK_DATE_INDICES
+
+WEEK_HEADERS = [
+    "Ma\n30/9",
+    "Di\n1/10",
+    "Wo\n2/10",
+    "Do\n3/10",
+    "Vr\n4/10",
+    "Za\n5/10",
+    "Zo\n6/10",
+]
+
+
+def test_parse_date_headers():
+    # the header row also holds cells that aren't days
+    headers = ["Omschrijving", *WEEK_HEADERS, "Totaal"]
+    assert parse_date_headers(headers) == WEEK_DATE_INDICES
+
+
+def test_parse_date_headers_missing_day():
+    headers = [header for header in WEEK_HEADERS if not header.startswith("Wo")]
+    with pytest.raises(TargetElementNotFoundError, match="'Wo'"):
+        parse_date_headers(headers)
+
+
+def test_parse_date_headers_without_date():
+    headers = ["Ma", *WEEK_HEADERS[1:]]
+    with pytest.raises(TargetElementNotFoundError, match="no 'D/M' date"):
+        parse_date_headers(headers)
@@ -0,0 +1,83 @@
+import asyncio
+from collections import Counter
+from datetime import date, timedelta
+
+from openpyxl import Workbook
+
+from benchmarks.run_benchmark import get_benchmark_config
+from benchmarks.synthetic import COLUMNS, SyntheticWeek
+from src.browser.workflow import run_multi_week_automation
+from src.input.input_workflow import process_input_data
+from src.lib.reconcile import kiara_time_to_minutes
+from src.objects.timesheet_snapshot import normalize_description
+from src.standin.server import create_server, start_server_in_thread
+from src.standin.state import StandinState
+
+FIRST_WEEK = date(2024, 9, 30)
+
+
+def get_expected_minutes(week: SyntheticWeek) -> Counter:
+    expected: Counter = Counter()
+    for row in week.rows:
+        project, description, day, hours = row[1], row[2], row[5], row[6]
+        day_index = (date.fromisoformat(day) - week.week_start).days
+        expected[(project, normalize_description(description), day_index)] += round(
+            hours * 60
+        )
+    return expected
+
+
+def get_written_minutes(state: StandinState, week_start: date) -> Counter:
+    written: Counter = Counter()
+    for task in state.weeks.get(week_start, []):
+        for row in task.rows:
+            for day_index, hours in enumerate(row.hours):
+                if kiara_time_to_minutes(hours):
+                    written[
+                        (task.name, normalize_description(row.description), day_index)
+                    ] += kiara_time_to_minutes(hours)
+    return written
+
+
+def test_writes_every_week_to_its_own_week(chromium, tmp_path):
+    weeks = [
+        SyntheticWeek(FIRST_WEEK + timedelta(days=7 * index), 3, 12, seed=index)
+        for index in range(2)
+    ]
+    input_file = str(tmp_path / "weeks.xlsx")
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    for week in weeks:
+        sheet = workbook.create_sheet(week.sheet_name)
+        sheet.append(COLUMNS)
+        for row in week.rows:
+            sheet.append(row)
+    workbook.save(input_file)
+
+    # both weeks have the same projects, the fixture is loaded for every week
+    state = StandinState(weeks[0].fixture(), FIRST_WEEK, require_auth=True)
+    server = create_server(state, port=0)
+    start_server_in_thread(server)
+    host, port = server.server_address[:2]
+    config_values = get_benchmark_config(f"http://{host}:{port}")
+    config_values["verify"] = "true"
+
+    try:
+        results = asyncio.run(
+            run_multi_week_automation(
+                input_config_values=config_values,
+                weeks={
+                    week.sheet_name: process_input_data(
+                        input_file, week.sheet_name, "openpyxl"
+                    )
+                    for week in weeks
+                },
+            )
+        )
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert [result.status for result in results] == ["done", "done"]
+    for week in weeks:
+        assert get_written_minutes(state, week.week_start) == get_expected_minutes(week)
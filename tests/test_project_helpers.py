@@ -0,0 +1,76 @@
+import pytest
+
+from src.lib.project_helpers import aggregate_work_items, pivot_work_items
+from src.objects.work_item_row import WorkItemRow
+from tests.helpers import make_work_item
+
+
+def test_aggregate_sums_the_hours_of_one_cell():
+    work_items = [
+        make_work_item("Standup", time_spent="0.30", jira_ref="A-1"),
+        make_work_item("Review", time_spent="1.0"),
+        make_work_item(" standup ", time_spent="0.45", app_ref="7"),
+    ]
+
+    standup, review = aggregate_work_items(work_items)
+
+    assert (standup.description, standup.time_spent) == ("Standup", "1.15")
+    assert (standup.jira_ref, standup.app_ref) == ("A-1", "7")
+    assert review is work_items[1]
+
+
+def test_aggregate_keeps_other_days_and_projects_apart():
+    work_items = [
+        make_work_item("Standup"),
+        make_work_item("Standup", date="2024-10-01"),
+        make_work_item("Standup", project="Other"),
+    ]
+
+    assert aggregate_work_items(work_items) == work_items
+
+
+def test_aggregate_keeps_the_first_of_conflicting_refs():
+    work_items = [
+        make_work_item("Standup", jira_ref="A-1"),
+        make_work_item("Standup", jira_ref="A-2"),
+    ]
+
+    (merged,) = aggregate_work_items(work_items)
+
+    assert (merged.jira_ref, merged.time_spent) == ("A-1", "2.0")
+
+
+def test_pivot_puts_every_day_in_its_column():
+    work_items = [
+        make_work_item("Standup", date="2024-10-02", time_spent="0.15"),
+        make_work_item("Review"),
+        make_work_item("standup", date="2024-09-30", time_spent="0.30"),
+    ]
+
+    standup, review = pivot_work_items(work_items)
+
+    assert standup.description == "Standup"
+    assert [work_item and work_item.time_spent for work_item in standup.days] == [
+        "0.30",
+        None,
+        "0.15",
+        None,
+        None,
+        None,
+        None,
+    ]
+    assert review.work_items == [work_items[1]]
+    assert (len(standup), len(review)) == (2, 1)
+
+
+def test_pivot_needs_aggregated_work_items():
+    with pytest.raises(ValueError, match="already has a work item on '2024-09-30'"):
+        pivot_work_items([make_work_item("Standup"), make_work_item("Standup")])
+
+
+def test_row_rejects_a_second_work_item_on_the_same_weekday():
+    row = WorkItemRow("Project", "Standup")
+    row.add(make_work_item("Standup", date="2024-10-01"))
+
+    with pytest.raises(ValueError):
+        row.add(make_work_item("Standup", date="2024-10-08"))
@@ -0,0 +1,100 @@
+import pytest
+
+from src.config.read_config import CONFIG_OPTIONS
+from src.config.read_manifest import read_manifest
+from src.exceptions.custom_exceptions import ConfigFileProcessingError
+
+CONFIG_VALUES = {option.option: option.default for option in CONFIG_OPTIONS}
+
+
+def write_manifest(tmp_path, content: str) -> str:
+    path = tmp_path / "team.ini"
+    path.write_text(content, encoding="utf-8")
+    return str(path)
+
+
+def read(tmp_path, content: str, **config_values: str):
+    return read_manifest(
+        write_manifest(tmp_path, content),
+        {**CONFIG_VALUES, **config_values},
+        default_input_file="team.xlsx",
+        default_sheet_names=["2024-09-30"],
+    )
+
+
+def test_reads_one_user_per_section(tmp_path):
+    alice, bob = read(
+        tmp_path,
+        """
+[alice]
+input_file = alice.xlsx
+sheet_name = alice
+phone_number = 473666666
+safe_mode = adaptive # overrides the shared config
+
+[bob]
+sheet_name = bob-1 bob-2
+phone_number = 473777777
+""",
+    )
+
+    assert (alice.name, alice.input_file, alice.sheet_names) == (
+        "alice",
+        "alice.xlsx",
+        ["alice"],
+    )
+    assert alice.config_values["safe_mode"] == "adaptive"
+    assert alice.config_values["phone_number"] == "473666666"
+    assert (bob.input_file, bob.sheet_names) == ("team.xlsx", ["bob-1", "bob-2"])
+    assert bob.config_values["safe_mode"] == CONFIG_VALUES["safe_mode"]
+
+
+def test_gives_every_user_their_own_session_cache_and_report_dir(tmp_path):
+    alice, bob = read(
+        tmp_path,
+        """
+[alice smith]
+phone_number = 473666666
+
+[bob]
+phone_number = 473777777
+session_cache = ~/bob.json
+report_dir = ~/bob
+""",
+        session_cache="~/.kiara/session.json",
+        report_dir="~/reports",
+    )
+
+    assert alice.config_values["session_cache"] == "~/.kiara/session-alice_smith.json"
+    assert alice.config_values["report_dir"].replace("\\", "/") == (
+        "~/reports/alice_smith"
+    )
+    assert bob.config_values["session_cache"] == "~/bob.json"
+    assert bob.config_values["report_dir"] == "~/bob"
+
+
+def test_keeps_session_cache_and_report_dir_off(tmp_path):
+    (alice,) = read(
+        tmp_path, "[alice]\nphone_number = 473666666\n", session_cache="", report_dir=""
+    )
+
+    assert alice.config_values["session_cache"] == ""
+    assert alice.config_values["report_dir"] == ""
+
+
+@pytest.mark.parametrize(
+    "content, message",
+    [
+        ("[alice]\nphone_number = 1\nlaunch_type = external\n", "Unknown options"),
+        ("[alice]\nsheet_name = 2024-09-30\n", "No phone_number"),
+        ("", "No users"),
+    ],
+)
+def test_rejects_invalid_manifests(tmp_path, content, message):
+    with pytest.raises(ConfigFileProcessingError, match=message):
+        read(tmp_path, content)
+
+
+def test_rejects_a_missing_manifest(tmp_path):
+    with pytest.raises(ConfigFileProcessingError, match="Failed to read"):
+        read_manifest(str(tmp_path / "missing.ini"), CONFIG_VALUES, "team.xlsx", [])
@@ -0,0 +1,87 @@
+import pytest
+
+from src.lib.reconcile import (
+    build_change_plan,
+    kiara_time_to_minutes,
+    minutes_to_kiara_time,
+)
+from tests.helpers import WEEK_DATE_INDICES, make_project, make_snapshot, make_work_item
+
+
+@pytest.mark.parametrize(
+    "value, minutes",
+    [("", 0), ("8", 480), ("7.30", 450), ("7,30", 450), ("0.15", 15), (" 1:45 ", 105)],
+)
+def test_kiara_time_to_minutes(value, minutes):
+    assert kiara_time_to_minutes(value) == minutes
+
+
+def test_minutes_to_kiara_time_round_trips():
+    for minutes in [0, 15, 450, 480, 2265]:
+        assert kiara_time_to_minutes(minutes_to_kiara_time(minutes)) == minutes
+
+
+def test_build_change_plan_sorts_cells():
+    snapshot = make_snapshot(
+        3,
+        [
+            ("Development", ["7.30", "8", None, None, None, None, None]),
+            ("Meetings", ["", "", "", "", "", "", ""]),
+        ],
+    )
+    project = make_project(
+        "Project",
+        [
+            # already correct, written as 7h30 in another notation
+            make_work_item("development", "2024-09-30", "7.30"),
+            make_work_item("Development", "2024-10-01", "6.0"),
+            make_work_item("Meetings", "2024-10-02", "1.15"),
+            make_work_item("Review", "2024-10-03", "2.0"),
+            make_work_item("Review", "2024-10-04", "1.0"),
+            make_work_item("Development", "2024-10-09", "1.0"),
+        ],
+    )
+
+    plan = build_change_plan(project, snapshot, WEEK_DATE_INDICES)
+
+    assert [cell.work_item.date for cell in plan.cells_correct] == ["2024-09-30"]
+    assert [
+        (cell.work_item.date, cell.row_index, cell.current_value)
+        for cell in plan.cells_to_change
+    ] == [
+        ("2024-10-01", 0, "8"),
+        ("2024-10-02", 1, ""),
+        ("2024-10-03", None, ""),
+        ("2024-10-04", None, ""),
+    ]
+    # one new row per description, not per day
+    assert [row.work_item.description for row in plan.rows_to_create] == ["Review"]
+    assert [work_item.date for work_item in plan.skipped] == ["2024-10-09"]
+    assert not plan.is_empty
+
+
+def test_build_change_plan_is_empty_when_timesheet_matches():
+    snapshot = make_snapshot(
+        3, [("Development", ["8.0", None, None, None, None, None, None])]
+    )
+    project = make_project("Project", [make_work_item("Development", time_spent="8")])
+
+    plan = build_change_plan(project, snapshot, WEEK_DATE_INDICES)
+
+    assert plan.is_empty
+    assert "1 cells already correct" in plan.format()
+
+
+def test_build_change_plan_updates_first_duplicate_row():
+    snapshot = make_snapshot(
+        3,
+        [
+            ("Development", ["1.0", None, None, None, None, None, None]),
+            ("development ", ["2.0", None, None, None, None, None, None]),
+        ],
+    )
+    project = make_project("Project", [make_work_item("Development", time_spent="3.0")])
+
+    plan = build_change_plan(project, snapshot, WEEK_DATE_INDICES)
+
+    assert [cell.row_index for cell in plan.cells_to_change] == [0]
@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from src.lib import retry
+from src.lib.retry import RetryPolicy, run_with_retry
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(retry, "retry_policy", RetryPolicy(backoff_base=0))
+
+
+class FailingClick:
+    """Times out on every call, like a toggle whose submit is slow to re-render."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self, timeout: int) -> None:
+        self.calls += 1
+        raise PlaywrightTimeoutError(f"Timeout {timeout}ms exceeded.")
+
+
+def test_retries_until_attempts_run_out():
+    click = FailingClick()
+    with pytest.raises(PlaywrightTimeoutError):
+        asyncio.run(run_with_retry("navigation", "click", click))
+    assert click.calls == retry.retry_policy.attempts("navigation")
+
+
+def test_does_not_retry_an_action_that_went_through():
+    click = FailingClick()
+
+    async def is_done() -> bool:
+        return True
+
+    assert asyncio.run(run_with_retry("navigation", "toggle", click, is_done)) is None
+    assert click.calls == 1
+
+
+def test_retries_while_the_action_has_not_gone_through():
+    click = FailingClick()
+    checks = []
+
+    async def is_done() -> bool:
+        checks.append(click.calls)
+        return False
+
+    with pytest.raises(PlaywrightTimeoutError):
+        asyncio.run(run_with_retry("navigation", "toggle", click, is_done))
+    assert checks == [1, 2, 3]
@@ -0,0 +1,53 @@
+from src.lib.run_journal import RunJournal, get_journal_path
+from tests.helpers import make_project, make_work_item
+
+
+def test_resume_skips_work_items_of_the_same_row(tmp_path):
+    path = str(tmp_path / "journal" / "2024-09-30.jsonl")
+    RunJournal(path).record(make_work_item("Code  Review", time_spent="2.0"), 3)
+
+    journal = RunJournal(path, resume=True)
+    remaining = journal.get_remaining_projects(
+        [
+            make_project(
+                "Project",
+                [
+                    # the timesheet lookup treats this as the same row
+                    make_work_item(" code review ", time_spent="2.0"),
+                    make_work_item("Code Review", "2024-10-01", "2.0"),
+                ],
+            )
+        ]
+    )
+
+    assert [work_item.date for work_item in remaining[0].items] == ["2024-10-01"]
+
+
+def test_new_run_resets_the_journal(tmp_path):
+    path = str(tmp_path / "2024-09-30.jsonl")
+    RunJournal(path).record(make_work_item("Development"), 0)
+
+    assert not RunJournal(path).completed
+    assert not RunJournal(path, resume=True).completed
+
+
+def test_resume_ignores_a_partial_last_line(tmp_path):
+    path = tmp_path / "2024-09-30.jsonl"
+    RunJournal(str(path)).record(make_work_item("Development"), 0)
+    with open(path, "a", encoding="utf-8") as journal:
+        journal.write('{"project": "Proj')
+
+    journal = RunJournal(str(path), resume=True)
+
+    assert journal.is_completed(make_work_item("Development"))
+
+
+def test_journal_path_is_kept_per_user_and_week(tmp_path):
+    paths = {
+        get_journal_path(str(tmp_path), "team.xlsx", week_start, user)
+        for week_start in ["2024-09-30", "2024-10-07"]
+        for user in ["", "alice", "bob"]
+    }
+
+    assert len(paths) == 6
+    assert get_journal_path("", "team.xlsx", "2024-09-30") is None
@@ -0,0 +1,75 @@
+import os
+import stat
+import time
+
+import pytest
+
+from src.lib.session_cache import (
+    get_cached_session_state,
+    remove_session_state,
+    write_session_state,
+)
+
+STATE = {"cookies": [{"name": "JSESSIONID", "value": "secret"}], "origins": []}
+
+posix_only = pytest.mark.skipif(os.name != "posix", reason="POSIX permissions")
+
+
+def get_mode(path) -> int:
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+@posix_only
+def test_only_the_current_user_may_read_the_cache(tmp_path):
+    session_cache = tmp_path / "kiara" / "session.json"
+
+    write_session_state(str(session_cache), STATE)
+
+    assert get_mode(session_cache) == 0o600
+    assert get_mode(session_cache.parent) == 0o700
+    assert not os.path.exists(f"{session_cache}.tmp")
+
+
+@posix_only
+def test_overwriting_a_cache_restricts_its_permissions(tmp_path):
+    session_cache = tmp_path / "session.json"
+    session_cache.write_text("{}", encoding="utf-8")
+    session_cache.chmod(0o644)
+
+    write_session_state(str(session_cache), STATE)
+
+    assert get_mode(session_cache) == 0o600
+
+
+def test_reuses_a_fresh_cache(tmp_path):
+    session_cache = str(tmp_path / "session.json")
+    write_session_state(session_cache, STATE)
+
+    assert get_cached_session_state(session_cache, max_age_hours=8) == session_cache
+
+
+def test_removes_an_expired_cache(tmp_path):
+    session_cache = str(tmp_path / "session.json")
+    write_session_state(session_cache, STATE)
+    nine_hours_ago = time.time() - 9 * 3600
+    os.utime(session_cache, (nine_hours_ago, nine_hours_ago))
+
+    assert get_cached_session_state(session_cache, max_age_hours=8) is None
+    assert not os.path.exists(session_cache)
+
+
+@pytest.mark.parametrize("content", ["not json", "[]", '{"origins": []}'])
+def test_removes_an_invalid_cache(tmp_path, content):
+    session_cache = tmp_path / "session.json"
+    session_cache.write_text(content, encoding="utf-8")
+
+    assert get_cached_session_state(str(session_cache), max_age_hours=8) is None
+    assert not session_cache.exists()
+
+
+def test_is_off_without_a_path(tmp_path):
+    write_session_state("", STATE)
+    remove_session_state("")
+
+    assert get_cached_session_state("", max_age_hours=8) is None
+    assert get_cached_session_state(str(tmp_path / "missing.json"), 8) is None
@@ -0,0 +1,31 @@
+from datetime import date
+
+from benchmarks.startup_budget import (
+    FORBIDDEN_MODULES,
+    HELP_BUDGET_MS,
+    VALIDATE_BUDGET_MS,
+    measure_imports,
+)
+from benchmarks.synthetic import SyntheticWeek
+
+
+def test_help_stays_within_import_budget():
+    import_ms, modules = measure_imports(["--help"])
+
+    assert not modules.intersection(FORBIDDEN_MODULES)
+    assert import_ms <= HELP_BUDGET_MS
+
+
+def test_validate_only_stays_within_import_budget(tmp_path):
+    week = SyntheticWeek(date(2024, 9, 30), project_count=10, item_count=100)
+    input_file = str(tmp_path / "startup.xlsx")
+    week.write_workbook(input_file)
+
+    import_ms, modules = measure_imports(
+        ["-f", input_file, "-s", week.sheet_name, "--validate-only"]
+    )
+
+    # the sheet was read, not rejected before the input phase
+    assert "openpyxl" in modules
+    assert not modules.intersection(FORBIDDEN_MODULES)
+    assert import_ms <= VALIDATE_BUDGET_MS
@@ -0,0 +1,91 @@
+from src.objects.timesheet_snapshot import DescriptionIndex, normalize_description
+from tests.helpers import make_snapshot
+
+EMPTY_WEEK = [""] * 7
+
+
+def test_normalize_description_ignores_case_and_whitespace():
+    assert normalize_description("  Code   Review ") == "code review"
+    assert normalize_description("Straße") == normalize_description("STRASSE")
+    assert normalize_description("copy Foo") == normalize_description("Copy foo")
+    assert normalize_description(12) == "12"
+
+
+def test_description_index_keeps_rows_sorted():
+    index = DescriptionIndex()
+    index.add(5, "Development")
+    index.add(2, "development ")
+    index.add(7, "Meetings")
+    # rows without a description are never matched
+    index.add(8, "")
+
+    assert index.find("DEVELOPMENT") == 2
+    assert index.find_all("development") == [2, 5]
+    assert index.duplicates() == {"development": [2, 5]}
+    assert index.find("Review") is None
+    assert len(index) == 2
+
+
+def test_description_index_rename_moves_the_row():
+    index = DescriptionIndex()
+    index.add(0, "Copy development")
+    index.rename(0, "Copy development", "Review")
+
+    assert index.find("Copy development") is None
+    assert index.find("review") == 0
+    assert len(index) == 1
+
+
+def test_snapshot_parses_inputs_of_its_own_task_only():
+    snapshot = make_snapshot(
+        2, [("Development", ["7.30", "", None, None, None, None, "1.0"])]
+    )
+    snapshot.apply_input("taak[3].prestatie[0].omschrijving", "Other task")
+    snapshot.apply_input("taak[2].prestatie[1].omschrijving", "Meetings")
+    snapshot.apply_input("taak[2].prestatie[1].toBeCopied", True)
+
+    assert len(snapshot) == 2
+    assert snapshot.highest_index == 1
+    assert snapshot.get_row(0).hours == ["7.30", "", "", "", "", "", "1.0"]
+    assert snapshot.get_row(1).to_be_copied
+    assert snapshot.find_description("other task") is None
+
+
+def test_snapshot_follows_renamed_rows():
+    snapshot = make_snapshot(2, [("Copy development", EMPTY_WEEK)])
+    snapshot.apply_input("taak[2].prestatie[0].omschrijving", "Review")
+
+    assert snapshot.find_description("review") == 0
+    assert snapshot.find_description("copy development") is None
+
+
+def test_find_dummy_rows_only_matches_copies_of_other_rows():
+    snapshot = make_snapshot(
+        2,
+        [
+            ("Copy development", EMPTY_WEEK),
+            ("copy development", EMPTY_WEEK),
+            ("Copy review", ["1.0", "", "", "", "", "", ""]),
+            ("Copy Copy development", EMPTY_WEEK),
+            ("development", EMPTY_WEEK),
+            ("review", EMPTY_WEEK),
+        ],
+    )
+
+    assert snapshot.find_dummy_rows() == [0, 3]
+
+
+def test_find_dummy_rows_keeps_real_copy_activities():
+    snapshot = make_snapshot(
+        2,
+        [
+            ("Copy logs to S3", EMPTY_WEEK),
+            ("logs to S3", ["1.0", "", "", "", "", "", ""]),
+            ("Copy meetings", EMPTY_WEEK),
+            ("meetings", EMPTY_WEEK),
+        ],
+    )
+
+    # 'Copy logs to S3' is in the input, so it's an activity and not a leftover
+    assert snapshot.find_dummy_rows(exclude=["copy logs to s3", "meetings"]) == [2]
+    assert snapshot.find_dummy_rows() == [0, 2]
@@ -0,0 +1,18 @@
+from src.lib.tracing import Tracer, _current_span
+
+
+def test_counts_are_kept_apart_from_retries():
+    tracer = Tracer()
+    tracer.enabled = True
+    with tracer.span("update.copy_work_items") as span:
+        assert _current_span.get() is span
+        tracer.record_count("extra_copy_submits", 2)
+        tracer.record_retry()
+
+    assert span.retries == 1
+    assert span.counters == {"extra_copy_submits": 2}
+    assert "update.copy_work_items extra_copy_submits: 2" in tracer.summary()
+    assert tracer.to_chrome_trace()["traceEvents"][0]["args"] == {
+        "retries": 1,
+        "extra_copy_submits": 2,
+    }
@@ -0,0 +1,68 @@
+from collections import Counter
+
+from src.browser.selectors import COPY_FIELD, get_row_input_name
+from src.browser.update import _get_new_row_indices, check_work_item_boxes
+from src.objects.form_write_batch import FormWriteBatch
+from tests.helpers import make_snapshot
+
+EMPTY_WEEK = [""] * 7
+
+
+def get_copy_input_name(row_index: int) -> str:
+    return get_row_input_name(2, row_index, COPY_FIELD)
+
+
+def test_check_work_item_boxes_copies_the_last_rows():
+    snapshot = make_snapshot(
+        2, [(description, EMPTY_WEEK) for description in ["A", "B", "C", "D"]]
+    )
+    # left checked by an earlier copy
+    snapshot.apply_input(get_copy_input_name(0), True)
+    batch = FormWriteBatch()
+
+    check_work_item_boxes(snapshot, batch, 2)
+
+    assert batch.writes == {
+        get_copy_input_name(0): False,
+        get_copy_input_name(2): True,
+        get_copy_input_name(3): True,
+    }
+    assert [row.to_be_copied for row in snapshot.rows.values()] == [
+        False,
+        False,
+        True,
+        True,
+    ]
+
+
+def test_get_new_row_indices_finds_the_copies():
+    snapshot = make_snapshot(
+        2,
+        [
+            ("Copy B", EMPTY_WEEK),
+            ("A", EMPTY_WEEK),
+            ("Copy B", EMPTY_WEEK),
+            ("B", EMPTY_WEEK),
+            ("Copy A", EMPTY_WEEK),
+        ],
+    )
+    # 'Copy B' already existed before the copy, e.g. a real activity
+    existing_descriptions = Counter(["A", "B", "Copy B"])
+
+    assert _get_new_row_indices(snapshot, existing_descriptions) == [2, 4]
+    assert existing_descriptions == Counter(["A", "B", "Copy B"])
+
+
+def test_get_new_row_indices_includes_reused_dummies():
+    snapshot = make_snapshot(
+        2, [("A", EMPTY_WEEK), ("Copy A", EMPTY_WEEK), ("Copy A", EMPTY_WEEK)]
+    )
+
+    # the reused dummy at index 1 is left out of the existing descriptions
+    assert _get_new_row_indices(snapshot, Counter(["A"])) == [1, 2]
+
+
+def test_get_new_row_indices_skips_unexpected_rows():
+    snapshot = make_snapshot(2, [("A", EMPTY_WEEK), ("Other", EMPTY_WEEK)])
+
+    assert _get_new_row_indices(snapshot, Counter(["A"])) == []
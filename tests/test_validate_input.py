@@ -0,0 +1,114 @@
+from datetime import date, datetime, time
+
+import pytest
+
+from src.exceptions.custom_exceptions import InputValidationError
+from src.input.read_sheet import EXPECTED_COLUMNS
+from src.input.validate_input import (
+    CLOSE_WEEK_TASK,
+    DEFAULT_PROJECT,
+    validate_input_columns,
+)
+from src.objects.input_columns import InputColumns
+
+
+def make_columns(*rows: dict) -> InputColumns:
+    columns = InputColumns(EXPECTED_COLUMNS)
+    for row_number, row in enumerate(rows, start=2):
+        values = {
+            "Day": "Monday",
+            "Date": "2024-09-30",
+            "Description": "Work",
+            "TimeSpent": 1,
+            "Project": "Project",
+        }
+        values.update(row)
+        columns.add_row(row_number, values)
+    return columns
+
+
+def get_issues(columns: InputColumns, sheet_name: str = "2024-09-30") -> list[str]:
+    with pytest.raises(InputValidationError) as error:
+        validate_input_columns(columns, sheet_name)
+    return [str(issue) for issue in error.value.issues]
+
+
+def test_normalizes_valid_rows():
+    columns = make_columns(
+        {"TimeSpent": 1.5, "AppRef": 42.0, "JiraRef": "ABC-1"},
+        {"Date": datetime(2024, 10, 1), "TimeSpent": None, "Project": None},
+    )
+
+    first, second = validate_input_columns(columns, "2024-09-30")
+
+    assert (first.time_spent, first.app_ref, first.jira_ref) == ("1.30", "42", "ABC-1")
+    assert (second.date, second.time_spent) == ("2024-10-01", "0.0")
+    assert second.project == DEFAULT_PROJECT
+
+
+def test_collects_every_issue_with_its_row_number():
+    columns = make_columns(
+        {"TimeSpent": "a lot"},
+        {"TimeSpent": 0.1, "AppRef": "x"},
+        {"Date": "30/09/2024"},
+    )
+
+    assert get_issues(columns) == [
+        "Row 2, TimeSpent: 'a lot' is not a number.",
+        "Row 3, AppRef: 'x' is not an integer.",
+        "Row 3, TimeSpent: '0.1' is not a positive multiple of 0.25h.",
+        "Row 4, Date: '30/09/2024' is not a yyyy-MM-dd date.",
+    ]
+
+
+def test_rejects_dates_outside_the_sheet_week():
+    columns = make_columns({"Date": date(2024, 10, 7)})
+
+    assert get_issues(columns) == [
+        "Row 2, Date: '2024-10-07' is outside the week of '2024-09-30'."
+    ]
+
+
+def test_takes_the_most_common_week_for_sheets_not_named_after_a_date():
+    columns = make_columns(
+        {"Date": "2024-10-07"}, {"Date": "2024-10-08"}, {"Date": "2024-09-30"}
+    )
+
+    assert get_issues(columns, "Sheet1") == [
+        "Row 4, Date: '2024-09-30' is outside the week of '2024-10-07'."
+    ]
+
+
+def test_suggests_a_known_general_task():
+    columns = make_columns({"Project": "705 Meetings"})
+
+    assert get_issues(columns) == [
+        "Row 2, Project: Unknown general task '705 Meetings'. "
+        "Did you mean '705-Meetings'?"
+    ]
+
+
+def test_accepts_the_one_minute_of_the_close_week_task():
+    columns = make_columns(
+        {"Project": CLOSE_WEEK_TASK, "TimeSpent": time(0, 1)},
+        {"Project": CLOSE_WEEK_TASK, "TimeSpent": "00:01"},
+        {"Project": CLOSE_WEEK_TASK, "TimeSpent": 1 / 60},
+        {"TimeSpent": "1:30"},
+    )
+
+    work_items = validate_input_columns(columns, "2024-09-30")
+
+    assert [work_item.time_spent for work_item in work_items] == [
+        "0.01",
+        "0.01",
+        "0.01",
+        "1.30",
+    ]
+
+
+def test_only_the_close_week_task_takes_one_minute():
+    columns = make_columns({"TimeSpent": "00:01"})
+
+    assert get_issues(columns) == [
+        "Row 2, TimeSpent: '00:01' is not a positive multiple of 0.25h."
+    ]
@@ -0,0 +1,126 @@
+import csv
+import json
+
+from src.lib.verification import (
+    build_verification_report,
+    get_week_start,
+    write_verification_report,
+)
+from tests.helpers import WEEK_DATE_INDICES, make_project, make_snapshot, make_work_item
+
+EMPTY_DAYS = [None] * 6
+
+
+def build_report(projects, task_indices, snapshots):
+    return build_verification_report(
+        week_start="2024-09-30",
+        projects=projects,
+        task_indices=task_indices,
+        snapshots=snapshots,
+        date_indices=WEEK_DATE_INDICES,
+    )
+
+
+def test_reports_the_status_of_every_cell():
+    project = make_project(
+        "Project",
+        [
+            make_work_item("Standup", time_spent="0.30"),
+            make_work_item("Review", time_spent="2.0"),
+            make_work_item("Missing"),
+            make_work_item("Standup", date="2024-10-07"),
+            make_work_item("Garbled"),
+        ],
+    )
+    other = make_project("Other", [make_work_item("Work", project="Other")])
+    snapshot = make_snapshot(
+        0,
+        [
+            ("standup", ["0.30", *EMPTY_DAYS]),
+            ("Review", ["1.45", *EMPTY_DAYS]),
+            ("Garbled", ["x", *EMPTY_DAYS]),
+        ],
+    )
+
+    report = build_report([project, other], {"Project": "0"}, {0: snapshot})
+
+    assert [(cell.status, cell.actual, cell.reason) for cell in report.cells] == [
+        ("written", "0.30", ""),
+        ("mismatched", "1.45", ""),
+        ("failed", None, "row not in timesheet"),
+        ("skipped", None, "date not in selected week"),
+        ("mismatched", "x", "unreadable value"),
+        ("failed", None, "project not in timesheet"),
+    ]
+    assert report.counts == {"written": 1, "skipped": 1, "mismatched": 2, "failed": 2}
+    assert not report.verified
+
+
+def test_reports_a_task_that_was_not_read_back():
+    project = make_project("Project", [make_work_item("Standup")])
+
+    report = build_report([project], {"Project": "3"}, {})
+
+    assert report.cells[0].reason == "task not read back"
+
+
+def test_totals_hours_per_day_and_project():
+    project = make_project(
+        "Project",
+        [
+            make_work_item("Standup", time_spent="0.30"),
+            make_work_item("Review", time_spent="1.45"),
+            make_work_item("Review", date="2024-10-01", time_spent="1.0"),
+        ],
+    )
+    snapshot = make_snapshot(
+        0,
+        [
+            ("Standup", ["0.30", *EMPTY_DAYS]),
+            ("Review", ["1.45", "0.15", *EMPTY_DAYS[1:]]),
+        ],
+    )
+
+    report = build_report([project], {"Project": "0"}, {0: snapshot})
+
+    totals = report.to_dict()
+    assert totals["day_totals"] == {
+        "2024-09-30": {"expected": "2.15", "actual": "2.15"},
+        "2024-10-01": {"expected": "1.0", "actual": "0.15"},
+    }
+    assert totals["project_totals"] == {
+        "Project": {"expected": "3.15", "actual": "2.30"}
+    }
+    assert totals["status"] == "mismatched"
+
+
+def test_week_start_is_the_monday_of_the_first_date():
+    project = make_project("Project", [make_work_item("Standup", date="2024-10-02")])
+
+    assert get_week_start([project]) == "2024-09-30"
+    assert get_week_start([]) == ""
+
+
+def test_writes_json_and_csv(tmp_path):
+    project = make_project("Project", [make_work_item("Standup")])
+    snapshot = make_snapshot(0, [("Standup", ["1.0", *EMPTY_DAYS])])
+    report = build_report([project], {"Project": "0"}, {0: snapshot})
+
+    json_path = write_verification_report(report, str(tmp_path / "reports"))
+
+    assert json_path == str(tmp_path / "reports" / "2024-09-30.json")
+    with open(json_path, encoding="utf-8") as report_file:
+        assert json.load(report_file)["status"] == "verified"
+    with open(tmp_path / "reports" / "2024-09-30.csv", encoding="utf-8") as csv_file:
+        rows = list(csv.DictReader(csv_file))
+    assert [(row["description"], row["status"]) for row in rows] == [
+        ("Standup", "written"),
+        ("", "total"),
+        ("", "total"),
+    ]
+
+
+def test_does_not_write_without_a_report_dir():
+    report = build_report([], {}, {})
+
+    assert write_verification_report(report, "") is None